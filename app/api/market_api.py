@@ -29,18 +29,18 @@ async def analyze_coin(ticker: str):
         response_data = cached_data.copy()
 
         # 실시간 데이터 주입
-        if ticker in trade_manager.cached_day_dfs and ticker in trade_manager.cached_min_dfs:
-            df_day = trade_manager.cached_day_dfs[ticker].copy()
-            df_min = trade_manager.cached_min_dfs[ticker].copy()
+        frames = trade_manager.get_local_candles(ticker)
+        if frames is not None:
+            df_day, df_min = frames
             
             if trade_manager.shared_data and ticker in trade_manager.shared_data:
                 current_price = trade_manager.shared_data[ticker]['current_price']
                 df_day.iloc[-1, df_day.columns.get_loc('close')] = current_price
                 df_min.iloc[-1, df_min.columns.get_loc('close')] = current_price
             
-            # 🔥 [핵심 수정] trade_manager의 strategy 사용
+            # 🔥 [핵심 수정] 매매 루프와 같은 지표 상태로 채점 (점수 내역이 필요하니 debug, 캐시는 안 씀)
             print(f">>> 🔍 [User Request] {ticker} 상세 분석 요청")
-            realtime_result = trade_manager.strategy.get_ensemble_signal(df_day, df_min, debug=True)
+            realtime_result = trade_manager.get_signal(ticker, df_day, df_min, debug=True)
             
             if realtime_result:
                 response_data.update(realtime_result)
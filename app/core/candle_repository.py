@@ -0,0 +1,69 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from app.core.database import DB_PATH
+
+class CandleRepository:
+    """
+    candles 테이블 (data_loader.fetch_and_save_all_coins가 채우는 일봉) 접근
+    - 전 종목을 쿼리 1번으로 읽어 티커별 DataFrame으로 분할
+    - time 컬럼은 data_loader와 같은 문자열 형식 ("YYYY-MM-DD HH:MM:SS")
+    """
+    COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+    def get_conn(self):
+        return sqlite3.connect(DB_PATH)
+
+    def load_all(self, tickers=None, count=200):
+        """{티커: 일봉 df} (티커별 최근 count개, 시간 오름차순)"""
+        query = "SELECT ticker, time, open, high, low, close, volume FROM candles"
+        params = ()
+        if tickers:
+            tickers = list(tickers)
+            query += f" WHERE ticker IN ({','.join('?' * len(tickers))})"
+            params = tickers
+        query += " ORDER BY ticker, time"
+
+        try:
+            with self.get_conn() as conn:
+                rows = conn.execute(query, params).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ [DB Error] 캔들 로드 실패: {e}")
+            return {}
+        if not rows: return {}
+
+        # 행 -> 컬럼 배열 (티커 순으로 정렬돼 있으니 경계만 찾아서 자름)
+        ticker_col, time_col, *value_cols = zip(*rows)
+        names = np.array(ticker_col, dtype=object)
+        times = pd.to_datetime(np.array(time_col))
+        values = np.array(value_cols, dtype=float).T
+
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+        ends = np.r_[starts[1:], len(names)]
+
+        frames = {}
+        for a, b in zip(starts, ends):
+            a = max(a, b - count)
+            frames[names[a]] = pd.DataFrame(values[a:b], index=times[a:b], columns=self.COLUMNS)
+        return frames
+
+    def save_frames(self, frames):
+        """{티커: df} 저장 (같은 시간 봉은 덮어쓰기 - 진행 중이던 마지막 봉 갱신)"""
+        data_list = []
+        for ticker, df in frames.items():
+            if df is None or df.empty: continue
+            cols = [df[c].to_numpy(dtype=float).tolist() for c in self.COLUMNS]
+            data_list.extend(zip([ticker] * len(df), df.index.astype(str), *cols))
+        if not data_list: return 0
+
+        try:
+            with self.get_conn() as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO candles (ticker, time, open, high, low, close, volume)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', data_list)
+                conn.commit()
+            return len(data_list)
+        except Exception as e:
+            print(f"⚠️ [DB Error] 캔들 저장 실패: {e}")
+            return 0
@@ -1,9 +1,80 @@
 import sqlite3
 import os
+import threading
 
 # 프로젝트 루트(backend) 기준 DB 파일 위치
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "coin_mate.db")
 
+# =========================================================
+#  🔥 [속도 개선] 쓰레드별 상주 SQLite 연결 (ConnectionPool)
+#  - 쿼리마다 connect() 하지 않고 쓰레드당 연결 1개를 계속 사용
+#    (sqlite3 연결은 쓰레드 간 공유 X -> 이벤트 루프 / to_thread 워커가 각자 연결)
+#  - WAL: 읽기와 쓰기가 서로 막지 않음 / synchronous=NORMAL (WAL에서 안전한 수준)
+#  - cached_statements: 같은 SQL 문자열은 연결마다 prepare 1번만
+#  - close_all(): 프로세스 종료 / 테스트 정리용
+# =========================================================
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",      # 약 16MB 페이지 캐시
+    "PRAGMA mmap_size=134217728",    # 128MB
+    "PRAGMA busy_timeout=5000",      # 다른 쓰레드가 쓰는 중이면 최대 5초 대기
+)
+
+class ConnectionPool:
+    def __init__(self, path=DB_PATH, row_factory=sqlite3.Row, cached_statements=256):
+        self.path = path
+        self.row_factory = row_factory
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+
+    def connection(self):
+        """현재 쓰레드의 연결 (없으면 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, cached_statements=self.cached_statements)
+            conn.row_factory = self.row_factory
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def close_thread(self):
+        """현재 쓰레드의 연결만 닫음 (전용 쓰레드 종료 시)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None: return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._conns: self._conns.remove(conn)
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass  # 다른 쓰레드 연결 (check_same_thread) - 프로세스 종료 시 정리됨
+        self._local = threading.local()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(path=DB_PATH):
+    """DB 파일별 공용 풀 (저장소 인스턴스가 여러 개여도 연결은 쓰레드당 1개)"""
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path)
+        return pool
+
 def init_db():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
@@ -24,6 +95,8 @@ def init_db():
         sell_reason TEXT 
     )
     ''')
+    # 보유(open) 조회는 매매 루프마다 호출 -> 청산 이력이 쌓여도 전체 스캔하지 않도록
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_status_ticker ON trades (status, ticker)")
 
     # 2. 분봉 데이터 저장 테이블
     cursor.execute('''
@@ -38,6 +111,39 @@ def init_db():
         UNIQUE(ticker, time)
     )
     ''')
+
+    # 3. 일일 스캔 결과 테이블 (날짜 x 티커 스냅샷, ResultRepository)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS analysis_results (
+        date TEXT NOT NULL,
+        ticker TEXT NOT NULL,
+        score REAL,
+        win_rate REAL,
+        total_yield REAL,
+        mdd REAL,
+        rsi REAL,
+        mfi REAL,
+        should_buy INTEGER,
+        current_price REAL,
+        target_price REAL,
+        stop_loss_price REAL,
+        atr REAL,
+        sig_trend INTEGER,
+        sig_adx INTEGER,
+        sig_volume INTEGER,
+        sig_vwap INTEGER,
+        sig_bollinger INTEGER,
+        sig_macd INTEGER,
+        sig_rsi INTEGER,
+        sig_mfi INTEGER,
+        win_rate_lcb REAL,
+        total_yield_lcb REAL,
+        extra TEXT,
+        PRIMARY KEY (date, ticker)
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_ticker_date ON analysis_results (ticker, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_date_score ON analysis_results (date, score DESC)")
     
     conn.commit()
     conn.close()
@@ -0,0 +1,131 @@
+import atexit
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+from app.core.database import DB_PATH, get_pool
+
+# =========================================================
+#  비동기 DB 쓰기 큐 (이벤트 루프 -> 전용 writer 쓰레드)
+#  - submit()은 큐에 넣고 바로 반환 (체결 직후 매도 체크가 디스크 fsync를 기다리지 않음)
+#  - writer 쓰레드: 쌓인 쓰기를 최대 MAX_BATCH개까지 트랜잭션 1번으로 커밋
+#    (배치가 실패하면 1건씩 다시 실행 -> 잘못된 1건 때문에 나머지를 잃지 않음)
+#  - 반환값 Future: 커밋되면 완료 / flush(), wait_durable(): 지금까지 넣은 쓰기가 디스크에 반영될 때까지 대기
+#  - 종료(atexit) 시 큐를 끝까지 비운 뒤 쓰레드 종료 -> 대기 중인 매매 기록 유실 없음
+# =========================================================
+
+_STOP = object()
+
+
+class DbWriter:
+    def __init__(self, path=DB_PATH, max_batch=64):
+        self.pool = get_pool(path)
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.stats = {"writes": 0, "batches": 0, "errors": 0}
+        self.closed = False
+        self._lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="DbWriter", daemon=True)
+        self.thread.start()
+
+    # --- 호출 쪽 (아무 쓰레드) ---
+    def submit(self, sql, params=(), message=None):
+        """쓰기 1건 예약 -> Future (커밋 후 완료, 실패 시 예외). message: 커밋 후 출력할 로그"""
+        future = Future()
+        with self._lock:
+            if self.closed:
+                future.set_exception(RuntimeError("DbWriter closed"))
+                return future
+            self.queue.put((sql, params, message, future))
+        return future
+
+    def flush(self, timeout=None):
+        """지금까지 넣은 쓰기가 커밋될 때까지 대기 (동기)"""
+        barrier = self.submit(None)
+        if not self.closed: barrier.result(timeout)
+
+    async def wait_durable(self):
+        """flush()의 async 버전 (이벤트 루프를 막지 않음)"""
+        barrier = self.submit(None)
+        if not self.closed: await asyncio.wrap_future(barrier)
+
+    def close(self, timeout=10):
+        """남은 쓰기를 모두 커밋하고 쓰레드 종료"""
+        with self._lock:
+            if self.closed: return
+            self.closed = True
+            self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+    # --- writer 쓰레드 ---
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP  # close() 이후에는 더 들어오지 않음 -> _STOP이 항상 마지막
+            items = batch[:-1] if stop else batch
+            if items: self._commit(items)
+            if stop:
+                self.pool.close_thread()
+                return
+
+    def _commit(self, items):
+        conn = self.pool.connection()
+        writes = [item for item in items if item[0] is not None]
+        try:
+            with conn:
+                for sql, params, _, _ in writes:
+                    conn.execute(sql, params)
+            self.stats["batches"] += 1
+            results = [(item, None) for item in items]
+        except sqlite3.Error:
+            # 배치 실패 -> 1건씩 재시도 (성공한 것은 살리고 실패한 것만 에러)
+            results = []
+            for item in items:
+                if item[0] is None:
+                    results.append((item, None))
+                    continue
+                try:
+                    with conn:
+                        conn.execute(item[0], item[1])
+                    results.append((item, None))
+                except sqlite3.Error as e:
+                    results.append((item, e))
+
+        for (sql, _, message, future), error in results:
+            if error is not None:
+                self.stats["errors"] += 1
+                print(f"⚠️ [DB Error] 쓰기 실패: {error}")
+                future.set_exception(error)
+                continue
+            if sql is not None:
+                self.stats["writes"] += 1
+                if message: print(message)
+            future.set_result(True)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path=DB_PATH):
+    """DB 파일별 공용 writer (쓰기 순서 = submit 순서)"""
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None or writer.closed:
+            writer = _writers[path] = DbWriter(path)
+        return writer
+
+
+@atexit.register
+def close_all_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
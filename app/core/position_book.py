@@ -0,0 +1,75 @@
+import threading
+
+# =========================================================
+#  보유 포지션 장부 (trades 테이블 status='open' 의 메모리 사본)
+#  - TradeRepository가 log_buy / log_sell / close_zombie_trade 에서 쓰기를 예약하기 전에 먼저 갱신
+#    (커밋은 DbWriter 쓰레드가 나중에 -> 커밋 실패 시 Future 콜백이 이 변경을 되돌림)
+#  - 시작 시 DB에서 1번 rebuild -> 이후 매매 루프 / API는 디스크를 읽지 않음
+#  - trade id / 티커로 O(1) 조회, open_count는 항상 최신
+#  - 포지션 = dict (id, ticker, buy_price, buy_amount, strategy_name) - 기존 sqlite3.Row와 같은 키 접근
+# =========================================================
+
+FIELDS = ("id", "ticker", "buy_price", "buy_amount", "strategy_name")
+
+
+class PositionBook:
+    def __init__(self):
+        self.by_id = {}
+        self.by_ticker = {}  # 티커 -> {trade id: 포지션} (같은 티커 중복 open도 유지, id 오름차순)
+        self.open_count = 0
+        self._lock = threading.Lock()
+
+    def rebuild(self, rows):
+        """DB open 거래 전체로 다시 채움 (rows: FIELDS 키를 가진 Row / dict)"""
+        with self._lock:
+            self.by_id, self.by_ticker = {}, {}
+            for row in sorted(rows, key=lambda r: r["id"]):
+                self._add({k: row[k] for k in FIELDS})
+            self.open_count = len(self.by_id)
+
+    def _add(self, pos):
+        self.by_id[pos["id"]] = pos
+        group = self.by_ticker.setdefault(pos["ticker"], {})
+        group[pos["id"]] = pos
+        if max(group) != pos["id"]:  # 롤백으로 예전 id가 돌아옴 -> id 오름차순 유지
+            self.by_ticker[pos["ticker"]] = dict(sorted(group.items()))
+
+    def add(self, trade_id, ticker, buy_price, buy_amount, strategy_name="Unknown"):
+        pos = {"id": trade_id, "ticker": ticker, "buy_price": buy_price,
+               "buy_amount": buy_amount, "strategy_name": strategy_name}
+        with self._lock:
+            self._add(pos)
+            self.open_count = len(self.by_id)
+        return pos
+
+    def remove(self, trade_id):
+        """청산된 포지션 제거 -> 제거한 포지션 (없으면 None)"""
+        with self._lock:
+            pos = self.by_id.pop(trade_id, None)
+            if pos is not None:
+                group = self.by_ticker.get(pos["ticker"])
+                group.pop(trade_id, None)
+                if not group: del self.by_ticker[pos["ticker"]]
+            self.open_count = len(self.by_id)
+        return pos
+
+    # --- 조회 ---
+    def get(self, trade_id):
+        return self.by_id.get(trade_id)
+
+    def first(self, ticker):
+        """티커의 open 포지션 (여러 개면 가장 오래된 것)"""
+        group = self.by_ticker.get(ticker)
+        return next(iter(group.values())) if group else None
+
+    def holds(self, ticker):
+        return ticker in self.by_ticker
+
+    def all(self):
+        return list(self.by_id.values())
+
+    def tickers(self):
+        return list(self.by_ticker)
+
+    def __len__(self):
+        return self.open_count
@@ -0,0 +1,118 @@
+import json
+import sqlite3
+from app.core.database import DB_PATH
+
+class ResultRepository:
+    """
+    analysis_results 테이블 (Backtester 일일 스캔 결과, 날짜 x 티커)
+    - 스냅샷 1개 = 하루치 results_cache (저장은 트랜잭션 1번 executemany)
+    - 조회용 컬럼은 타입 컬럼, 화면용 부가 정보(score_breakdown / robust)만 extra(JSON)
+    - date는 "YYYY-MM-DD" 문자열
+    """
+    NUMERIC = ('score', 'win_rate', 'total_yield', 'mdd', 'rsi', 'mfi',
+               'current_price', 'target_price', 'stop_loss_price', 'atr')
+    SIGNALS = ('trend', 'adx', 'volume', 'vwap', 'bollinger', 'macd', 'rsi', 'mfi')
+    OPTIONAL = ('win_rate_lcb', 'total_yield_lcb')
+    EXTRA = ('score_breakdown', 'robust')
+
+    COLUMNS = (
+        ('date', 'ticker') + NUMERIC + ('should_buy',)
+        + tuple(f"sig_{k}" for k in SIGNALS) + OPTIONAL + ('extra',)
+    )
+
+    def get_conn(self):
+        return sqlite3.connect(DB_PATH)
+
+    # --- 저장 ---
+    def _to_row(self, date, item):
+        strategies = item.get('strategies', {})
+        extra = {k: item[k] for k in self.EXTRA if k in item}
+        return (
+            (date, item['ticker'])
+            + tuple(float(item.get(k, 0)) for k in self.NUMERIC)
+            + (int(bool(item.get('should_buy'))),)
+            + tuple(int(strategies.get(k, 0)) for k in self.SIGNALS)
+            + tuple(item.get(k) for k in self.OPTIONAL)
+            + (json.dumps(extra, ensure_ascii=False, separators=(',', ':')),)
+        )
+
+    def save_snapshot(self, date, results):
+        """{티커: 결과 dict} 저장 (같은 날짜/티커는 덮어쓰기) -> 저장 행 수"""
+        rows = [self._to_row(date, item) for item in results.values()]
+        if not rows: return 0
+        try:
+            with self.get_conn() as conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO analysis_results ({', '.join(self.COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                    rows
+                )
+                conn.commit()
+            return len(rows)
+        except Exception as e:
+            print(f"⚠️ [DB Error] 분석 결과 저장 실패: {e}")
+            return 0
+
+    # --- 조회 ---
+    def _to_item(self, row):
+        rec = dict(zip(self.COLUMNS, row))
+        item = {"ticker": rec['ticker']}
+        for k in self.NUMERIC:
+            item[k] = rec[k]
+        item['should_buy'] = bool(rec['should_buy'])
+        item['strategies'] = {k: rec[f"sig_{k}"] for k in self.SIGNALS}
+        for k in self.OPTIONAL:
+            if rec[k] is not None: item[k] = rec[k]
+        item.update(json.loads(rec['extra']) if rec['extra'] else {})
+        item.setdefault('score_breakdown', [])
+        return item
+
+    def latest_date(self):
+        try:
+            with self.get_conn() as conn:
+                row = conn.execute("SELECT MAX(date) FROM analysis_results").fetchone()
+            return row[0] if row else None
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ [DB Error] 분석 결과 조회 실패: {e}")
+            return None
+
+    def load_snapshot(self, date=None):
+        """하루치 결과 -> {티커: 결과 dict} (Backtester.results_cache 형식, date 없으면 최신)"""
+        date = date or self.latest_date()
+        if not date: return {}
+        try:
+            with self.get_conn() as conn:
+                rows = conn.execute(
+                    f"SELECT {', '.join(self.COLUMNS)} FROM analysis_results WHERE date=?", (date,)
+                ).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ [DB Error] 분석 결과 로드 실패: {e}")
+            return {}
+        return {item['ticker']: item for item in map(self._to_item, rows)}
+
+    def score_history(self, ticker, limit=None):
+        """티커 1개의 날짜별 점수 이력 (과거 -> 최근)"""
+        query = ("SELECT date, score, win_rate, total_yield, mdd, rsi, mfi FROM analysis_results "
+                 "WHERE ticker=? ORDER BY date DESC")
+        params = (ticker,)
+        if limit:
+            query += " LIMIT ?"
+            params += (int(limit),)
+        with self.get_conn() as conn:
+            rows = conn.execute(query, params).fetchall()
+        keys = ('date', 'score', 'win_rate', 'total_yield', 'mdd', 'rsi', 'mfi')
+        return [dict(zip(keys, r)) for r in reversed(rows)]
+
+    def top_on_date(self, date, n=10):
+        """해당 날짜 상위 n개 (점수, 승률, 수익률 순 - Backtester 리포트와 같은 정렬)"""
+        with self.get_conn() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM analysis_results WHERE date=? "
+                "ORDER BY score DESC, win_rate DESC, total_yield DESC LIMIT ?",
+                (date, int(n))
+            ).fetchall()
+        return [self._to_item(r) for r in rows]
+
+    def dates(self):
+        with self.get_conn() as conn:
+            return [r[0] for r in conn.execute("SELECT DISTINCT date FROM analysis_results ORDER BY date")]
@@ -1,98 +1,152 @@
 import sqlite3
+import threading
+from concurrent.futures import Future
 from datetime import datetime
-from app.core.database import DB_PATH
+from app.core.database import DB_PATH, get_pool
+from app.core.db_writer import get_writer
+from app.core.position_book import PositionBook
 
 class TradeRepository:
+    def __init__(self, db_path=DB_PATH):
+        # 🔥 [속도 개선] 쿼리마다 connect() 대신 쓰레드별 상주 연결 (WAL / 문장 캐시)
+        self.pool = get_pool(db_path)
+        # 🔥 [속도 개선] open 거래 메모리 장부 (조회는 디스크 X, 쓰기 예약 때 먼저 갱신 / 커밋 실패 시 되돌림)
+        self.book = PositionBook()
+        # 🔥 [속도 개선] 쓰기는 writer 쓰레드가 배치 커밋 (이벤트 루프는 큐에 넣고 바로 진행)
+        #   -> trade id는 커밋을 기다리지 않고 여기서 발급 (장부 / 매도 기록이 바로 id 사용)
+        self.writer = get_writer(db_path)
+        self.last_id = 0
+        self._id_lock = threading.Lock()
+        self.reload_positions()
+
     def get_conn(self):
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row  # 🔥 [핵심] 컬럼명으로 접근 가능하게 변경
-        return conn
+        # 🔥 [핵심] 컬럼명으로 접근 가능 (sqlite3.Row) / with 블록은 커밋·롤백만 하고 연결은 유지
+        return self.pool.connection()
 
-    def get_open_trades(self):
+    def load_open_trades(self):
+        """DB에서 직접 open 거래 조회 (장부 재구성용)"""
         with self.get_conn() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id, ticker, buy_price, buy_amount, strategy_name FROM trades WHERE status='open'")
             return cursor.fetchall() # 이제 Row 객체 리스트 반환
 
+    def reload_positions(self):
+        """시작 시 / 외부에서 DB를 고쳤을 때 장부를 DB 기준으로 다시 채움 (대기 중인 쓰기 먼저 반영)"""
+        try:
+            self.writer.flush()
+            self.book.rebuild(self.load_open_trades())
+            with self.get_conn() as conn:
+                row = conn.execute("SELECT MAX(id) FROM trades").fetchone()
+                seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name='trades'").fetchone()
+            with self._id_lock:
+                self.last_id = max(self.last_id, row[0] or 0, seq[0] if seq else 0)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ [DB Error] 보유 장부 로드 실패: {e}")
+
+    def _next_id(self):
+        with self._id_lock:
+            self.last_id += 1
+            return self.last_id
+
+    def _on_failure(self, future, undo):
+        """커밋 실패 시 장부 변경 되돌림 (writer 쓰레드) -> 되돌린 뒤에 완료되는 Future 반환"""
+        done = Future()
+
+        def callback(f):
+            error = f.exception()
+            if error is None:
+                done.set_result(f.result())
+                return
+            undo()
+            done.set_exception(error)
+        future.add_done_callback(callback)
+        return done
+
+    def _release_id(self, trade_id):
+        """기록 못 한 id가 마지막 발급분이면 반납 (뒤에 이미 발급된 id가 있으면 빈 번호로 둠)"""
+        with self._id_lock:
+            if self.last_id == trade_id: self.last_id -= 1
+
+    def flush(self, timeout=None):
+        """예약된 쓰기가 모두 커밋될 때까지 대기 (동기)"""
+        self.writer.flush(timeout)
+
+    async def wait_durable(self):
+        """예약된 쓰기가 모두 커밋될 때까지 대기 (이벤트 루프용)"""
+        await self.writer.wait_durable()
+
+    def close(self):
+        """서버 종료: 남은 쓰기를 모두 커밋하고 writer 쓰레드 종료 (동기)"""
+        self.writer.close()
+
+    # --- 조회 (메모리 장부) ---
+    def get_open_trades(self):
+        return self.book.all()
+
     def get_trade_count(self):
-        with self.get_conn() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM trades WHERE status='open'")
-            res = cursor.fetchone()
-            return res[0] if res else 0
+        return self.book.open_count
 
     def get_all_open_tickers(self):
-        with self.get_conn() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT ticker FROM trades WHERE status='open'")
-            return [r[0] for r in cursor.fetchall()]
+        return self.book.tickers()
+
+    def is_holding(self, ticker):
+        return self.book.holds(ticker)
 
     # 🔥 [수정 1] strategy_name 파라미터 추가
     def log_buy(self, ticker, price, amount, strategy_name="Unknown"):
-        """매수 기록 저장"""
-        try:
-            with self.get_conn() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO trades (ticker, buy_price, buy_amount, buy_time, status, strategy_name) 
-                    VALUES (?, ?, ?, ?, 'open', ?)
-                    """,
-                    (ticker, price, amount, datetime.now(), strategy_name)
-                )
-                conn.commit()
-                print(f"💾 [DB] {ticker} 매수 기록 완료 (전략: {strategy_name})")
-        except Exception as e:
-            print(f"⚠️ [DB Error] 매수 기록 실패: {e}")
+        """매수 기록 저장 (장부는 즉시, DB는 writer 쓰레드 / 실패 시 장부 롤백) -> 커밋 Future"""
+        trade_id = self._next_id()
+        self.book.add(trade_id, ticker, price, amount, strategy_name)
+        future = self.writer.submit(
+            """
+            INSERT INTO trades (id, ticker, buy_price, buy_amount, buy_time, status, strategy_name) 
+            VALUES (?, ?, ?, ?, ?, 'open', ?)
+            """,
+            (trade_id, ticker, price, amount, datetime.now(), strategy_name),
+            f"💾 [DB] {ticker} 매수 기록 완료 (전략: {strategy_name})"
+        )
+
+        def undo():
+            self.book.remove(trade_id)
+            self._release_id(trade_id)
+        return self._on_failure(future, undo)
 
     # 🔥 [수정 2] profit_rate 계산 로직 추가
     def log_sell(self, trade_id, sell_price, reason="익절/손절"):
-        """매도 기록 저장 (상태 변경 및 수익률 기록)"""
-        try:
-            with self.get_conn() as conn:
-                cursor = conn.cursor()
-                
-                # 1. 원래 매수가 가져오기 (수익률 계산용)
-                cursor.execute("SELECT buy_price FROM trades WHERE id=?", (trade_id,))
-                row = cursor.fetchone()
-                
-                profit_rate = 0.0
-                if row:
-                    buy_price = row[0]
-                    if buy_price and buy_price > 0:
-                        # 수익률 공식: ((매도가 - 매수가) / 매수가) * 100
-                        profit_rate = ((sell_price - buy_price) / buy_price) * 100
-                
-                # 2. 업데이트 실행
-                cursor.execute(
-                    """
-                    UPDATE trades 
-                    SET status='closed', sell_price=?, sell_time=?, sell_reason=?, profit_rate=? 
-                    WHERE id=?
-                    """,
-                    (sell_price, datetime.now(), reason, profit_rate, trade_id)
-                )
-                conn.commit()
-                print(f"💾 [DB] 거래ID {trade_id} 매도 완료 (수익률: {profit_rate:.2f}%)")
-        except Exception as e:
-            print(f"⚠️ [DB Error] 매도 기록 실패: {e}")
+        """매도 기록 저장 (상태 변경 및 수익률 기록) -> 커밋 Future"""
+        pos = self.book.remove(trade_id)
+        
+        # 수익률 공식: ((매도가 - 매수가) / 매수가) * 100 (장부에 없는 거래는 DB의 매수가로 계산)
+        profit_rate = 0.0
+        if pos is not None and pos['buy_price'] and pos['buy_price'] > 0:
+            profit_rate = ((sell_price - pos['buy_price']) / pos['buy_price']) * 100
+        
+        future = self.writer.submit(
+            """
+            UPDATE trades 
+            SET status='closed', sell_price=?, sell_time=?, sell_reason=?,
+                profit_rate=CASE WHEN buy_price > 0 THEN (? - buy_price) / buy_price * 100 ELSE 0 END
+            WHERE id=?
+            """,
+            (sell_price, datetime.now(), reason, sell_price, trade_id),
+            f"💾 [DB] 거래ID {trade_id} 매도 완료 (수익률: {profit_rate:.2f}%)"
+        )
+        return self._on_failure(future, lambda: self._restore(pos))
             
     def close_zombie_trade(self, trade_id):
-        """지갑엔 없는데 DB에만 있는 좀비 데이터 강제 청산"""
-        try:
-            with self.get_conn() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE trades SET status='closed', sell_price=0, sell_time=? WHERE id=?",
-                    (datetime.now(), trade_id)
-                )
-                conn.commit()
-        except Exception as e:
-            print(f"⚠️ [DB Error] 좀비 청산 실패: {e}")
+        """지갑엔 없는데 DB에만 있는 좀비 데이터 강제 청산 -> 커밋 Future"""
+        pos = self.book.remove(trade_id)
+        future = self.writer.submit(
+            "UPDATE trades SET status='closed', sell_price=0, sell_time=? WHERE id=?",
+            (datetime.now(), trade_id)
+        )
+        return self._on_failure(future, lambda: self._restore(pos))
+
+    def _restore(self, pos):
+        """청산 기록 실패 -> 장부에서 뺐던 포지션을 다시 open으로"""
+        if pos is not None:
+            self.book.add(pos["id"], pos["ticker"], pos["buy_price"], pos["buy_amount"], pos["strategy_name"])
 
     def get_open_trade(self, ticker):
-        """특정 코인의 진행 중인 거래 정보 가져오기"""
-        with self.get_conn() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, buy_price, buy_amount FROM trades WHERE ticker=? AND status='open'", (ticker,))
-            return cursor.fetchone()
\ No newline at end of file
+        """특정 코인의 진행 중인 거래 정보 가져오기 (id, buy_price, buy_amount 키 / 없으면 None)"""
+        return self.book.first(ticker)
@@ -1,10 +1,12 @@
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import market_api, trade_api
 from app.services.collector import start_collector_thread
+from app.services.scan_pool import shutdown_scan_pool
+from app.services.tick_store import TickStore
 from app.services.trade_manager import trade_manager
 
 # 전역 변수
@@ -17,12 +19,14 @@ async def lifespan(app: FastAPI):
 
     print("\n>>> 🟢 [System] CoinMate 서버 시작 중...")
 
-    # 🔥 [수정 1] Manager 삭제 -> 일반 딕셔너리 사용 (속도 향상 & 락 방지)
-    shared_data = {} 
-    print(f">>> 💾 [System] 고속 메모리(Fast Dict) 초기화 완료 (ID: {id(shared_data)})")
+    # 🔥 [수정 1] Manager 삭제 -> 티커별 링 버퍼 저장소 (dict 호환, 메모리 고정)
+    shared_data = TickStore(capacity=1024)
+    print(f">>> 💾 [System] 고속 메모리(Tick Ring Buffer) 초기화 완료 (ID: {id(shared_data)})")
 
     # 1. 수집기 실행
-    collector = start_collector_thread(shared_data)
+    collector = start_collector_thread(
+        shared_data, trade_manager.candles, trade_manager.price_events, trade_manager.exit_index
+    )
     
     # 2. TradeManager 연결
     trade_manager.set_shared_data(shared_data)
@@ -34,8 +38,16 @@ async def lifespan(app: FastAPI):
     yield
 
     print("\n>>> 🔴 [System] 서버 종료 절차 시작...")
-    if loop_task: loop_task.cancel()
+    if loop_task:
+        loop_task.cancel()
+        # 루프가 멈춘 뒤에 쓰기 큐를 닫아야 마지막 매매 기록까지 들어감
+        with suppress(asyncio.CancelledError):
+            await loop_task
     if collector: collector.stop()
+    # 🔥 [안정성] atexit에 맡기지 않고 대기 중인 매매 기록을 여기서 커밋
+    await asyncio.to_thread(trade_manager.repo.close)
+    print(">>> 💾 [System] 매매 기록 저장 완료")
+    await asyncio.to_thread(shutdown_scan_pool)
     print(">>> 👋 [System] Bye Bye!")
 
 app = FastAPI(lifespan=lifespan)
@@ -1,15 +1,147 @@
 import asyncio
-import pyupbit
 import pandas as pd
+import numpy as np
 import json
 import os
-from datetime import datetime, timedelta
+import time
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
 from app.services.strategy import Strategy
+from app.services.upbit_rest import rest, SCAN
+from app.core.candle_repository import CandleRepository
+from app.core.result_repository import ResultRepository
+from app.services import robustness
+from app.services.scan_pool import get_scan_pool, reset_scan_pool
 
 # 캐시 디렉토리 설정
 CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache")
 if not os.path.exists(CACHE_DIR): os.makedirs(CACHE_DIR)
 
+def simulate_signals(buy_mask, sell_mask, opens, last_close, fee, days=90, capital=1000000, detail=False):
+    """
+    매수/매도 신호 배열로 최근 days일 단순 매매 시뮬레이션 (Backtester._simulate / 파라미터 스윕 공용)
+    - i일 신호 -> i+1일 시가 체결, 수수료 양방향
+    - 매도는 점수 기반 단순화 (실제는 익절/손절 로직이 더 있음)
+    - detail=True: 일별 평가금 수익률(daily_returns) / 거래별 수익률(trade_returns) 배열도 반환 (robustness용)
+    """
+    balance = capital
+    shares = 0
+    avg_buy_price = 0
+    entry_balance = capital
+    curve = [capital]
+    trade_returns = []
+    trade_count = 0
+    win_count = 0
+    max_balance = capital
+    mdd = 0
+
+    n = len(opens)
+    days_to_test = min(days, n - 20)
+    start_idx = n - days_to_test
+
+    for i in range(start_idx, n - 1):
+        # 매수 신호
+        if buy_mask[i] and shares == 0:
+            next_day_open = float(opens[i+1])
+            shares = (balance * (1 - fee)) / next_day_open
+            entry_balance = balance
+            balance = 0
+            avg_buy_price = next_day_open
+
+        # 매도 신호 (TradeManager 기준: 3.5 미만이면 매도)
+        elif sell_mask[i] and shares > 0:
+            sell_val = shares * float(opens[i+1]) * (1 - fee)
+
+            if sell_val > (shares * avg_buy_price):
+                win_count += 1
+
+            balance = sell_val
+            shares = 0
+            trade_count += 1
+            trade_returns.append(sell_val / entry_balance - 1)
+
+            max_balance = max(max_balance, balance)
+            dd = (max_balance - balance) / max_balance * 100
+            mdd = max(mdd, dd)
+
+        if detail:
+            curve.append(balance + shares * float(opens[i+1]))
+
+    final_asset = balance if balance > 0 else shares * last_close
+
+    result = {
+        "win_rate": round((win_count / trade_count * 100) if trade_count > 0 else 0, 1),
+        "total_return": round(((final_asset / capital) - 1) * 100, 1),
+        "mdd": round(mdd, 1),
+        "trades": trade_count,
+    }
+    if detail:
+        curve.append(final_asset)
+        curve = np.asarray(curve, dtype=float)
+        result["daily_returns"] = curve[1:] / curve[:-1] - 1
+        result["trade_returns"] = np.asarray(trade_returns, dtype=float)
+    return result
+
+
+def simulate_frame(strategy, df, fee, detail=False):
+    """
+    과거 90일 데이터 백테스팅
+    🔥 [수정됨] TradeManager의 과열 필터 로직을 그대로 적용하여 현실적인 결과 산출
+    """
+    try:
+        # 🔥 [속도 개선] 매일 df.iloc[:i+1]로 재계산(O(n²)) 대신 전체 히스토리 1회 벡터 채점(O(n))
+        signals = strategy.score_series(df, df)
+        scores = signals['score'].to_numpy()
+        rsis = signals['rsi'].to_numpy()
+        mfis = signals['mfi'].to_numpy()
+
+        # --- 🔥 [핵심 수정] TradeManager와 동일한 필터링 로직 적용 ---
+        # 매수 조건: 점수 7.0 이상 AND 과열 아님 / 매도: 3.5 미만
+        valid = ~np.isnan(scores)
+        buy_mask = valid & (scores >= strategy.BUY_THRESHOLD) & ~strategy.is_overheated(rsis, mfis)
+        sell_mask = valid & (scores < strategy.SELL_THRESHOLD)
+
+        return simulate_signals(
+            buy_mask, sell_mask,
+            df['open'].to_numpy(dtype=float), float(df['close'].iloc[-1]), fee, detail=detail
+        )
+    except Exception: 
+        return {"win_rate": 0, "total_return": 0, "mdd": 0}
+
+
+def evaluate_frames(strategy, frames, fee):
+    """{티커: 일봉 df} -> {티커: (현재가, 백테스트 결과, 현재 점수 dict)}"""
+    signals = strategy.score_frames(frames)
+    out = {}
+
+    for ticker, df in frames.items():
+        try:
+            strategy_res = signals.get(ticker)
+            if not strategy_res: continue
+
+            df_for_backtest = df.iloc[:-1].copy() 
+            result = simulate_frame(strategy, df_for_backtest, fee, detail=True)
+            out[ticker] = (float(df['close'].iloc[-1]), result, strategy_res)
+        except Exception:
+            pass
+    return out
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _scan_worker(task):
+    """
+    프로세스 풀 워커: (전략, [(티커, 5 x 봉 배열)...], 수수료) -> evaluate_frames 결과
+    - DataFrame 대신 float64 배열로 주고받아 피클 크기 최소화
+    """
+    strategy, chunk, fee = task
+    started = time.perf_counter()
+    frames = {ticker: pd.DataFrame(dict(zip(OHLCV_COLUMNS, block))) for ticker, block in chunk}
+    out = evaluate_frames(strategy, frames, fee)
+    return out, os.getpid(), len(chunk), time.perf_counter() - started
+
+
 class Backtester:
     _instance = None
     
@@ -26,10 +158,35 @@ class Backtester:
         self.results_cache = {}
         self.is_running = False
         self.initialized = True
-        self.semaphore = asyncio.Semaphore(10) 
+        self.semaphore = asyncio.Semaphore(10)  # 동시 요청 수 상한 (호출 속도는 upbit_rest 스케줄러가 조절)
+
+        # 🔥 [속도 개선] 풀 스캔 실행 방식: "process"(코어 수만큼 병렬) | "thread"(단일 코어)
+        self.SCAN_MODE = "process"
+        self.SCAN_WORKERS = None      # None이면 CPU 코어 수
+        self.SCAN_CHUNK_SIZE = 25     # 워커 1회 작업당 티커 수
+
+        # 🔥 [속도 개선] 캔들 소스: "db"(로컬 candles 테이블 + 부족한 최근 봉만 API) | "api"(전 종목 API)
+        self.DATA_SOURCE = "db"
+        self.HISTORY_COUNT = 200
+        self.candle_repo = CandleRepository()
+
+        # 🎲 강건성 분석: 재표본 경로로 승률/수익률/MDD 신뢰구간 -> get_best_opportunities 하한(LCB) 랭킹
+        self.ROBUSTNESS = True
+        self.ROBUST_PATHS = 2000
+        self.ROBUST_BLOCK = 5     # 블록 부트스트랩 블록 길이 (일)
+        self.ROBUST_CI = 90       # 신뢰구간 (%)
+        self.ROBUST_SEED = 42     # 같은 데이터면 같은 구간 (리포트 재현용)
+        self.RANK_BY = "score"    # "score"(점수, 승률, 수익률) | "lcb"(승률 하한, 수익률 하한, 점수)
+
+        # 💾 스캔 결과 저장소: analysis_results 테이블 (날짜 x 티커, 과거 스냅샷 조회 가능)
+        self.result_repo = ResultRepository()
+
+    def get_today(self):
+        return datetime.now().strftime('%Y-%m-%d')
 
     def get_today_filename(self):
-        return os.path.join(CACHE_DIR, f"analysis_{datetime.now().strftime('%Y-%m-%d')}.json")
+        # (구버전 JSON 캐시 - 오늘 스냅샷이 DB에 없을 때 1회 이관용)
+        return os.path.join(CACHE_DIR, f"analysis_{self.get_today()}.json")
 
     def get_report_filename(self):
         return os.path.join(CACHE_DIR, f"report_{datetime.now().strftime('%Y-%m-%d')}.txt")
@@ -39,28 +196,20 @@ class Backtester:
             print(">>> ⚠️ 이미 스캔이 진행 중입니다.")
             return
         
-        cache_file = self.get_today_filename()
+        today = self.get_today()
         need_scan = True
         
-        # 1. 캐시 파일 확인
-        if os.path.exists(cache_file):
-            print(f">>> 📂 [Cache] 로드 중: {os.path.basename(cache_file)}")
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if data and isinstance(data, dict) and len(data) > 0:
-                    self.results_cache = data
-                    print(f">>> ✅ [Cache] 로드 성공! ({len(self.results_cache)}개 코인)")
-                    
-                    if not os.path.exists(self.get_report_filename()):
-                        self._save_report_txt()
-                    need_scan = False
-                else:
-                    print(f">>> ⚠️ [Cache] 비어있음. 재분석.")
-            except Exception as e: 
-                print(f">>> ⚠️ [Cache] 오류 ({e}). 재분석.")
+        # 1. 오늘 스냅샷 확인 (DB의 최신 날짜 1개만 로드)
+        data = await asyncio.to_thread(self._load_today_snapshot, today)
+        if data:
+            self.results_cache = data
+            print(f">>> ✅ [Cache] 로드 성공! ({len(self.results_cache)}개 코인)")
+
+            if not os.path.exists(self.get_report_filename()):
+                self._save_report_txt()
+            need_scan = False
         else:
-            print(f">>> 🆕 [Cache] 파일 없음. 신규 분석 시작.")
+            print(f">>> 🆕 [Cache] 오늘 결과 없음. 신규 분석 시작.")
 
         if not need_scan: return
 
@@ -69,13 +218,18 @@ class Backtester:
         print(f">>> 🔎 [Full Scan] 전 종목 정밀 분석 시작... (약 1~2분 소요)")
         
         try:
-            tickers = pyupbit.get_tickers(fiat="KRW")
-            tasks = [self._analyze_one_safe(ticker) for ticker in tickers]
-            await asyncio.gather(*tasks)
+            tickers = await rest.aget_tickers(fiat="KRW")
+            if self.DATA_SOURCE == "db":
+                frames = await self._load_frames_db(tickers)
+            else:
+                frames = {}
+                tasks = [self._fetch_one_safe(ticker, frames) for ticker in tickers]
+                await asyncio.gather(*tasks)
+
+            await self._analyze_all(frames)
 
             if self.results_cache:
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.results_cache, f, ensure_ascii=False, indent=4)
+                await asyncio.to_thread(self.result_repo.save_snapshot, today, self.results_cache)
                 
                 self._save_report_txt()
                 print(f">>> 💾 [Save] 저장 완료 ({len(self.results_cache)}개)")
@@ -84,6 +238,25 @@ class Backtester:
         finally:
             self.is_running = False
 
+    def _load_today_snapshot(self, today):
+        """DB 최신 스냅샷이 오늘 것이면 로드 (없으면 구버전 JSON 캐시를 DB로 이관)"""
+        if self.result_repo.latest_date() == today:
+            print(f">>> 📂 [Cache] DB 스냅샷 로드 중: {today}")
+            return self.result_repo.load_snapshot(today)
+
+        legacy = self.get_today_filename()
+        if not os.path.exists(legacy): return {}
+        try:
+            with open(legacy, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not (data and isinstance(data, dict)): return {}
+            self.result_repo.save_snapshot(today, data)
+            print(f">>> 📦 [Cache] JSON 캐시 -> DB 이관 ({len(data)}개)")
+            return data
+        except Exception as e:
+            print(f">>> ⚠️ [Cache] 오류 ({e}). 재분석.")
+            return {}
+
     def _save_report_txt(self):
         try:
             report_file = self.get_report_filename()
@@ -118,127 +291,209 @@ class Backtester:
         except Exception as e:
             print(f">>> ⚠️ [Report Error] {e}")
 
-    async def _analyze_one_safe(self, ticker):
+    async def _fetch_one_safe(self, ticker, frames, count=200, min_rows=50):
         async with self.semaphore:
-            await self._analyze_one(ticker)
-            await asyncio.sleep(0.1) 
+            df = await self._fetch_ohlcv(ticker, count, min_rows)
+            if df is not None: frames[ticker] = df
 
-    async def _analyze_one(self, ticker):
+    async def _fetch_ohlcv(self, ticker, count=200, min_rows=50):
         try:
-            df = await asyncio.to_thread(pyupbit.get_ohlcv, ticker, interval="day", count=200)
-            if df is None or len(df) < 50: return
+            df = await rest.aget_ohlcv(ticker, "day", count, priority=SCAN)
+            if df is None or len(df) < min_rows: return None
+            return df
+        except Exception:
+            return None
 
-            df_for_backtest = df.iloc[:-1].copy() 
+    def _latest_day_start(self):
+        """
+        현재 진행 중인 업비트 일봉의 시작 시각 (00:00 UTC = 09:00 KST)
+        - 서버 시계의 타임존과 무관하게 UTC 기준으로 자른 뒤 캔들 인덱스(KST naive)로 변환
+        """
+        day_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        return day_start + timedelta(hours=9)
 
-            result = await asyncio.to_thread(self._simulate, df_for_backtest)
-            
-            strategy_res = self.strategy.get_ensemble_signal(df, df)
-            
-            if not strategy_res: return
+    async def _load_frames_db(self, tickers):
+        """
+        로컬 candles 테이블에서 전 종목 일괄 로드 (쿼리 1번)
+        - 최근 봉이 빠진 종목만 빠진 만큼 API로 받아 합치고 DB에도 저장
+        - DB에 없거나 너무 짧은 종목(신규 상장 등)은 전체 기간 API 조회
+        - 마지막 봉(진행 중)은 ticker 1회 일괄 조회로 시가/고가/저가/종가/거래량 전부 교체
+        """
+        started = time.perf_counter()
+        count = self.HISTORY_COUNT
+        frames = await asyncio.to_thread(self.candle_repo.load_all, tickers, count)
+        from_db = len(frames)
 
-            strategies = {k: int(v) for k, v in strategy_res['strategies'].items()}
-            
-            self.results_cache[ticker] = {
-                "ticker": ticker,
-                "win_rate": float(result['win_rate']),
-                "total_yield": float(result['total_return']),
-                "mdd": float(result['mdd']),
-                "score": float(strategy_res['score']),
-                "should_buy": bool(strategy_res['should_buy']),
-                "current_price": float(df.iloc[-1]['close']),
-                "target_price": float(strategy_res.get('target_price', 0)),
-                "stop_loss_price": float(strategy_res.get('stop_loss_price', 0)),
-                "atr": float(strategy_res.get('atr', 0)),
-                "rsi": float(strategy_res['rsi']),
-                "mfi": float(strategy_res['mfi']),
-                "strategies": strategies,
-                "score_breakdown": strategy_res.get("score_breakdown", [])
-            }
-        except Exception:
-            pass
+        latest = self._latest_day_start()
+        fetched = {}
+        tasks = []
+        for ticker in tickers:
+            df = frames.get(ticker)
+            if df is None or len(df) < 50:
+                tasks.append(self._fetch_one_safe(ticker, fetched, count))
+                continue
+            missing = (latest - df.index[-1]).days
+            if missing > 0:
+                # 마지막 저장 봉(당시 진행 중)부터 다시 받아서 덮어쓰기
+                tasks.append(self._fetch_one_safe(ticker, fetched, missing + 1, min_rows=1))
+        await asyncio.gather(*tasks)
 
-    def _simulate(self, df):
+        for ticker, new in fetched.items():
+            old = frames.get(ticker)
+            if old is not None:
+                new = pd.concat([old, new[list(old.columns)]])
+                new = new[~new.index.duplicated(keep='last')].sort_index().iloc[-count:]
+            frames[ticker] = new
+        if fetched:
+            await asyncio.to_thread(self.candle_repo.save_frames, fetched)
+
+        # 이번에 API로 안 받은 종목(missing == 0)은 DB의 마지막 봉이 저장 당시 진행 중이던 값
+        # -> ticker 스냅샷(당일 누적 거래량 포함)으로 진행 중인 봉 전체를 다시 받아 교체 (HTTP 1회)
+        stale = [t for t in frames if t not in fetched]
+        if stale:
+            try:
+                bars = await rest.aget_day_bars(stale, priority=SCAN)
+                for ticker, (start, bar) in bars.items():
+                    df = frames.get(ticker)
+                    if df is None or df.index[-1] != start: continue
+                    for col, value in bar.items():
+                        if col in df.columns: df.loc[start, col] = float(value)
+            except Exception as e:
+                print(f">>> ⚠️ [Candles] 진행 중인 봉 갱신 실패 ({e})")
+
+        frames = {t: df for t, df in frames.items() if len(df) >= 50}
+        print(
+            f">>> 💾 [Candles] DB {from_db}종목 로드, API 보충 {len(fetched)}종목 "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+        return frames
+
+    async def _analyze_one(self, ticker):
+        df = await self._fetch_ohlcv(ticker)
+        if df is None: return
+        await asyncio.to_thread(self._analyze_frames, {ticker: df})
+
+    async def _analyze_all(self, frames):
+        # 🔥 [속도 개선] 현재 점수는 전 종목을 2-D로 쌓아 한 번에 계산
+        if self.SCAN_MODE == "process":
+            try:
+                await self._analyze_frames_pool(frames)
+                return
+            except Exception as e:
+                print(f">>> ⚠️ [Scan] 프로세스 풀 실패 ({e}). 스레드 모드로 재시도.")
+        await asyncio.to_thread(self._analyze_frames, frames)
+
+    def _analyze_frames(self, frames):
+        """{티커: 일봉 df} -> 백테스트 + 현재 점수(일괄) -> results_cache 저장"""
+        self._merge_results(evaluate_frames(self.strategy, frames, self.fee))
+
+    async def _analyze_frames_pool(self, frames):
+        """_analyze_frames의 프로세스 풀 버전 (티커 청크 단위로 워커에 분배)"""
+        items = [
+            (ticker, df[list(OHLCV_COLUMNS)].to_numpy(dtype=float).T.copy())
+            for ticker, df in frames.items() if df is not None
+        ]
+        if not items: return
+        size = max(1, self.SCAN_CHUNK_SIZE)
+        tasks = [(self.strategy, items[i:i + size], self.fee) for i in range(0, len(items), size)]
+        outputs = await self._run_pool(_scan_worker, tasks, len(items))
+        merged = {ticker: res for out in outputs for ticker, res in out.items()}
+        await asyncio.to_thread(self._merge_results, merged)
+
+    async def _run_pool(self, worker, tasks, total):
         """
-        과거 90일 데이터 백테스팅
-        🔥 [수정됨] TradeManager의 과열 필터 로직을 그대로 적용하여 현실적인 결과 산출
+        tasks를 프로세스 풀로 실행 -> 워커 반환값 리스트
+        (워커는 (결과, pid, 티커 수, 소요 시간)을 반환, 워커별 시간 합계를 출력)
+        - 풀은 scan_pool의 공용 풀 (처음 한 번만 생성, 스캔마다 재사용, 서버 종료 시 정리)
         """
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        pool = get_scan_pool(self.SCAN_WORKERS)
         try:
-            capital = 1000000
-            balance = capital
-            shares = 0
-            avg_buy_price = 0
-            trade_count = 0
-            win_count = 0
-            max_balance = capital
-            mdd = 0
-            
-            days_to_test = min(90, len(df) - 20)
-            start_idx = len(df) - days_to_test
-            
-            for i in range(start_idx, len(df) - 1):
-                past = df.iloc[:i+1]
-                res = self.strategy.get_ensemble_signal(past, past)
-                
-                if not res: continue
-                
-                next_day_open = float(df.iloc[i+1]['open'])
-                
-                # --- 🔥 [핵심 수정] TradeManager와 동일한 필터링 로직 적용 ---
-                rsi = float(res['rsi'])
-                mfi = float(res.get('mfi', 50))
-                score = float(res['score'])
-
-                is_overheated = False
-                if rsi >= 70: is_overheated = True        # RSI 과열
-                elif mfi >= 80: is_overheated = True      # MFI 과열 (고점 징후)
-                elif rsi >= 60 and mfi < 40: is_overheated = True # 설거지 패턴
-
-                # 매수 조건: 점수 7.0 이상 AND 과열 아님
-                should_buy_final = (score >= 7.0) and (not is_overheated)
-                # --------------------------------------------------------
-
-                # 매수 신호
-                if should_buy_final and shares == 0:
-                    shares = (balance * (1 - self.fee)) / next_day_open
-                    balance = 0
-                    avg_buy_price = next_day_open
-                
-                # 매도 신호 (TradeManager 기준: 3.5 미만이면 매도)
-                # (물론 실제는 익절/손절 로직이 더 있지만, 백테스트에선 점수 기반으로 단순화)
-                elif score < 3.5 and shares > 0:
-                    sell_val = shares * next_day_open * (1 - self.fee)
-                    
-                    if sell_val > (shares * avg_buy_price): 
-                        win_count += 1
-                    
-                    balance = sell_val
-                    shares = 0
-                    trade_count += 1
-                    
-                    max_balance = max(max_balance, balance)
-                    dd = (max_balance - balance) / max_balance * 100
-                    mdd = max(mdd, dd)
-
-            final_asset = balance if balance > 0 else shares * df.iloc[-1]['close']
-            
-            return {
-                "win_rate": round((win_count / trade_count * 100) if trade_count > 0 else 0, 1),
-                "total_return": round(((final_asset / capital) - 1) * 100, 1),
-                "mdd": round(mdd, 1)
-            }
-        except Exception: 
-            return {"win_rate": 0, "total_return": 0, "mdd": 0}
+            outputs = await asyncio.gather(*(loop.run_in_executor(pool, worker, t) for t in tasks))
+        except BrokenProcessPool:
+            reset_scan_pool(pool)
+            raise
+
+        workers = {}
+        for _, pid, count, elapsed in outputs:
+            stat = workers.setdefault(pid, [0, 0, 0.0])
+            stat[0] += 1
+            stat[1] += count
+            stat[2] += elapsed
+
+        print(f">>> ⏱️ [Scan] 프로세스 풀 {len(tasks)}청크 / {total}종목 {time.perf_counter() - started:.2f}s")
+        for pid, (chunks, count, elapsed) in sorted(workers.items()):
+            print(f"    - worker {pid}: {chunks}청크, {count}종목, {elapsed:.2f}s")
+        return [out for out, _, _, _ in outputs]
+
+    def _merge_results(self, results):
+        for ticker, (current_price, result, strategy_res) in results.items():
+            self._store_result(ticker, current_price, result, strategy_res)
+        if self.ROBUSTNESS:
+            self._apply_robustness(results)
+
+    def _apply_robustness(self, results):
+        series = {
+            ticker: (result["daily_returns"], result["trade_returns"])
+            for ticker, (_, result, _) in results.items()
+            if ticker in self.results_cache and "daily_returns" in result
+        }
+        if not series: return
+        robust = robustness.analyze_market(
+            series, self.ROBUST_PATHS, self.ROBUST_BLOCK, self.ROBUST_CI, self.ROBUST_SEED
+        )
+        for ticker, r in robust.items():
+            item = self.results_cache[ticker]
+            item["robust"] = r
+            item["win_rate_lcb"] = r["win_rate"][0]
+            item["total_yield_lcb"] = r["total_yield"][0]
+
+    def _store_result(self, ticker, current_price, result, strategy_res):
+        strategies = {k: int(v) for k, v in strategy_res['strategies'].items()}
+        
+        self.results_cache[ticker] = {
+            "ticker": ticker,
+            "win_rate": float(result['win_rate']),
+            "total_yield": float(result['total_return']),
+            "mdd": float(result['mdd']),
+            "score": float(strategy_res['score']),
+            "should_buy": bool(strategy_res['should_buy']),
+            "current_price": float(current_price),
+            "target_price": float(strategy_res.get('target_price', 0)),
+            "stop_loss_price": float(strategy_res.get('stop_loss_price', 0)),
+            "atr": float(strategy_res.get('atr', 0)),
+            "rsi": float(strategy_res['rsi']),
+            "mfi": float(strategy_res['mfi']),
+            "strategies": strategies,
+            "score_breakdown": strategy_res.get("score_breakdown", [])
+        }
+
+    def _simulate(self, df):
+        return simulate_frame(self.strategy, df, self.fee)
 
     def get_analysis(self, ticker):
         return self.results_cache.get(ticker, None)
 
-    def get_best_opportunities(self, top_n=5):
+    def get_best_opportunities(self, top_n=5, rank_by=None):
+        """
+        점수 > 0 종목 중 상위 top_n 티커
+        - rank_by="score": (점수, 승률, 수익률) 내림차순
+        - rank_by="lcb": (승률 하한, 수익률 하한, 점수) 내림차순
+          한 경로의 운 대신 신뢰구간 하한이 먼저, 점수는 동률일 때만.
+          강건성 분석 결과가 없는 종목은 하한 대신 원래 값을 쓰되 하한이 있는 종목보다 뒤로
+        """
         candidates = list(self.results_cache.values())
         candidates = [c for c in candidates if c['score'] > 0]
         
-        sorted_cands = sorted(
-            candidates, 
-            key=lambda x: (x['score'], x['win_rate'], x['total_yield']), 
-            reverse=True
-        )
+        if (rank_by or self.RANK_BY) == "lcb":
+            key = lambda x: (
+                'win_rate_lcb' in x,
+                x.get('win_rate_lcb', x['win_rate']),
+                x.get('total_yield_lcb', x['total_yield']),
+                x['score'],
+            )
+        else:
+            key = lambda x: (x['score'], x['win_rate'], x['total_yield'])
+        sorted_cands = sorted(candidates, key=key, reverse=True)
         return [c['ticker'] for c in sorted_cands[:top_n]]
\ No newline at end of file
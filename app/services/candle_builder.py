@@ -0,0 +1,139 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# =========================================================
+#  trade 스트림 -> 로컬 OHLCV 봉 (분봉 / 60분봉 / 일봉)
+#  - 티커별 / 주기별 고정 용량 배열 (TickRing과 같은 2배 배열 -> 최근 N봉 연속 구간)
+#  - 시작 시 REST(get_ohlcv)로 1번 시딩, 이후 체결마다 진행 봉 갱신 / 새 구간이면 새 봉
+#  - 웹소켓 재연결(체결 누락 가능) 시 stale 표시 -> TradeManager가 REST로 재동기화
+#  - 봉 시작 시각: 업비트와 동일 (UTC 기준 구간, 인덱스는 KST naive - 일봉 09:00)
+#  - 쓰기는 Collector 쓰레드, 읽기는 이벤트 루프 -> 락 1개 (읽을 때는 복사본 DataFrame)
+# =========================================================
+
+INTERVALS = {"minute1": 60, "minute60": 3600, "day": 86400}
+KST_OFFSET = 9 * 3600
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class CandleSeries:
+    """티커 1개 / 주기 1개 봉 배열 (times: 봉 시작 UTC epoch 초)"""
+
+    def __init__(self, interval, capacity=200):
+        self.interval = interval
+        self.capacity = capacity
+        self.times = np.zeros(capacity * 2, dtype=np.int64)
+        self.bars = np.zeros((len(COLUMNS), capacity * 2))
+        self.count = 0
+
+    def _slot(self):
+        return (self.count - 1) % self.capacity
+
+    def _append(self, t, row):
+        slot = self.count % self.capacity
+        for s in (slot, slot + self.capacity):
+            self.times[s] = t
+            self.bars[:, s] = row
+        self.count += 1
+
+    def seed(self, times, rows):
+        self.count = 0
+        for t, row in zip(times[-self.capacity:], rows[-self.capacity:]):
+            self._append(int(t), row)
+
+    def update(self, ts, price, volume):
+        """체결 1건 반영 (지난 봉에 늦게 도착한 체결은 무시) -> 새 봉이면 True"""
+        bucket = int(ts // self.interval) * self.interval
+        if self.count:
+            slot = self._slot()
+            last = self.times[slot]
+            if bucket < last: return False
+            if bucket == last:
+                for s in (slot, slot + self.capacity):
+                    bar = self.bars[:, s]
+                    if price > bar[1]: bar[1] = price
+                    if price < bar[2]: bar[2] = price
+                    bar[3] = price
+                    bar[4] += volume
+                return False
+        self._append(bucket, (price, price, price, price, volume))
+        return True
+
+    def frame(self, n=None):
+        """최근 n봉 DataFrame (pyupbit.get_ohlcv와 같은 KST 인덱스 / 컬럼, 복사본)"""
+        size = min(self.count, self.capacity)
+        n = size if n is None else min(n, size)
+        if n == 0: return None
+        end = self._slot() + self.capacity + 1
+        index = pd.to_datetime(self.times[end - n:end] + KST_OFFSET, unit='s')
+        return pd.DataFrame(self.bars[:, end - n:end].T.copy(), index=index, columns=COLUMNS)
+
+
+class CandleBuilder:
+    """
+    {티커: {주기: CandleSeries}}
+    - 시딩된 티커만 체결 반영 (구독 전 종목 x 주기 배열을 만들지 않음)
+    - version: 시딩할 때마다 증가 (과거 봉이 바뀌었음을 지표 상태 / 캐시 키에 알림)
+    """
+
+    def __init__(self, capacity=200, intervals=None):
+        self.capacity = capacity
+        self.intervals = intervals or INTERVALS
+        self.series = {}
+        self.versions = {}
+        self.stale = set()
+        self.stats = {"trades": 0, "ignored": 0, "new_bars": 0, "seeds": 0}
+        self._lock = threading.Lock()
+
+    # --- Collector 쓰레드 ---
+    def on_trade(self, ticker, ts, price, volume):
+        """체결 1건 (ts: 체결 시각 UTC epoch 초)"""
+        with self._lock:
+            group = self.series.get(ticker)
+            if group is None:
+                self.stats["ignored"] += 1
+                return
+            self.stats["trades"] += 1
+            for series in group.values():
+                if series.update(ts, price, volume): self.stats["new_bars"] += 1
+
+    def invalidate_all(self):
+        """웹소켓 (재)연결: 끊긴 동안 체결이 빠졌을 수 있으니 전 종목 재동기화 대상"""
+        with self._lock:
+            self.stale.update(self.series)
+
+    # --- 이벤트 루프 ---
+    def seed(self, ticker, frames):
+        """{주기: REST 캔들 df} 로 시딩 (없는 주기는 빈 배열에서 체결로 채움)"""
+        group = {name: CandleSeries(sec, self.capacity) for name, sec in self.intervals.items()}
+        for name, df in frames.items():
+            if df is None or df.empty or name not in group: continue
+            times = (df.index.values.astype('datetime64[s]').astype(np.int64) - KST_OFFSET)
+            group[name].seed(times, df[list(COLUMNS)].to_numpy(dtype=float))
+        with self._lock:
+            self.series[ticker] = group
+            self.versions[ticker] = self.versions.get(ticker, 0) + 1
+            self.stale.discard(ticker)
+            self.stats["seeds"] += 1
+
+    def needs_sync(self, ticker, names):
+        group = self.series.get(ticker)
+        if group is None or ticker in self.stale: return True
+        return any(group[name].count == 0 for name in names)
+
+    def frame(self, ticker, name, count=None):
+        with self._lock:
+            group = self.series.get(ticker)
+            return group[name].frame(count) if group else None
+
+    def version(self, ticker):
+        return self.versions.get(ticker, 0)
+
+    def drop(self, ticker):
+        with self._lock:
+            self.series.pop(ticker, None)
+            self.stale.discard(ticker)
+
+    def tickers(self):
+        return list(self.series)
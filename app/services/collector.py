@@ -2,15 +2,58 @@ import threading
 import asyncio
 import json
 import time
-import pyupbit
 import websockets # pip install websockets 필요
+from app.services.tick_store import TickStore
+from app.services.upbit_rest import rest
+
+# 🔥 [속도 개선] orjson 있으면 사용 (pip install orjson, 선택 사항) - 없으면 표준 json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# 업비트 응답 필드명 (SIMPLE = 축약 포맷)
+MESSAGE_KEYS = {
+    "SIMPLE": {
+        "type": "ty", "code": "cd", "price": "tp", "volume": "tv", "trade_ts": "ttms",
+        "acc_volume": "atv24h", "acc_price": "atp24h", "ts": "tms",
+    },
+    "DEFAULT": {
+        "type": "type", "code": "code", "price": "trade_price", "volume": "trade_volume", "trade_ts": "trade_timestamp",
+        "acc_volume": "acc_trade_volume_24h", "acc_price": "acc_trade_price_24h", "ts": "timestamp",
+    },
+}
 
 class Collector:
-    def __init__(self, shared_dict):
+    def __init__(self, shared_dict, candles=None, events=None, exits=None):
+        # 🔥 [속도 개선] 티커별 링 버퍼 저장소 (메시지마다 dict 새로 만들지 않음)
         self.shared_dict = shared_dict
+        # 🔥 [속도 개선] trade 스트림으로 로컬 봉 생성 (CandleBuilder, None이면 ticker만 구독)
+        self.candles = candles
+        # 🔥 [속도 개선] 가격이 바뀐 티커를 매매 루프에 알림 (PriceEventQueue)
+        self.events = events
+        # 🔥 [속도 개선] 보유 티커 손절/트레일링 레벨 (ExitIndex) - 모든 틱을 O(1)로 검사
+        self.exits = exits
         self.thread = None
         self.running = False
 
+        # 🔥 [속도 개선] 수신 포맷 / 합치기 설정
+        self.FORMAT = "SIMPLE"          # "SIMPLE"(축약 필드) | "DEFAULT"
+        self.COALESCE_INTERVAL = 0.1    # 티커당 시세 반영 최소 간격 (초, 0이면 매 메시지). 손절 레벨 검사는 매 틱
+        self.STATS_INTERVAL = 60        # 수집 통계 출력 간격 (초)
+        self.keys = MESSAGE_KEYS[self.FORMAT]
+        self.pending = {}               # 티커 -> (시세 값, 첫 수신 시각) (간격 안에 들어온 최신 시세)
+        self.delivered_at = {}          # 티커 -> 마지막 반영 시각
+        self.last_price = {}            # 티커 -> 마지막 수신 가격 (손절 레벨 검사용)
+        self.stats = self._new_stats()
+
+    def _new_stats(self):
+        return {
+            "messages": 0, "ticker": 0, "trade": 0, "dropped": 0,
+            "coalesced": 0, "delivered": 0, "decode_sec": 0.0, "started": time.time(),
+        }
+
     def start(self):
         """수집기 쓰레드 시작"""
         self.running = True
@@ -39,7 +82,7 @@ class Collector:
         
         # 1. 티커 조회
         try:
-            tickers = pyupbit.get_tickers(fiat="KRW")
+            tickers = await rest.aget_tickers(fiat="KRW")
         except:
             # 실패 시 비상용 하드코딩 (최소한의 코인으로라도 돌리기 위해)
             tickers = ["KRW-BTC", "KRW-ETH", "KRW-XRP"]
@@ -51,40 +94,131 @@ class Collector:
             {"ticket": "CoinMate-Bot"},
             {"type": "ticker", "codes": tickers, "isOnlyRealtime": True}
         ]
+        if self.candles is not None:
+            subscribe_fmt.append({"type": "trade", "codes": tickers, "isOnlyRealtime": True})
+        subscribe_fmt.append({"format": self.FORMAT})
+        self.keys = MESSAGE_KEYS[self.FORMAT]
+
+        flusher = asyncio.create_task(self._flush_loop())
 
         # 2. 무한 재연결 루프 (끊기면 다시 붙음)
-        while self.running:
-            try:
-                async with websockets.connect(uri, ping_interval=60) as websocket:
-                    await websocket.send(json.dumps(subscribe_fmt))
-                    print(f">>> ⚡ [Collector] 데이터 수신 시작 (Direct Mode, {len(tickers)}개)")
-                    
-                    first_msg = True
-                    
-                    while self.running:
-                        data_str = await websocket.recv()
-                        data = json.loads(data_str)
+        try:
+            while self.running:
+                try:
+                    async with websockets.connect(uri, ping_interval=60) as websocket:
+                        await websocket.send(json.dumps(subscribe_fmt))
+                        print(f">>> ⚡ [Collector] 데이터 수신 시작 (Direct Mode, {len(tickers)}개, {self.FORMAT})")
+                        # 끊긴 동안 빠진 체결이 있을 수 있음 -> 로컬 봉은 REST로 재동기화
+                        if self.candles is not None: self.candles.invalidate_all()
                         
-                        if first_msg:
-                            print(f">>> 🎉 [Collector] 첫 데이터 수신 성공! {data.get('code', 'Unknown')}")
-                            first_msg = False
-
-                        if 'code' in data:
-                            ticker = data['code']
-                            price = float(data['trade_price'])
-                            
-                            self.shared_dict[ticker] = {
-                                "current_price": price,
-                                "acc_trade_price_24h": float(data['acc_trade_price_24h']),
-                                "timestamp": time.time()
-                            }
+                        first_msg = True
+                        
+                        while self.running:
+                            data = self.handle_message(await websocket.recv())
                             
-            except Exception as e:
-                print(f">>> ⚠️ [Collector] 연결 끊김 ({e}). 3초 후 재연결...")
-                await asyncio.sleep(3)
+                            if first_msg and data:
+                                print(f">>> 🎉 [Collector] 첫 데이터 수신 성공! {data.get(self.keys['code'], 'Unknown')}")
+                                first_msg = False
+                                
+                except Exception as e:
+                    print(f">>> ⚠️ [Collector] 연결 끊김 ({e}). 3초 후 재연결...")
+                    await asyncio.sleep(3)
+        finally:
+            flusher.cancel()
+
+    # --- 메시지 처리 ---
+    def handle_message(self, raw):
+        """원본 메시지 1개 디코드 -> 체결은 로컬 봉, 시세는 합치기 후 반영 (디코드한 dict 반환, 실패 시 None)"""
+        k = self.keys
+        started = time.perf_counter()
+        try:
+            data = _loads(raw)
+        except ValueError:
+            self.stats["dropped"] += 1
+            return None
+        self.stats["decode_sec"] += time.perf_counter() - started
+        self.stats["messages"] += 1
+
+        try:
+            kind = data.get(k['type'])
+            if kind == 'trade':
+                self.stats["trade"] += 1
+                if self.candles is not None:
+                    self.candles.on_trade(
+                        data[k['code']], data[k['trade_ts']] / 1000, float(data[k['price']]), float(data[k['volume']])
+                    )
+            elif kind == 'ticker':
+                self.stats["ticker"] += 1
+                ts = data.get(k['ts'])
+                self.on_ticker(
+                    data[k['code']], float(data[k['price']]),
+                    float(data.get(k['acc_volume'], 0)), float(data.get(k['acc_price'], 0)),
+                    ts / 1000 if ts else None, time.time()
+                )
+            else:
+                self.stats["dropped"] += 1
+        except (KeyError, TypeError, ValueError):
+            self.stats["dropped"] += 1
+            return None
+        return data
+
+    def on_ticker(self, ticker, price, acc_volume, acc_price, exchange_ts, recv_ts):
+        # 손절/트레일링 레벨은 합치기 전에 매 틱 검사 (중간 교차를 놓치지 않음)
+        if self.exits is not None and price != self.last_price.get(ticker):
+            self.exits.on_tick(ticker, price)
+        self.last_price[ticker] = price
+
+        values = (price, acc_volume, acc_price, exchange_ts, recv_ts)
+        if recv_ts - self.delivered_at.get(ticker, 0) >= self.COALESCE_INTERVAL:
+            first = self.pending.pop(ticker, (None, recv_ts))[1]
+            self._deliver(ticker, values, first)
+        else:
+            # 간격 안: 최신 값만 보관 (첫 수신 시각은 유지 -> 지연 측정)
+            prev = self.pending.get(ticker)
+            if prev is not None: self.stats["coalesced"] += 1
+            self.pending[ticker] = (values, prev[1] if prev else recv_ts)
+
+    def _deliver(self, ticker, values, first_recv_ts):
+        price, acc_volume, acc_price, exchange_ts, recv_ts = values
+        changed = price != self.shared_dict.latest_price(ticker)
+        self.shared_dict.push(ticker, price, acc_volume, acc_price, exchange_ts, recv_ts)
+        self.delivered_at[ticker] = recv_ts
+        self.stats["delivered"] += 1
+        if changed and self.events is not None:
+            self.events.publish(ticker, first_recv_ts)
+
+    def flush(self, now=None):
+        """간격이 지난 보류 시세 반영 (새 메시지가 안 와도 마지막 값이 늦게라도 반영되도록)"""
+        now = time.time() if now is None else now
+        for ticker in [t for t in self.pending if now - self.delivered_at.get(t, 0) >= self.COALESCE_INTERVAL]:
+            values, first = self.pending.pop(ticker)
+            self._deliver(ticker, values, first)
+
+    async def _flush_loop(self):
+        last_report = time.time()
+        while self.running:
+            await asyncio.sleep(self.COALESCE_INTERVAL if self.COALESCE_INTERVAL > 0 else 1)
+            self.flush()
+            if time.time() - last_report >= self.STATS_INTERVAL:
+                print(f">>> 📊 [Collector] {self.report()}")
+                last_report = time.time()
+                self.stats = self._new_stats()
+
+    def report(self):
+        """수집 통계 (초당 메시지 / 평균 디코드 시간 / 합치기·버림 건수)"""
+        s = self.stats
+        elapsed = max(time.time() - s["started"], 1e-9)
+        return {
+            "msg_per_sec": round(s["messages"] / elapsed, 1),
+            "ticker": s["ticker"], "trade": s["trade"],
+            "decode_us": round(s["decode_sec"] / s["messages"] * 1e6, 2) if s["messages"] else 0.0,
+            "coalesced": s["coalesced"], "delivered": s["delivered"], "dropped": s["dropped"],
+            "pending": len(self.pending),
+        }
 
 # 전역 함수 (main.py에서 호출)
-def start_collector_thread(shared_dict):
-    collector = Collector(shared_dict)
+def start_collector_thread(shared_dict=None, candles=None, events=None, exits=None):
+    if shared_dict is None: shared_dict = TickStore()
+    collector = Collector(shared_dict, candles, events, exits)
     collector.start()
-    return collector
\ No newline at end of file
+    return collector
@@ -1,8 +1,7 @@
-import pyupbit
-import time
 import sqlite3
 import pandas as pd
 from app.core.database import DB_PATH, init_db
+from app.services.upbit_rest import rest, SCAN
 
 def fetch_and_save_all_coins(days=200):
     """
@@ -10,7 +9,7 @@ def fetch_and_save_all_coins(days=200):
     - 기존: 1행마다 DB 연결 (느림)
     - 개선: 코인 1개당 1번 연결 & 대량 삽입 (빠름)
     """
-    tickers = pyupbit.get_tickers(fiat="KRW")
+    tickers = rest.get_tickers(fiat="KRW")
     total = len(tickers)
     print(f">>> 📥 데이터 적재 시작: 총 {total}개 코인 ({days}일치)")
     
@@ -25,7 +24,7 @@ def fetch_and_save_all_coins(days=200):
                 print(f"[{i}/{total}] {ticker} 다운로드 중...", end="\r")
                 
                 # 1. API로 데이터 가져오기
-                df = pyupbit.get_ohlcv(ticker, interval="day", count=days)
+                df = rest.get_ohlcv(ticker, "day", days, priority=SCAN)  # 호출 속도는 스케줄러가 조절
                 
                 if df is None or df.empty:
                     continue
@@ -55,9 +54,6 @@ def fetch_and_save_all_coins(days=200):
                 
                 conn.commit() # 코인 1개 다 넣고 커밋
                 
-                # API 제한 방지 (아주 짧게 휴식)
-                time.sleep(0.05)
-                
             except Exception as e:
                 print(f"\n[Error] {ticker}: {e}")
                 
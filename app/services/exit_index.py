@@ -0,0 +1,114 @@
+import threading
+
+# =========================================================
+#  가격 기준 청산 레벨 인덱스 (손절 / 트레일링 스탑)
+#  - 보유 티커별로 손절가 / 트레일링 발동가 / 트레일링 트리거가를 미리 계산해 둠
+#  - 틱마다 O(1) 비교 (캔들 / 앙상블 점수 계산 없음), 최고가가 오르면 트리거가만 갱신
+#  - Collector 쓰레드가 on_tick으로 모든 틱을 검사 -> 교차하면 triggered에 기록
+#    (매매 루프는 깨어나자마자 pop_triggered로 바로 매도, 배치 합치기로 중간 틱을 놓치지 않음)
+#  - 규칙은 process_selling과 동일: 손절(수익률 <= STOP_LOSS) 우선,
+#    수익률 >= TRAILING_START 구간에서 최고가 대비 TRAILING_CALLBACK% 하락 시 트레일링 스탑
+# =========================================================
+
+
+class ExitLevels:
+    __slots__ = ("trade_id", "buy_price", "peak", "stop_px", "act_px", "trigger_px")
+
+    def __init__(self, trade_id, buy_price, peak=None):
+        self.trade_id = trade_id
+        self.buy_price = buy_price
+        self.peak = buy_price if peak is None else peak
+        self.stop_px = self.act_px = self.trigger_px = 0.0
+
+
+class ExitIndex:
+    def __init__(self, stop_loss=-3.0, trailing_start=2.0, trailing_callback=1.0):
+        self.levels = {}
+        self.triggered = {}
+        self.rules = (stop_loss, trailing_start, trailing_callback)
+        self._lock = threading.Lock()
+
+    # --- 레벨 관리 (이벤트 루프) ---
+    def _relevel(self, lv):
+        stop_loss, trailing_start, trailing_callback = self.rules
+        lv.stop_px = lv.buy_price * (1 + stop_loss / 100)
+        lv.act_px = lv.buy_price * (1 + trailing_start / 100)
+        lv.trigger_px = lv.peak * (1 - trailing_callback / 100)
+
+    def sync(self, open_trades, stop_loss, trailing_start, trailing_callback):
+        """DB 보유 목록과 맞춤 (새 보유는 등록, 정리된 보유는 삭제, 규칙 변경 시 레벨 재계산)"""
+        rules = (stop_loss, trailing_start, trailing_callback)
+        with self._lock:
+            rules_changed = rules != self.rules
+            self.rules = rules
+            held = set()
+            for trade in open_trades:
+                ticker, buy_price = trade['ticker'], trade['buy_price']
+                held.add(ticker)
+                lv = self.levels.get(ticker)
+                if lv is None or lv.trade_id != trade['id']:
+                    if buy_price and buy_price > 0:
+                        lv = self.levels[ticker] = ExitLevels(trade['id'], buy_price)
+                        self._relevel(lv)
+                elif rules_changed:
+                    self._relevel(lv)
+            for ticker in [t for t in self.levels if t not in held]:
+                del self.levels[ticker]
+                self.triggered.pop(ticker, None)
+
+    def arm(self, ticker, trade_id, buy_price):
+        """매수가를 DB에서 못 받은 보유 (buy_price <= 0) 는 현재가 기준으로 등록"""
+        with self._lock:
+            lv = self.levels[ticker] = ExitLevels(trade_id, buy_price)
+            self._relevel(lv)
+
+    def disarm(self, ticker):
+        with self._lock:
+            self.levels.pop(ticker, None)
+            self.triggered.pop(ticker, None)
+
+    # --- 틱 검사 (O(1)) ---
+    def _evaluate(self, lv, price):
+        if price > lv.peak:
+            lv.peak = price
+            lv.trigger_px = price * (1 - self.rules[2] / 100)
+        if price <= lv.stop_px:
+            profit_rate = (price - lv.buy_price) / lv.buy_price * 100
+            return f"💧손절방어({profit_rate:.2f}%)"
+        if price >= lv.act_px and price <= lv.trigger_px:
+            profit_rate = (price - lv.buy_price) / lv.buy_price * 100
+            drawdown_pct = (lv.peak - price) / lv.peak * 100
+            return f"📉트레일링스탑({profit_rate:.2f}%, 피크-{drawdown_pct:.2f}%)"
+        return ""
+
+    def on_tick(self, ticker, price):
+        """Collector 쓰레드: 틱 1개 검사 -> 새로 교차했으면 True"""
+        lv = self.levels.get(ticker)
+        if lv is None or price <= 0: return False
+        with self._lock:
+            reason = self._evaluate(lv, price)
+            if not reason or ticker in self.triggered: return False
+            self.triggered[ticker] = (lv.trade_id, price, reason)
+            return True
+
+    def check(self, ticker, price):
+        """이벤트 루프: 현재가 기준 청산 사유 ("" 이면 해당 없음)"""
+        lv = self.levels.get(ticker)
+        if lv is None or price <= 0: return ""
+        with self._lock:
+            return self._evaluate(lv, price)
+
+    def pop_triggered(self):
+        """{티커: (trade_id, 교차 가격, 사유)} - 꺼낸 뒤 비움 (매도 실패 시 다음 교차 틱에 다시 기록)"""
+        with self._lock:
+            out, self.triggered = self.triggered, {}
+        return out
+
+    def in_trailing_zone(self, ticker, price):
+        """수익률 >= TRAILING_START 구간 (process_selling에서 지표 청산을 건너뛰는 구간)"""
+        lv = self.levels.get(ticker)
+        return lv is not None and price >= lv.act_px
+
+    def peak(self, ticker):
+        lv = self.levels.get(ticker)
+        return lv.peak if lv else None
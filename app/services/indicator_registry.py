@@ -0,0 +1,159 @@
+from app.services import indicators as ind
+
+# =========================================================
+#  지표 의존성 그래프
+#  - 각 지표는 이름 + 입력(다른 지표 or OHLCV 컬럼)을 선언해서 등록
+#  - IndicatorContext가 평가 1회 동안 프레임별로 중간값을 1번만 계산
+#    (예: tp는 MFI/VWAP/CCI 공용, tr은 ADX/ATR 공용, sma20은 추세/볼린저 공용)
+#  - 새 지표는 @indicator로 등록만 하면 기존 중간값을 그대로 재사용
+# =========================================================
+
+BASE_INPUTS = ('open', 'high', 'low', 'close', 'volume')
+
+_REGISTRY = {}
+
+
+def indicator(name, *inputs):
+    """지표 등록 데코레이터: fn(*inputs) -> ndarray (or 튜플)"""
+    def wrap(fn):
+        _REGISTRY[name] = (inputs, fn)
+        return fn
+    return wrap
+
+
+def registered():
+    return {name: inputs for name, (inputs, _) in _REGISTRY.items()}
+
+
+class IndicatorContext:
+    """
+    평가 1회용 계산 컨텍스트
+    - frames: 이름 -> {"open", "high", "low", "close", "volume"} 배열 (1-D or 2-D)
+    - 같은 배열 묶음을 가리키는 프레임(예: 분봉 대신 일봉 사용)은 캐시도 공유
+    """
+
+    def __init__(self, **frames):
+        self.frames = frames
+        self._cache = {}
+        self.computed = 0
+
+    def get(self, name, frame):
+        arrays = self.frames[frame]
+        key = (id(arrays), name)
+        if key in self._cache:
+            return self._cache[key]
+
+        if name in BASE_INPUTS:
+            value = arrays[name]
+        else:
+            inputs, fn = _REGISTRY[name]
+            value = fn(*(self.get(dep, frame) for dep in inputs))
+            self.computed += 1
+        self._cache[key] = value
+        return value
+
+
+# --- 공용 중간값 ---
+
+@indicator("prev_close", "close")
+def _prev_close(close):
+    return ind.shift(close)
+
+
+@indicator("tp", "high", "low", "close")
+def _tp(high, low, close):
+    return ind.typical_price(high, low, close)
+
+
+@indicator("tr", "high", "low", "close", "prev_close")
+def _tr(high, low, close, prev_close):
+    return ind.true_range(high, low, close, prev_close=prev_close)
+
+
+@indicator("sma20", "close")
+def _sma20(close):
+    return ind.rolling_mean(close, 20)
+
+
+@indicator("std20", "close")
+def _std20(close):
+    return ind.rolling_std(close, 20)
+
+
+@indicator("vol_sma20", "volume")
+def _vol_sma20(volume):
+    return ind.rolling_mean(volume, 20)
+
+
+# --- 앙상블 지표 ---
+
+@indicator("trend", "close", "sma20")
+def _trend(close, sma20):
+    return close >= sma20
+
+
+@indicator("adx_lines", "high", "low", "close", "tr")
+def _adx_lines(high, low, close, tr):
+    return ind.adx(high, low, close, tr=tr)
+
+
+@indicator("adx_signal", "high", "low", "close", "adx_lines")
+def _adx_signal(high, low, close, adx_lines):
+    return ind.adx_signal(high, low, close, lines=adx_lines)
+
+
+@indicator("volume_signal", "volume", "close", "open", "vol_sma20")
+def _volume_signal(volume, close, open_, vol_sma20):
+    return ind.volume_signal(volume, close, open_, vol_ma=vol_sma20)
+
+
+@indicator("rsi", "close")
+def _rsi(close):
+    return ind.rsi(close)
+
+
+@indicator("mfi", "high", "low", "close", "volume", "tp")
+def _mfi(high, low, close, volume, tp):
+    return ind.mfi(high, low, close, volume, tp=tp)
+
+
+@indicator("vwap_signal", "high", "low", "close", "volume", "tp")
+def _vwap_signal(high, low, close, volume, tp):
+    return ind.vwap_signal(high, low, close, volume, tp=tp)
+
+
+@indicator("bollinger_bands", "close", "sma20", "std20")
+def _bollinger_bands(close, sma20, std20):
+    return ind.bollinger_bands(close, ma=sma20, std=std20)
+
+
+@indicator("bollinger_signal", "close", "open", "bollinger_bands", "prev_close")
+def _bollinger_signal(close, open_, bands, prev_close):
+    return ind.bollinger_signal(close, open_, bands=bands, prev_close=prev_close)
+
+
+@indicator("atr", "high", "low", "close", "tr")
+def _atr(high, low, close, tr):
+    return ind.atr(high, low, close, tr=tr)
+
+
+@indicator("macd_score", "close")
+def _macd_score(close):
+    return ind.macd_score(close)
+
+
+# --- 보조 지표 (TradeManager.STRATEGY_MAP의 stoch / cci) ---
+
+@indicator("stoch_lines", "high", "low", "close")
+def _stoch_lines(high, low, close):
+    return ind.stoch(high, low, close)
+
+
+@indicator("stoch_signal", "stoch_lines")
+def _stoch_signal(stoch_lines):
+    return ind.stoch_signal(*stoch_lines)
+
+
+@indicator("cci_signal", "high", "low", "close", "tp")
+def _cci_signal(high, low, close, tp):
+    return ind.cci_signal(ind.cci(high, low, close, tp=tp))
@@ -0,0 +1,278 @@
+import math
+from collections import deque
+
+import pandas as pd
+
+from app.services.indicators import EWM_EMPTY, ewm_alpha, ewm_step, ewm_value
+
+# =========================================================
+#  실시간 증분 지표 엔진
+#  - 티커별로 캐시된 일봉/60분봉으로 한 번 시딩(seed)
+#  - 틱(현재가 변경) / 봉 마감 시 O(1)로 상태 갱신
+#  - 결과는 Strategy.get_ensemble_signal과 동일 (채점은 Strategy.build_signal 공용)
+# =========================================================
+
+
+def _mean(win):
+    # 횡보 구간(값이 전부 같음)은 정의값 그대로 (indicators.rolling_mean과 동일)
+    return win[0] if max(win) == min(win) else math.fsum(win) / len(win)
+
+
+class _FrameState:
+    """
+    한 캔들 프레임(일봉 or 분봉)의 증분 상태
+    - 확정봉(0 ~ n-2)까지는 EWM/누적합/윈도우 버퍼에 반영(commit)
+    - 마지막 봉(진행 중)은 별도로 보관하고 평가 시에만 임시 반영
+    """
+    N = 14
+    A_N = ewm_alpha(alpha=1 / 14)
+    A_12 = ewm_alpha(span=12)
+    A_26 = ewm_alpha(span=26)
+    A_9 = ewm_alpha(span=9)
+
+    def __init__(self, df):
+        self.count = 0
+        self.prev = None  # 직전 확정봉 (o, h, l, c, v, tp)
+
+        self.tr_e = self.pdm_e = self.mdm_e = self.adx_e = EWM_EMPTY
+        self.gain_e = self.loss_e = EWM_EMPTY
+        self.ema12 = self.ema26 = self.macd_sig = EWM_EMPTY
+        self.cum_v = 0.0
+        self.cum_pv = 0.0
+
+        # rolling 윈도우는 (기간 - 1)개의 확정값만 보관 + 진행 봉 1개
+        self.close_win = deque(maxlen=19)
+        self.vol_win = deque(maxlen=19)
+        self.tr_win = deque(maxlen=self.N - 1)
+        self.pos_win = deque(maxlen=self.N - 1)
+        self.neg_win = deque(maxlen=self.N - 1)
+
+        rows = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=float).tolist()
+        for row in rows[:-1]:
+            self._commit(row)
+        self.bar = list(rows[-1])
+
+    def __len__(self):
+        return self.count + 1
+
+    # --- 봉 단위 계산 ---
+    def _advance(self, bar):
+        """bar를 반영했을 때의 새 상태(커밋 전)와 봉 파생값 계산"""
+        o, h, l, c, v = bar
+        prev = self.prev
+        tp = (h + l + c) / 3
+        mf = tp * v
+
+        if prev is None:
+            tr = h - l
+            pdm = mdm = 0.0
+            gain = loss = 0.0
+            pos = neg = 0.0
+        else:
+            po, ph, pl, pc, pv, ptp = prev
+            tr = max(h - l, abs(h - pc), abs(l - pc))
+
+            up_move = h - ph
+            down_move = -(l - pl)
+            pdm = up_move if (up_move > down_move and up_move > 0) else 0.0
+            mdm = down_move if (down_move > up_move and down_move > 0) else 0.0
+
+            delta = c - pc
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+
+            delta_tp = tp - ptp
+            pos = mf if delta_tp > 0 else 0.0
+            neg = mf if delta_tp < 0 else 0.0
+
+        # ADX (Wilder EWM)
+        tr_e = ewm_step(self.tr_e, tr, self.A_N)
+        pdm_e = ewm_step(self.pdm_e, pdm, self.A_N)
+        mdm_e = ewm_step(self.mdm_e, mdm, self.A_N)
+        tr_s = ewm_value(tr_e, self.N)
+        if tr_s == 0: tr_s = 0.0001
+        pdi = 100 * (ewm_value(pdm_e, self.N) / tr_s)
+        mdi = 100 * (ewm_value(mdm_e, self.N) / tr_s)
+        div = pdi + mdi
+        if div == 0: div = 0.0001
+        dx = (abs(pdi - mdi) / div) * 100
+        adx_e = ewm_step(self.adx_e, dx, self.A_N)
+
+        # MACD (adjust=False)
+        ema12 = ewm_step(self.ema12, c, self.A_12, adjust=False)
+        ema26 = ewm_step(self.ema26, c, self.A_26, adjust=False)
+        macd = ewm_value(ema12) - ewm_value(ema26)
+        macd_sig = ewm_step(self.macd_sig, macd, self.A_9, adjust=False)
+
+        return {
+            "bar": (o, h, l, c, v, tp),
+            "tr": tr, "pos": pos, "neg": neg, "mf": mf,
+            "tr_e": tr_e, "pdm_e": pdm_e, "mdm_e": mdm_e, "adx_e": adx_e,
+            "pdi": pdi, "mdi": mdi,
+            "gain_e": ewm_step(self.gain_e, gain, self.A_N),
+            "loss_e": ewm_step(self.loss_e, loss, self.A_N),
+            "ema12": ema12, "ema26": ema26, "macd": macd, "macd_sig": macd_sig,
+        }
+
+    def _commit(self, bar):
+        st = self._advance(bar)
+        o, h, l, c, v, tp = st["bar"]
+
+        self.tr_e, self.pdm_e, self.mdm_e, self.adx_e = st["tr_e"], st["pdm_e"], st["mdm_e"], st["adx_e"]
+        self.gain_e, self.loss_e = st["gain_e"], st["loss_e"]
+        self.ema12, self.ema26, self.macd_sig = st["ema12"], st["ema26"], st["macd_sig"]
+        self.cum_v += v
+        self.cum_pv += st["mf"]
+
+        self.close_win.append(c)
+        self.vol_win.append(v)
+        self.tr_win.append(st["tr"])
+        self.pos_win.append(st["pos"])
+        self.neg_win.append(st["neg"])
+
+        self.prev = st["bar"]
+        self.count += 1
+
+    # --- 외부 갱신 API ---
+    def set_last(self, close=None, high=None, low=None, open_=None, volume=None):
+        """진행 중인 마지막 봉 덮어쓰기 (틱 도착). None인 항목은 유지"""
+        for i, val in enumerate((open_, high, low, close, volume)):
+            if val is not None:
+                self.bar[i] = float(val)
+
+    def append_bar(self, open_, high, low, close, volume):
+        """봉 마감: 진행 봉을 확정하고 새 봉을 진행 봉으로"""
+        self._commit(self.bar)
+        self.bar = [float(open_), float(high), float(low), float(close), float(volume)]
+
+    # --- 평가 ---
+    def day_signals(self):
+        """(현재가, 추세, ADX, 거래량) - 일봉 프레임용"""
+        st = self._advance(self.bar)
+        o, h, l, c, v, _ = st["bar"]
+        n = len(self)
+
+        ma20 = _mean(list(self.close_win) + [c]) if n >= 20 else math.nan
+        is_bull_market = c >= ma20
+
+        adx_signal = 0
+        if n >= self.N * 2:
+            adx = ewm_value(st["adx_e"], self.N)
+            if adx >= 20 and st["pdi"] > st["mdi"]:
+                adx_signal = 1
+
+        vol_signal = 0
+        if n >= 20:
+            vol_ma20 = math.fsum(list(self.vol_win) + [v]) / 20
+            if v > (vol_ma20 * 1.5) and c > o:
+                vol_signal = 1
+
+        return c, is_bull_market, adx_signal, vol_signal
+
+    def min_signals(self):
+        """(RSI, MFI, VWAP, 볼린저, ATR, MACD) - 분봉 프레임용"""
+        st = self._advance(self.bar)
+        o, h, l, c, v, tp = st["bar"]
+        n = len(self)
+
+        # RSI (ffill().fillna(50)과 동일: 최소 기간 전에는 50)
+        loss_s = ewm_value(st["loss_e"], self.N)
+        if loss_s == 0: loss_s = 0.0001
+        rs = ewm_value(st["gain_e"], self.N) / loss_s
+        rsi_val = 100 - (100 / (1 + rs))
+        if rsi_val != rsi_val: rsi_val = 50.0
+
+        # MFI
+        mfi_val = 50.0
+        if n >= self.N:
+            pos_sum = math.fsum(list(self.pos_win) + [st["pos"]])
+            neg_sum = math.fsum(list(self.neg_win) + [st["neg"]])
+            if neg_sum == 0: neg_sum = 0.0001
+            mfi_val = 100 - (100 / (1 + (pos_sum / neg_sum)))
+
+        # VWAP (프레임 시작부터 누적)
+        cum_v = self.cum_v + v
+        if cum_v == 0: cum_v = 1
+        vwap_signal = 1 if c > (self.cum_pv + st["mf"]) / cum_v else 0
+
+        # 볼린저 (20, 2σ, 하단 1.02배)
+        bollinger_score = 0
+        if n >= 20:
+            win = list(self.close_win) + [c]
+            ma = _mean(win)
+            std = 0.0 if max(win) == min(win) else math.sqrt(math.fsum((x - ma) ** 2 for x in win) / 19)
+            upper = ma + (std * 2)
+            lower = ma - (std * 2)
+            prev_close = self.prev[3] if self.prev else math.nan
+            is_near_lower = c <= (lower * 1.02)
+            is_rebounding = (c > prev_close) and (c >= o)
+            if is_near_lower and is_rebounding:
+                bollinger_score = 1
+            elif c >= upper:
+                bollinger_score = -1
+
+        # ATR (14)
+        atr_value = math.fsum(list(self.tr_win) + [st["tr"]]) / self.N if n >= self.N else math.nan
+
+        # MACD (교차 분기도 결과적으로 curr > sig 과 같음)
+        macd, sig = st["macd"], ewm_value(st["macd_sig"])
+        macd_score = 1 if macd > sig else (-1 if macd < sig else 0)
+
+        return rsi_val, mfi_val, vwap_signal, bollinger_score, atr_value, macd_score
+
+
+class IndicatorState:
+    """
+    티커 1개의 실시간 지표 상태
+    - get_smart_candles가 캔들을 새로 받을 때마다 시딩
+    - 틱마다 update_price() -> signal()  (pandas 재계산 없음)
+    """
+
+    def __init__(self, strategy, df_day: pd.DataFrame, df_min: pd.DataFrame = None):
+        self.strategy = strategy
+        self.day = None
+        self.min = None
+        if df_day is None or len(df_day) < 30:
+            return
+        self.day = _FrameState(df_day)
+        # get_ensemble_signal과 동일: 분봉이 부족하면 일봉으로 대체 (같은 상태 공유)
+        if df_min is None or len(df_min) < 30:
+            self.min = self.day
+        else:
+            self.min = _FrameState(df_min)
+
+    @property
+    def ready(self):
+        return self.day is not None and len(self.day) >= 30
+
+    def update_price(self, price, min_price=None):
+        """틱 도착: 일봉/분봉의 마지막 종가를 현재가로 교체 (get_smart_candles와 동일)"""
+        if not self.ready: return
+        self.day.set_last(close=price)
+        if self.min is not self.day:
+            self.min.set_last(close=price if min_price is None else min_price)
+
+    def update_last(self, day_bar, min_bar=None):
+        """진행 중인 마지막 봉 (o, h, l, c, v) 전체 교체 - 체결로 고가/저가/거래량도 바뀌는 로컬 캔들용"""
+        if not self.ready: return
+        o, h, l, c, v = day_bar
+        self.day.set_last(close=c, high=h, low=l, open_=o, volume=v)
+        if self.min is not self.day and min_bar is not None:
+            o, h, l, c, v = min_bar
+            self.min.set_last(close=c, high=h, low=l, open_=o, volume=v)
+
+    def close_bar(self, frame, open_, high, low, close, volume):
+        """봉 마감: frame = 'day' | 'min'"""
+        if not self.ready: return
+        target = self.day if frame == "day" else self.min
+        target.append_bar(open_, high, low, close, volume)
+
+    def signal(self, debug=False):
+        if not self.ready: return None
+        current_price, is_bull_market, adx_signal, vol_signal = self.day.day_signals()
+        rsi_val, mfi_val, vwap_signal, bollinger_score, atr_value, macd_score = self.min.min_signals()
+        return self.strategy.build_signal(
+            current_price, is_bull_market, adx_signal, vol_signal,
+            rsi_val, mfi_val, vwap_signal, bollinger_score, atr_value, macd_score,
+            debug=debug
+        )
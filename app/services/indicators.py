@@ -0,0 +1,334 @@
+import math
+
+import numpy as np
+
+# =========================================================
+#  NumPy 지표 커널 (pandas 미사용)
+#  - 입력: float64 ndarray, 시간축은 항상 마지막 축(axis=-1)
+#    -> 1-D (봉) / 2-D (티커 x 봉) 모두 같은 함수로 처리
+#  - 결과는 Strategy의 기존 pandas 구현과 동일한 정의
+#    (rolling: min_periods=window, ewm: adjust/min_periods 동일, NaN 처리 동일)
+# =========================================================
+
+
+# --- EWM (pandas ewm().mean() 재귀식 그대로) ---
+
+def ewm_alpha(alpha=None, span=None):
+    """pandas와 동일하게 com을 거쳐 alpha를 재계산 (비트 단위 일치용)"""
+    com = (span - 1) / 2.0 if span is not None else (1.0 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+EWM_EMPTY = (math.nan, 1.0, 0)  # (weighted, old_wt, nobs)
+
+
+def ewm_step(state, cur, alpha, adjust=True):
+    """EWM 한 스텝 진행 (ignore_na=False). 실시간 증분 계산에서도 사용"""
+    weighted, old_wt, nobs = state
+    is_obs = cur == cur
+    nobs += is_obs
+    if weighted == weighted:
+        old_wt *= (1.0 - alpha)
+        if is_obs:
+            new_wt = 1.0 if adjust else alpha
+            if weighted != cur:
+                weighted = old_wt * weighted + new_wt * cur
+                weighted /= (old_wt + new_wt)
+            old_wt = old_wt + new_wt if adjust else 1.0
+    elif is_obs:
+        weighted = cur
+    return (weighted, old_wt, nobs)
+
+
+def ewm_value(state, min_periods=0):
+    weighted, _, nobs = state
+    return weighted if nobs >= max(min_periods, 1) else math.nan
+
+
+def ewm_mean(x, alpha=None, span=None, adjust=True, min_periods=0):
+    x = np.asarray(x, dtype=float)
+    a = ewm_alpha(alpha, span)
+    minp = max(min_periods, 1)
+
+    if x.ndim == 1:
+        # 1-D는 파이썬 float 루프가 numpy 0-d 연산보다 훨씬 빠름
+        out = []
+        state = EWM_EMPTY
+        for cur in x.tolist():
+            state = ewm_step(state, cur, a, adjust)
+            out.append(state[0] if state[2] >= minp else math.nan)
+        return np.array(out)
+
+    # N-D: 시간축만 루프, 나머지 축(티커)은 벡터 연산
+    nan_cols = np.isnan(x).reshape(-1, x.shape[-1])
+    all_nan, any_nan = nan_cols.all(axis=0), nan_cols.any(axis=0)
+    start = int(np.argmin(all_nan)) if not all_nan.all() else x.shape[-1]
+    if not any_nan[start:].any() and all_nan[:start].all():
+        return _ewm_mean_dense(x, a, adjust, minp, start)
+
+    out = np.empty_like(x)
+    new_wt = 1.0 if adjust else a
+    weighted = np.full(x.shape[:-1], np.nan)
+    old_wt = np.ones(x.shape[:-1])
+    nobs = np.zeros(x.shape[:-1], dtype=int)
+    for i in range(x.shape[-1]):
+        cur = x[..., i]
+        is_obs = cur == cur
+        nobs += is_obs
+        has_w = weighted == weighted
+        old_wt = np.where(has_w, old_wt * (1.0 - a), old_wt)
+        upd = has_w & is_obs
+        mixed = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+        weighted = np.where(upd & (weighted != cur), mixed, weighted)
+        if adjust:
+            old_wt = np.where(upd, old_wt + new_wt, old_wt)
+        else:
+            old_wt = np.where(upd, 1.0, old_wt)
+        weighted = np.where(~has_w & is_obs, cur, weighted)
+        out[..., i] = np.where(nobs >= minp, weighted, np.nan)
+    return out
+
+
+def _ewm_mean_dense(x, a, adjust, minp, start):
+    """
+    모든 행이 같은 위치(start)부터 NaN 없이 이어지는 경우 (ADX/RSI/MACD의 일반적인 형태)
+    -> old_wt가 행마다 같으므로 스칼라로 들고 가서 연산 수를 줄임
+    """
+    out = np.full_like(x, np.nan)
+    n = x.shape[-1]
+    if start >= n: return out
+
+    new_wt = 1.0 if adjust else a
+    weighted = x[..., start].copy()
+    old_wt = 1.0
+    if minp <= 1: out[..., start] = weighted
+    for i in range(start + 1, n):
+        cur = x[..., i]
+        old_wt *= (1.0 - a)
+        mixed = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+        weighted = np.where(weighted != cur, mixed, weighted)
+        old_wt = old_wt + new_wt if adjust else 1.0
+        if i - start + 1 >= minp:
+            out[..., i] = weighted
+    return out
+
+
+# --- 기본 연산 ---
+
+def shift(x, periods=1):
+    out = np.full_like(x, np.nan, dtype=float)
+    out[..., periods:] = x[..., :-periods]
+    return out
+
+
+def diff(x):
+    return x - shift(x)
+
+
+def ffill(x):
+    """NaN을 직전 값으로 채움 (마지막 축 기준)"""
+    mask = np.isnan(x)
+    idx = np.where(mask, 0, np.arange(x.shape[-1]))
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    filled = np.take_along_axis(x, idx, axis=-1)
+    # 맨 앞의 NaN은 그대로 (채울 값 없음)
+    return filled
+
+
+def _windows(x, window):
+    return np.lib.stride_tricks.sliding_window_view(x, window, axis=-1)
+
+
+def rolling_sum(x, window):
+    out = np.full_like(x, np.nan, dtype=float)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = _windows(x, window).sum(axis=-1)
+    return out
+
+
+def _flat_windows(w):
+    """윈도우 안의 값이 전부 같은지 (횡보 구간: 합산 반올림 오차 없이 정의값으로 고정)"""
+    return w.max(axis=-1) == w.min(axis=-1)
+
+
+def rolling_mean(x, window):
+    out = rolling_sum(x, window) / window
+    if x.shape[-1] >= window:
+        w = _windows(x, window)
+        tail = out[..., window - 1:]
+        np.copyto(tail, w[..., 0], where=_flat_windows(w))
+    return out
+
+
+def rolling_std(x, window, ddof=1):
+    out = np.full_like(x, np.nan, dtype=float)
+    if x.shape[-1] >= window:
+        w = _windows(x, window)
+        mean = w.mean(axis=-1, keepdims=True)
+        std = np.sqrt(((w - mean) ** 2).sum(axis=-1) / (window - ddof))
+        out[..., window - 1:] = np.where(_flat_windows(w), 0.0, std)
+    return out
+
+
+# --- 지표 ---
+# 공용 중간값(tp, tr, MA20 등)은 키워드 인자로 받을 수 있음
+# -> IndicatorContext(indicator_registry.py)가 한 번만 계산해서 넘겨줌
+
+def typical_price(high, low, close):
+    return (high + low + close) / 3
+
+
+def true_range(high, low, close, prev_close=None):
+    if prev_close is None: prev_close = shift(close)
+    # pandas max(axis=1)처럼 NaN은 무시 (첫 봉은 high - low)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, period=14, tr=None):
+    if tr is None: tr = true_range(high, low, close)
+    return rolling_mean(tr, period)
+
+
+def adx(high, low, close, n=14, tr=None):
+    """(ADX, +DI, -DI)"""
+    up_move = diff(high)
+    down_move = -diff(low)
+
+    pdm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    mdm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    if tr is None: tr = true_range(high, low, close)
+
+    tr_smooth = ewm_mean(tr, alpha=1/n, min_periods=n)
+    tr_smooth = np.where(tr_smooth == 0, 0.0001, tr_smooth)
+    pdm_smooth = ewm_mean(pdm, alpha=1/n, min_periods=n)
+    mdm_smooth = ewm_mean(mdm, alpha=1/n, min_periods=n)
+
+    pdi = 100 * (pdm_smooth / tr_smooth)
+    mdi = 100 * (mdm_smooth / tr_smooth)
+
+    div = pdi + mdi
+    div = np.where(div == 0, 0.0001, div)
+    dx = (np.abs(pdi - mdi) / div) * 100
+    return ewm_mean(dx, alpha=1/n, min_periods=n), pdi, mdi
+
+
+def adx_signal(high, low, close, n=14, tr=None, lines=None):
+    """ADX >= 20 AND +DI > -DI (2n봉 미만은 0)"""
+    adx_line, pdi, mdi = lines if lines is not None else adx(high, low, close, n, tr=tr)
+    sig = (adx_line >= 20) & (pdi > mdi)
+    return np.where(np.arange(high.shape[-1]) + 1 >= n * 2, sig, False).astype(int)
+
+
+def volume_signal(volume, close, open_, period=20, vol_ma=None):
+    """거래량 MA20의 1.5배 초과 AND 양봉"""
+    if vol_ma is None: vol_ma = rolling_mean(volume, period)
+    return ((volume > vol_ma * 1.5) & (close > open_)).astype(int)
+
+
+def rsi(close, period=14):
+    delta = diff(close)
+    gain = ewm_mean(np.where(delta > 0, delta, 0.0), alpha=1/period, min_periods=period)
+    loss = ewm_mean(-np.where(delta < 0, delta, 0.0), alpha=1/period, min_periods=period)
+    rs = gain / np.where(loss == 0, 0.0001, loss)
+    out = ffill(100 - (100 / (1 + rs)))
+    return np.where(np.isnan(out), 50.0, out)
+
+
+def mfi(high, low, close, volume, period=14, tp=None):
+    if tp is None: tp = typical_price(high, low, close)
+    mf = tp * volume
+    delta = diff(tp)
+    pos_sum = rolling_sum(np.where(delta > 0, mf, 0.0), period)
+    neg_sum = rolling_sum(np.where(delta < 0, mf, 0.0), period)
+    neg_sum = np.where(neg_sum == 0, 0.0001, neg_sum)
+    out = 100 - (100 / (1 + (pos_sum / neg_sum)))
+    return np.where(np.isnan(out), 50.0, out)
+
+
+def vwap(high, low, close, volume, tp=None, window=None):
+    """프레임 시작부터 누적 VWAP (window 지정 시 최근 window봉 누적 = 그 길이로 받은 캔들과 동일)"""
+    if tp is None: tp = typical_price(high, low, close)
+    cum_vol = np.cumsum(volume, axis=-1)
+    cum_pv = np.cumsum(tp * volume, axis=-1)
+    if window is not None and volume.shape[-1] > window:
+        cum_vol[..., window:] -= cum_vol[..., :-window].copy()
+        cum_pv[..., window:] -= cum_pv[..., :-window].copy()
+    cum_vol = np.where(cum_vol == 0, 1, cum_vol)
+    return cum_pv / cum_vol
+
+
+def vwap_signal(high, low, close, volume, tp=None, window=None):
+    return (close > vwap(high, low, close, volume, tp=tp, window=window)).astype(int)
+
+
+def bollinger_bands(close, period=20, k=2, ma=None, std=None):
+    if ma is None: ma = rolling_mean(close, period)
+    if std is None: std = rolling_std(close, period)
+    return ma + (std * k), ma - (std * k)
+
+
+def bollinger_signal(close, open_, period=20, k=2, threshold=1.02, bands=None, prev_close=None):
+    """하단 근처 + 반등 양봉 = 1, 상단 돌파 = -1"""
+    upper, lower = bands if bands is not None else bollinger_bands(close, period, k)
+    if prev_close is None: prev_close = shift(close)
+    is_near_lower = close <= (lower * threshold)
+    is_rebounding = (close > prev_close) & (close >= open_)
+    sig = np.where(is_near_lower & is_rebounding, 1, np.where(close >= upper, -1, 0))
+    return np.where(np.isnan(lower) | np.isnan(upper), 0, sig)
+
+
+def macd(close):
+    """(MACD, Signal)"""
+    macd_line = ewm_mean(close, span=12, adjust=False) - ewm_mean(close, span=26, adjust=False)
+    return macd_line, ewm_mean(macd_line, span=9, adjust=False)
+
+
+def macd_score(close, lines=None):
+    macd_line, signal_line = lines if lines is not None else macd(close)
+    return np.where(macd_line > signal_line, 1, np.where(macd_line < signal_line, -1, 0))
+
+
+def rolling_max(x, window):
+    out = np.full_like(x, np.nan, dtype=float)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = _windows(x, window).max(axis=-1)
+    return out
+
+
+def rolling_min(x, window):
+    out = np.full_like(x, np.nan, dtype=float)
+    if x.shape[-1] >= window:
+        out[..., window - 1:] = _windows(x, window).min(axis=-1)
+    return out
+
+
+def stoch(high, low, close, k_period=14, d_period=3):
+    """(%K, %D) - Fast Stochastic"""
+    lowest = rolling_min(low, k_period)
+    highest = rolling_max(high, k_period)
+    rng = highest - lowest
+    k = 100 * (close - lowest) / np.where(rng == 0, np.nan, rng)
+    return k, rolling_mean(k, d_period)
+
+
+def stoch_signal(k, d, oversold=20):
+    """과매도 구간(직전 %K < 20)에서 %K가 %D를 상향 돌파 = 골든크로스"""
+    prev_k = shift(k)
+    crossed = (prev_k <= shift(d)) & (k > d)
+    return (crossed & (prev_k < oversold)).astype(int)
+
+
+def cci(high, low, close, period=20, tp=None):
+    if tp is None: tp = typical_price(high, low, close)
+    ma = rolling_mean(tp, period)
+    mean_dev = np.full_like(tp, np.nan, dtype=float)
+    if tp.shape[-1] >= period:
+        w = _windows(tp, period)
+        mean_dev[..., period - 1:] = np.abs(w - w.mean(axis=-1, keepdims=True)).mean(axis=-1)
+    return (tp - ma) / (0.015 * np.where(mean_dev == 0, np.nan, mean_dev))
+
+
+def cci_signal(cci_line, level=-100):
+    """CCI가 -100 아래에서 위로 복귀 = 과매도 탈출"""
+    return ((shift(cci_line) < level) & (cci_line >= level)).astype(int)
@@ -0,0 +1,242 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_registry import IndicatorContext
+from app.services import indicators as ind
+from app.services.strategy import Strategy
+from app.services.upbit_rest import rest, SCAN
+
+# =========================================================
+#  분봉 이벤트 백테스터 (실전 매도 규칙 재현)
+#  - TradeManager.process_selling과 같은 순서로 청산:
+#    손절(STOP_LOSS) > 트레일링(TRAILING_START/CALLBACK) > 과열 익절 > 점수 하락 > 설거지 감지
+#  - 손절/트레일링은 봉의 고가/저가 경로를 배열로 스캔해서 첫 터치 봉을 찾음 (봉 단위 파이썬 루프 없음)
+#  - 지표 기반 청산/진입은 봉 마감 시점 채점 (전체 구간 1회 벡터 계산)
+# =========================================================
+
+
+class IntradayBacktester:
+    """
+    df_day(일봉) + df_min(분봉 / 60분봉)으로 실전 매매 규칙 리플레이
+    - 분봉 i의 점수 = i봉 마감가를 현재가로 본 get_ensemble_signal
+      (일봉 지표는 직전 마감 일봉 기준 - 진행 중 일봉은 미래 정보라 사용 안 함)
+    - VWAP은 실전과 같이 최근 LIVE_WINDOW봉 누적
+    """
+    LIVE_WINDOW = 60   # TradeManager.get_smart_candles의 분봉 개수
+    SCAN_WINDOW = 256  # 청산 스캔 첫 구간 길이 (못 찾으면 4배씩 확장)
+    REASONS = {0: "보유중", 1: "손절", 2: "트레일링스탑", 3: "RSI과열", 4: "MFI과열", 5: "점수하락", 6: "설거지감지"}
+
+    def __init__(self, strategy=None, stop_loss=-3.0, trailing_start=2.0, trailing_callback=1.0,
+                 rebuy_cooldown=3600, fee=0.0005):
+        self.strategy = strategy or Strategy()
+        self.STOP_LOSS = stop_loss
+        self.TRAILING_START = trailing_start
+        self.TRAILING_CALLBACK = trailing_callback
+        self.REBUY_COOLDOWN = rebuy_cooldown
+        self.fee = fee
+
+    # --- 신호 ---
+    def signals(self, df_day, df_min):
+        """분봉 축에 맞춘 score / rsi / mfi / 진입 가능 여부 배열"""
+        day = self.strategy._to_arrays(df_day)
+        mins = self.strategy._to_arrays(df_min)
+        ctx = IndicatorContext(day=day, min=mins)
+
+        comp = {}
+        for key, (name, frame) in self.strategy.SIGNAL_SOURCES.items():
+            if key == 'vwap': continue
+            comp[key] = ctx.get(name, frame)
+        comp['vwap'] = ind.vwap_signal(
+            mins['high'], mins['low'], mins['close'], mins['volume'],
+            tp=ctx.get('tp', 'min'), window=self.LIVE_WINDOW
+        )
+
+        # 분봉 -> 직전 마감 일봉 인덱스
+        day_idx = np.searchsorted(df_day.index.values, df_min.index.values, side='right') - 2
+        has_day = day_idx >= 29
+        day_idx = np.clip(day_idx, 0, None)
+        for key, (_, frame) in self.strategy.SIGNAL_SOURCES.items():
+            if frame == 'day':
+                comp[key] = comp[key][day_idx]
+
+        score = self.strategy._score_arrays(comp)
+        valid = has_day & (np.arange(len(df_min)) >= 29)
+        score = np.where(valid, score, np.nan)
+        rsi, mfi = comp['rsi'], comp['mfi']
+        enter = valid & (score >= self.strategy.BUY_THRESHOLD) & ~self.strategy.is_overheated(rsi, mfi)
+        return {"score": score, "rsi": rsi, "mfi": mfi, "enter": enter}
+
+    # --- 청산 스캔 ---
+    def _close_exits(self, entry, close, peak, score, rsi, mfi):
+        """
+        봉 마감 시점 청산 (process_selling의 elif 체인과 동일)
+        반환: 사유 코드 배열 (0 = 유지)
+        """
+        rule = self.strategy.EXIT
+        profit = (close - entry) / entry * 100
+        drawdown = (peak - close) / peak * 100
+
+        trailing_zone = profit >= self.TRAILING_START
+        other_zone = (profit > self.STOP_LOSS) & ~trailing_zone
+        hot_zone = other_zone & (profit > rule['min_profit'])
+        low_zone = other_zone & ~hot_zone
+
+        reason = np.zeros(len(close), dtype=np.int8)
+        reason = np.where(low_zone & (rsi < rule['wash_rsi']) & (mfi >= rule['wash_mfi']), 6, reason)
+        reason = np.where(low_zone & (score < self.strategy.SELL_THRESHOLD), 5, reason)
+        reason = np.where(hot_zone & (mfi >= rule['mfi']), 4, reason)
+        reason = np.where(hot_zone & (rsi >= rule['rsi']), 3, reason)
+        reason = np.where(trailing_zone & (drawdown >= self.TRAILING_CALLBACK), 2, reason)
+        return reason
+
+    def _find_exit(self, e, entry, bars, sig):
+        """
+        e봉 마감에 entry가로 진입 -> (청산 봉, 청산가, 사유 코드)
+        - 봉 안(고가/저가 경로): 손절가 터치 > 트레일링 발동가 터치 (보수적으로 손절 우선)
+        - 봉 마감: _close_exits
+        """
+        o, h, l, c = bars
+        n = len(c)
+        stop_px = entry * (1 + self.STOP_LOSS / 100)
+        act_px = entry * (1 + self.TRAILING_START / 100)
+        keep = 1 - self.TRAILING_CALLBACK / 100
+
+        carry = entry  # 구간 이전까지의 최고가
+        lo, width = e + 1, self.SCAN_WINDOW
+        while lo < n:
+            hi = min(n, lo + width)
+            hs, ls, os_, cs = h[lo:hi], l[lo:hi], o[lo:hi], c[lo:hi]
+
+            # 봉 시작 시점의 피크 (이전 봉 고가까지)
+            peak_in = np.maximum.accumulate(np.concatenate(([carry], hs[:-1])))
+            peak_in = np.maximum(peak_in, carry)
+            trigger = peak_in * keep
+
+            stop_hit = ls <= stop_px
+            trail_hit = (trigger >= act_px) & (ls <= trigger) & (hs >= act_px)
+            close_reason = self._close_exits(
+                entry, cs, np.maximum(peak_in, hs), sig['score'][lo:hi], sig['rsi'][lo:hi], sig['mfi'][lo:hi]
+            )
+
+            hit = stop_hit | trail_hit | (close_reason > 0)
+            if hit.any():
+                k = int(np.argmax(hit))
+                if stop_hit[k]:
+                    return lo + k, min(os_[k], stop_px), 1
+                if trail_hit[k]:
+                    return lo + k, max(min(os_[k], trigger[k]), act_px), 2
+                return lo + k, cs[k], int(close_reason[k])
+
+            carry = max(carry, hs.max())
+            lo, width = hi, width * 4
+
+        return n - 1, c[-1], 0  # 기간 끝까지 보유
+
+    # --- 실행 ---
+    def run(self, df_day, df_min, capital=1000000):
+        """
+        티커 1개 리플레이 -> {"win_rate", "total_return", "mdd", "trades", "exits", "history"}
+        - 진입: 점수 >= BUY_THRESHOLD AND 과열 아님, 봉 마감가 체결
+        - 재진입: 청산 후 REBUY_COOLDOWN 경과 뒤
+        """
+        empty = {"win_rate": 0, "total_return": 0, "mdd": 0, "trades": 0, "exits": {}, "history": []}
+        if df_day is None or df_min is None or len(df_day) < 30 or len(df_min) < 30:
+            return empty
+
+        sig = self.signals(df_day, df_min)
+        bars = tuple(df_min[c].to_numpy(dtype=float) for c in ('open', 'high', 'low', 'close'))
+        times = df_min.index.values
+        cooldown = np.timedelta64(int(self.REBUY_COOLDOWN), 's')
+        entries = np.flatnonzero(sig['enter'])
+
+        balance = capital
+        max_balance = capital
+        mdd = 0
+        win_count = 0
+        exits = {}
+        history = []
+
+        start = 0
+        n = len(times)
+        while True:
+            k = np.searchsorted(entries, start)
+            if k >= len(entries) or entries[k] >= n - 1: break
+            e = int(entries[k])
+            entry = bars[3][e]
+
+            x, price, code = self._find_exit(e, entry, bars, sig)
+            shares = (balance * (1 - self.fee)) / entry
+            sell_val = shares * price * (1 - self.fee)
+            if sell_val > shares * entry: win_count += 1
+
+            balance = sell_val
+            max_balance = max(max_balance, balance)
+            mdd = max(mdd, (max_balance - balance) / max_balance * 100)
+
+            reason = self.REASONS[code]
+            exits[reason] = exits.get(reason, 0) + 1
+            history.append({
+                "buy_time": pd.Timestamp(times[e]), "buy_price": float(entry),
+                "sell_time": pd.Timestamp(times[x]), "sell_price": float(price),
+                "profit_rate": round((price / entry - 1) * 100, 2), "reason": reason,
+            })
+
+            if code == 0: break
+            start = max(x + 1, int(np.searchsorted(times, times[x] + cooldown)))
+
+        trade_count = len(history)
+        return {
+            "win_rate": round((win_count / trade_count * 100) if trade_count > 0 else 0, 1),
+            "total_return": round(((balance / capital) - 1) * 100, 1),
+            "mdd": round(mdd, 1),
+            "trades": trade_count,
+            "exits": exits,
+            "history": history,
+        }
+
+    def run_market(self, frames):
+        """{티커: (df_day, df_min)} -> {티커: run 결과} (+ 소요 시간 출력)"""
+        started = time.perf_counter()
+        results = {}
+        for ticker, (df_day, df_min) in frames.items():
+            try:
+                results[ticker] = self.run(df_day, df_min)
+            except Exception as e:
+                print(f">>> ⚠️ [Intraday] {ticker} 실패: {e}")
+        print(f">>> ⏱️ [Intraday] {len(results)}개 종목 {time.perf_counter() - started:.2f}s")
+        return results
+
+    @staticmethod
+    async def load_frames(tickers=None, interval="minute60", days=90, concurrency=5):
+        """일봉 200개 + 분봉 days일치 수집 -> {티커: (df_day, df_min)}"""
+        per_day = {"minute60": 24, "minute30": 48, "minute15": 96, "minute10": 144,
+                   "minute5": 288, "minute3": 480, "minute1": 1440}[interval]
+        tickers = tickers or await rest.aget_tickers(fiat="KRW")
+        semaphore = asyncio.Semaphore(concurrency)
+        frames = {}
+
+        async def fetch(ticker):
+            async with semaphore:
+                try:
+                    df_day = await rest.aget_ohlcv(ticker, "day", 200, priority=SCAN)
+                    df_min = await rest.aget_ohlcv(ticker, interval, per_day * days, priority=SCAN)
+                    if df_day is not None and df_min is not None:
+                        frames[ticker] = (df_day, df_min)
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(fetch(t) for t in tickers))
+        return frames
+
+
+if __name__ == "__main__":
+    bt = IntradayBacktester()
+    frames = asyncio.run(bt.load_frames())
+    results = bt.run_market(frames)
+    ranked = sorted(results.items(), key=lambda kv: kv[1]['total_return'], reverse=True)
+    for ticker, r in ranked[:20]:
+        print(f"{ticker:<12} 수익 {r['total_return']:+6.1f}% | 승률 {r['win_rate']:5.1f}% | "
+              f"MDD {r['mdd']:5.1f}% | 매매 {r['trades']:>3}회 | {r['exits']}")
@@ -9,8 +9,8 @@ class OrderExecutor:
     def get_krw_balance(self):
         return self.upbit.get_balance("KRW")
 
-    def get_coin_balance(self, ticker):
-        return self.upbit.get_balance(ticker)
+    def get_coin_balance(self, ticker, max_age=None):
+        return self.upbit.get_balance(ticker, max_age)
     
     def get_all_balances(self):
         return self.upbit.get_balances()
@@ -30,7 +30,7 @@ class OrderExecutor:
 
     async def try_sell(self, trade_id, ticker, current_price, reason):
         """매도 시도 -> 성공 시 DB 정리까지"""
-        vol = self.get_coin_balance(ticker)
+        vol = self.get_coin_balance(ticker, max_age=0)  # 매도 수량은 캐시 말고 실제 잔고
         
         # 잔고 없으면 좀비 처리 (이미 앱에서 팔았거나 오류)
         if vol <= 0:
@@ -0,0 +1,229 @@
+import asyncio
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from app.services.backtester import CACHE_DIR, Backtester, simulate_signals
+from app.services.strategy import Strategy
+from app.services.upbit_rest import rest
+
+# =========================================================
+#  전략 파라미터 스윕 (그리드 / 랜덤 서치)
+#  - 지표 배열은 티커당 1번만 계산 (가중치/기준값은 최종 채점에만 영향)
+#  - 파라미터 조합마다 채점 + Backtester와 동일한 매매 시뮬레이션
+#  - 티커 청크 단위로 프로세스 풀에 분배, 조합별 성과를 랭킹 표로 저장
+# =========================================================
+
+# 스윕 가능한 파라미터 (기본값 = 현재 Strategy 설정)
+_BASE = Strategy()
+DEFAULT_PARAMS = {
+    **_BASE.WEIGHTS,
+    "buy_threshold": _BASE.BUY_THRESHOLD,
+    "sell_threshold": _BASE.SELL_THRESHOLD,
+    "rsi_overheat": _BASE.OVERHEAT["rsi"],
+    "mfi_overheat": _BASE.OVERHEAT["mfi"],
+    "wash_rsi": _BASE.OVERHEAT["wash_rsi"],
+    "wash_mfi": _BASE.OVERHEAT["wash_mfi"],
+}
+
+# 예시 그리드 (CLI 기본값)
+DEFAULT_GRID = {
+    "buy_threshold": [6.0, 6.5, 7.0, 7.5, 8.0],
+    "sell_threshold": [2.5, 3.0, 3.5, 4.0],
+    "trend": [2.0, 3.0],
+    "oscillator_group": [2.0, 3.0],
+    "rsi_overheat": [65, 70, 75],
+}
+
+RESULT_FIELDS = ["tickers", "trades", "win_rate", "total_return", "median_return", "mdd", "max_mdd"]
+
+
+def apply_params(strategy, params):
+    """평면 파라미터 dict -> Strategy 설정 (지정 안 된 값은 기본값 유지)"""
+    for key, value in params.items():
+        if key in strategy.WEIGHTS:
+            strategy.WEIGHTS[key] = float(value)
+        elif key == "buy_threshold":
+            strategy.BUY_THRESHOLD = float(value)
+        elif key == "sell_threshold":
+            strategy.SELL_THRESHOLD = float(value)
+        elif key == "rsi_overheat":
+            strategy.OVERHEAT["rsi"] = value
+        elif key == "mfi_overheat":
+            strategy.OVERHEAT["mfi"] = value
+        elif key in ("wash_rsi", "wash_mfi"):
+            strategy.OVERHEAT[key] = value
+        else:
+            raise KeyError(f"알 수 없는 파라미터: {key}")
+    return strategy
+
+
+def grid_space(grid):
+    """{이름: [후보값...]} -> 전체 조합 리스트"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_space(space, n, seed=None):
+    """
+    {이름: [후보값...] | (최소, 최대)} -> n개 랜덤 조합
+    - 리스트는 그중 하나 선택, 튜플은 균등분포 (소수 2자리 반올림)
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(n):
+        cfg = {}
+        for key, spec in space.items():
+            if isinstance(spec, tuple):
+                cfg[key] = round(rng.uniform(*spec), 2)
+            else:
+                cfg[key] = rng.choice(list(spec))
+        configs.append(cfg)
+    return configs
+
+
+def _evaluate_chunk(task):
+    """
+    워커: 티커 청크 x 전체 조합 평가
+    - 반환: (조합 x 티커 x [win_rate, total_return, mdd, trades]) 배열, 소요 시간
+    """
+    chunk, configs, fee, days = task
+    started = time.perf_counter()
+    strategy = Strategy()
+    out = np.zeros((len(configs), len(chunk), 4))
+
+    for j, arrays in enumerate(chunk):
+        # 가중치와 무관한 지표는 티커당 1번만 계산
+        comp = strategy._indicator_arrays(arrays, arrays)
+        valid = np.arange(len(arrays['close'])) >= 29
+        opens = arrays['open']
+        last_close = float(arrays['close'][-1])
+
+        for i, cfg in enumerate(configs):
+            apply_params(strategy, {**DEFAULT_PARAMS, **cfg})
+            score = strategy._score_arrays(comp)
+            buy_mask = valid & (score >= strategy.BUY_THRESHOLD) & ~strategy.is_overheated(comp['rsi'], comp['mfi'])
+            sell_mask = valid & (score < strategy.SELL_THRESHOLD)
+            res = simulate_signals(buy_mask, sell_mask, opens, last_close, fee, days)
+            out[i, j] = (res['win_rate'], res['total_return'], res['mdd'], res['trades'])
+
+    return out, time.perf_counter() - started
+
+
+def _summarize(stats):
+    """(티커 x 4) -> 조합 1개의 집계 지표"""
+    win_rate, total_return, mdd, trades = stats.T
+    traded = trades > 0
+    return {
+        "tickers": int(len(stats)),
+        "trades": int(trades.sum()),
+        # 승률은 매매가 있었던 종목만 평균
+        "win_rate": round(float(win_rate[traded].mean()), 1) if traded.any() else 0.0,
+        "total_return": round(float(total_return.mean()), 2),
+        "median_return": round(float(np.median(total_return)), 2),
+        "mdd": round(float(mdd.mean()), 2),
+        "max_mdd": round(float(mdd.max()), 2),
+    }
+
+
+def run_sweep(frames, configs, workers=None, chunk_size=20, fee=0.0005, days=90, sort_by="total_return"):
+    """
+    frames: {티커: 일봉 df} / configs: 파라미터 dict 리스트 (grid_space, random_space)
+    - Backtester._analyze_frames와 동일하게 마지막 봉(진행 중)은 제외하고 시뮬레이션
+    - 반환: sort_by 기준 내림차순 정렬된 [{rank, 파라미터..., 성과...}]
+    """
+    if not configs: return []
+    arrays = [
+        {c: df[c].to_numpy(dtype=float)[:-1] for c in ('open', 'high', 'low', 'close', 'volume')}
+        for df in frames.values() if df is not None and len(df) >= 50
+    ]
+    if not arrays: return []
+
+    tasks = [(arrays[i:i + chunk_size], configs, fee, days) for i in range(0, len(arrays), chunk_size)]
+    print(f">>> 🧪 [Sweep] 조합 {len(configs)}개 x 종목 {len(arrays)}개 (청크 {len(tasks)}개)")
+
+    started = time.perf_counter()
+    if workers == 1:
+        outputs = [_evaluate_chunk(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_evaluate_chunk, tasks))
+    stats = np.concatenate([o for o, _ in outputs], axis=1)
+    busy = sum(t for _, t in outputs)
+    print(f">>> ⏱️ [Sweep] {time.perf_counter() - started:.1f}s (워커 합산 {busy:.1f}s)")
+
+    rows = [{**cfg, **_summarize(stats[i])} for i, cfg in enumerate(configs)]
+    rows.sort(key=lambda r: r[sort_by], reverse=sort_by not in ("mdd", "max_mdd"))
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def save_results(rows, path=None, top=10):
+    """랭킹 표를 CSV로 저장하고 상위 top개 출력"""
+    if not rows: return None
+    path = path or os.path.join(CACHE_DIR, f"sweep_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.csv")
+    params = list(dict.fromkeys(k for row in rows for k in row if k not in RESULT_FIELDS and k != "rank"))
+    fields = ["rank"] + params + RESULT_FIELDS
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f">>> 📄 [Sweep] 결과 저장: {os.path.basename(path)}")
+    for row in rows[:top]:
+        desc = ", ".join(f"{k}={row[k]}" for k in params if k in row) or "기본값"
+        print(
+            f"  {row['rank']:>3}. {desc} | 승률 {row['win_rate']:.1f}% | "
+            f"수익 {row['total_return']:+.2f}% | MDD {row['mdd']:.2f}% | 매매 {row['trades']}회"
+        )
+    return path
+
+
+async def load_frames(tickers=None):
+    """Backtester와 같은 방식(세마포어 10)으로 일봉 200개 수집"""
+    bt = Backtester()
+    tickers = tickers or await rest.aget_tickers(fiat="KRW")
+    frames = {}
+    await asyncio.gather(*(bt._fetch_one_safe(t, frames) for t in tickers))
+    return frames
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="전략 파라미터 스윕")
+    parser.add_argument("--random", type=int, default=0, help="랜덤 서치 조합 수 (0이면 그리드)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=20)
+    parser.add_argument("--sort", default="total_return", choices=RESULT_FIELDS[1:])
+    args = parser.parse_args()
+
+    if args.random:
+        space = {
+            "buy_threshold": (5.5, 8.5),
+            "sell_threshold": (2.0, 4.5),
+            "trend": (1.0, 4.0),
+            "adx": (0.5, 2.5),
+            "volume": (0.5, 2.0),
+            "vwap": (0.5, 2.5),
+            "oscillator_group": (1.0, 4.0),
+            "bollinger": (1.0, 3.0),
+            "rsi_overheat": [65, 70, 75, 80],
+            "mfi_overheat": [75, 80, 85],
+        }
+        configs = random_space(space, args.random, args.seed)
+    else:
+        configs = grid_space(DEFAULT_GRID)
+
+    frames = asyncio.run(load_frames())
+    rows = run_sweep(frames, configs, workers=args.workers, chunk_size=args.chunk, sort_by=args.sort)
+    save_results(rows)
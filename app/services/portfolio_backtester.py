@@ -0,0 +1,217 @@
+import copy
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.param_sweep import apply_params
+from app.services.strategy import Strategy
+
+# =========================================================
+#  포트폴리오 백테스터 (전 종목 / 하나의 시간축)
+#  - TradeManager와 같은 운용 규칙:
+#    MAX_COIN_COUNT 슬롯, 예산 = KRW * 0.99 / 빈 슬롯, (score, mfi) 순위, REBUY_COOLDOWN, 수수료
+#  - 청산은 process_selling 순서 (손절 > 트레일링 > 과열 익절 > 점수 하락 > 설거지 감지)
+#  - 지표는 prepare()에서 1번만 계산 -> run(params)은 채점 + 봉 루프만 (파라미터 서치용)
+#  - 봉마다 후보 선별/청산 판단은 티커 축으로 벡터 연산
+# =========================================================
+
+
+class PortfolioBacktester:
+    """
+    i봉 마감에 판단 -> i+1봉 시가에 체결 (Backtester._simulate와 동일)
+    손절/트레일링은 봉 안에서 고가/저가로 체결 (IntradayBacktester와 동일)
+    """
+    COMPONENTS = ('trend', 'adx', 'volume', 'vwap', 'rsi', 'mfi', 'bollinger')
+
+    def __init__(self, strategy=None, max_coin_count=4, rebuy_cooldown=3600, min_order_krw=6000,
+                 stop_loss=-3.0, trailing_start=2.0, trailing_callback=1.0, fee=0.0005):
+        self.strategy = strategy or Strategy()
+        self.MAX_COIN_COUNT = max_coin_count
+        self.REBUY_COOLDOWN = rebuy_cooldown
+        self.MIN_ORDER_KRW = min_order_krw
+        self.STOP_LOSS = stop_loss
+        self.TRAILING_START = trailing_start
+        self.TRAILING_CALLBACK = trailing_callback
+        self.fee = fee
+        self.tickers = []
+        self.index = None
+
+    # --- 준비 (지표 1회 계산) ---
+    def prepare(self, frames, drop_last=True):
+        """
+        {티커: 봉 df} -> (티커 x 시간) 행렬로 정렬
+        - drop_last: 마지막 봉(진행 중) 제외 (Backtester._analyze_frames와 동일)
+        - 상장 전 / 데이터 없는 칸은 NaN (매매 불가)
+        """
+        frames = {t: (df.iloc[:-1] if drop_last else df) for t, df in frames.items() if df is not None and len(df) > 30}
+        self.tickers = list(frames)
+        self.index = pd.DatetimeIndex(sorted(set().union(*(df.index for df in frames.values())))) if frames else pd.DatetimeIndex([])
+        n, t_len = len(self.tickers), len(self.index)
+
+        self.bars = {c: np.full((n, t_len), np.nan) for c in ('open', 'high', 'low', 'close')}
+        self.comp = {k: np.full((n, t_len), np.nan) for k in self.COMPONENTS}
+        self.valid = np.zeros((n, t_len), dtype=bool)
+
+        for i, (ticker, df) in enumerate(frames.items()):
+            pos = np.searchsorted(self.index.values, df.index.values)
+            arrays = self.strategy._to_arrays(df)
+            for c in self.bars:
+                self.bars[c][i, pos] = arrays[c]
+            comp = self.strategy._indicator_arrays(arrays, arrays)
+            for k in self.COMPONENTS:
+                self.comp[k][i, pos] = comp[k]
+            self.valid[i, pos[29:]] = True  # get_ensemble_signal은 30봉부터
+
+        # 평가금액용 종가 (거래 없는 칸은 직전 종가)
+        close = pd.DataFrame(self.bars['close'].T)
+        self.mark = close.ffill().fillna(0).to_numpy().T
+
+        step = np.median(np.diff(self.index.values)).astype('timedelta64[s]').astype(float) if t_len > 1 else 86400
+        self.cooldown_bars = max(1, math.ceil(self.REBUY_COOLDOWN / step))
+        return self
+
+    # --- 실행 ---
+    def run(self, params=None, capital=1000000):
+        """
+        params: param_sweep.apply_params 형식 (None이면 현재 전략 설정)
+        반환: {"total_return", "mdd", "win_rate", "trades", "equity"(Series), "history"}
+        """
+        strategy = self.strategy
+        if params:
+            strategy = apply_params(copy.deepcopy(self.strategy), params)
+
+        comp = self.comp
+        score = np.where(self.valid, strategy._score_arrays(comp), np.nan)
+        rsi, mfi = comp['rsi'], comp['mfi']
+        with np.errstate(invalid='ignore'):
+            can_enter = self.valid & (score >= strategy.BUY_THRESHOLD) & ~strategy.is_overheated(rsi, mfi)
+        exit_rule = strategy.EXIT
+
+        o, h, l, c = self.bars['open'], self.bars['high'], self.bars['low'], self.bars['close']
+        n, t_len = o.shape
+        keep = 1 - self.TRAILING_CALLBACK / 100
+
+        cash = float(capital)
+        shares = np.zeros(n)
+        entry = np.full(n, np.nan)
+        entry_bar = np.zeros(n, dtype=int)
+        peak = np.full(n, np.nan)
+        holding = np.zeros(n, dtype=bool)
+        last_exit = np.full(n, -10**9)
+        pending_exit = np.zeros(n, dtype=bool)
+        pending_buy = np.array([], dtype=int)
+
+        equity = np.zeros(t_len)
+        history = []
+        wins = 0
+
+        def sell(idx, price, t, reason):
+            nonlocal cash, wins
+            value = shares[idx] * price * (1 - self.fee)
+            cost = shares[idx] * entry[idx]
+            cash += value.sum()
+            wins += int((value > cost).sum())
+            for j, px in zip(idx, price):
+                history.append((self.tickers[j], self.index[entry_bar[j]], float(entry[j]), self.index[t], float(px), reason))
+            shares[idx] = 0
+            holding[idx] = False
+            entry[idx] = np.nan
+            peak[idx] = np.nan
+            last_exit[idx] = t
+
+        for t in range(t_len):
+            # 1. 시가 체결: 지난 봉 마감에 결정된 매도 -> 매수
+            if pending_exit.any():
+                idx = np.flatnonzero(pending_exit & holding & ~np.isnan(o[:, t]))
+                if len(idx): sell(idx, o[idx, t], t, "지표청산")
+                pending_exit[:] = False
+
+            if len(pending_buy):
+                empty_slots = self.MAX_COIN_COUNT - int(holding.sum())
+                if empty_slots > 0 and cash >= self.MIN_ORDER_KRW:
+                    budget = (cash * 0.99) / empty_slots
+                    if budget < self.MIN_ORDER_KRW: budget = cash * 0.99
+                    for j in pending_buy[:empty_slots]:
+                        if holding[j] or np.isnan(o[j, t]) or cash < budget: continue
+                        shares[j] = (budget * (1 - self.fee)) / o[j, t]
+                        cash -= budget
+                        entry[j] = peak[j] = o[j, t]
+                        entry_bar[j] = t
+                        holding[j] = True
+                pending_buy = np.array([], dtype=int)
+
+            # 2. 봉 안 손절 / 트레일링 (고가·저가 경로)
+            live = holding & ~np.isnan(l[:, t])
+            if live.any():
+                stop_px = entry * (1 + self.STOP_LOSS / 100)
+                act_px = entry * (1 + self.TRAILING_START / 100)
+                trigger = peak * keep
+                with np.errstate(invalid='ignore'):
+                    stop_hit = live & (l[:, t] <= stop_px)
+                    trail_hit = live & ~stop_hit & (trigger >= act_px) & (l[:, t] <= trigger) & (h[:, t] >= act_px)
+                idx = np.flatnonzero(stop_hit)
+                if len(idx): sell(idx, np.minimum(o[idx, t], stop_px[idx]), t, "손절")
+                idx = np.flatnonzero(trail_hit)
+                if len(idx): sell(idx, np.maximum(np.minimum(o[idx, t], trigger[idx]), act_px[idx]), t, "트레일링스탑")
+                peak = np.where(holding, np.fmax(peak, h[:, t]), peak)
+
+            # 3. 봉 마감 판단 (process_selling / process_buying 순서)
+            if t < t_len - 1:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    profit = (c[:, t] - entry) / entry * 100
+                    drawdown = (peak - c[:, t]) / peak * 100
+                    trailing_zone = profit >= self.TRAILING_START
+                    other_zone = (profit > self.STOP_LOSS) & ~trailing_zone
+                    hot_zone = other_zone & (profit > exit_rule['min_profit'])
+                    low_zone = other_zone & ~hot_zone
+                    pending_exit = holding & ~np.isnan(c[:, t]) & (
+                        (profit <= self.STOP_LOSS)
+                        | (trailing_zone & (drawdown >= self.TRAILING_CALLBACK))
+                        | (hot_zone & ((rsi[:, t] >= exit_rule['rsi']) | (mfi[:, t] >= exit_rule['mfi'])))
+                        | (low_zone & (score[:, t] < strategy.SELL_THRESHOLD))
+                        | (low_zone & (rsi[:, t] < exit_rule['wash_rsi']) & (mfi[:, t] >= exit_rule['wash_mfi']))
+                    )
+
+                slots = self.MAX_COIN_COUNT - int(holding.sum()) + int(pending_exit.sum())
+                if slots > 0:
+                    cand = np.flatnonzero(
+                        can_enter[:, t] & ~holding & ~np.isnan(o[:, t + 1])
+                        & ((t + 1) - last_exit >= self.cooldown_bars)
+                    )
+                    if len(cand):
+                        # (score, mfi) 내림차순
+                        order = np.lexsort((-mfi[cand, t], -score[cand, t]))
+                        pending_buy = cand[order[:slots]]
+
+            equity[t] = cash + float((shares * self.mark[:, t]).sum())
+
+        trades = len(history)
+        peak_eq = np.maximum.accumulate(equity) if t_len else equity
+        mdd = float(((peak_eq - equity) / np.where(peak_eq == 0, 1, peak_eq)).max() * 100) if t_len else 0.0
+        return {
+            "total_return": round(float(equity[-1] / capital - 1) * 100, 2) if t_len else 0.0,
+            "mdd": round(mdd, 2),
+            "win_rate": round(wins / trades * 100, 1) if trades else 0.0,
+            "trades": trades,
+            "equity": pd.Series(equity, index=self.index, name="equity"),
+            "history": [
+                {"ticker": tk, "buy_time": bt, "buy_price": bp, "sell_time": st, "sell_price": sp, "reason": r}
+                for tk, bt, bp, st, sp, r in history
+            ],
+        }
+
+    def sweep(self, configs, sort_by="total_return"):
+        """파라미터 조합별 포트폴리오 성과 -> param_sweep.save_results 호환 랭킹 행"""
+        started = time.perf_counter()
+        rows = []
+        for cfg in configs:
+            res = self.run(cfg)
+            rows.append({**cfg, "tickers": len(self.tickers), "trades": res["trades"],
+                         "win_rate": res["win_rate"], "total_return": res["total_return"], "mdd": res["mdd"]})
+        rows.sort(key=lambda r: r[sort_by], reverse=sort_by != "mdd")
+        for rank, row in enumerate(rows, 1):
+            row["rank"] = rank
+        print(f">>> ⏱️ [Portfolio] 조합 {len(configs)}개 x 종목 {len(self.tickers)}개 {time.perf_counter() - started:.2f}s")
+        return rows
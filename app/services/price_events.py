@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# =========================================================
+#  시세 변경 알림 (Collector 쓰레드 -> TradeManager 이벤트 루프)
+#  - 티커별로 합치기(coalescing): 처리 전에 같은 티커가 여러 번 바뀌어도 1건 (첫 틱 시각 유지)
+#  - call_soon_threadsafe는 대기 중인 배치가 없을 때만 1번 호출 (틱마다 루프를 깨우지 않음)
+#  - watch(): 매매 대상 / 보유 티커만 알림 (구독 전 종목 변화로 루프를 깨우지 않음)
+#  - LatencyStats: 틱 수신 -> 매매 판단 완료까지 지연 분포
+# =========================================================
+
+
+class PriceEventQueue:
+    def __init__(self):
+        self.loop = None
+        self._event = None
+        self._pending = {}
+        self._wake_scheduled = False
+        self._watched = None  # None이면 전 종목
+        self._lock = threading.Lock()
+        self.stats = {"published": 0, "coalesced": 0, "batches": 0}
+
+    def bind(self, loop=None):
+        """이벤트 루프 연결 (run_loop 시작 시). 연결 전 알림은 버림"""
+        self.loop = loop or asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def watch(self, tickers):
+        """알림 받을 티커 집합 교체 (None이면 전 종목)"""
+        self._watched = None if tickers is None else frozenset(tickers)
+
+    def add_watch(self, ticker):
+        if self._watched is not None:
+            self._watched = self._watched | {ticker}
+
+    def publish(self, ticker, tick_ts=None):
+        """가격 변경 알림 (아무 쓰레드). tick_ts: 틱 수신 시각 (time.time())"""
+        loop = self.loop
+        if loop is None: return
+        watched = self._watched
+        if watched is not None and ticker not in watched: return
+        with self._lock:
+            self.stats["published"] += 1
+            if ticker in self._pending:
+                self.stats["coalesced"] += 1
+                return
+            self._pending[ticker] = time.time() if tick_ts is None else tick_ts
+            if self._wake_scheduled: return
+            self._wake_scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # 루프 종료됨
+
+    async def get(self, timeout=None):
+        """변경된 티커 배치 {티커: 첫 틱 시각} (timeout 동안 변경 없으면 빈 dict)"""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._wake_scheduled = False
+        if batch: self.stats["batches"] += 1
+        return batch
+
+
+class LatencyStats:
+    """최근 maxlen개 지연(초) -> ms 분위수"""
+
+    def __init__(self, maxlen=4096):
+        self.samples = deque(maxlen=maxlen)
+        self.count = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples: return {"count": 0}
+        p50, p95, p99 = np.percentile(np.fromiter(self.samples, dtype=float), [50, 95, 99]) * 1000
+        return {
+            "count": self.count,
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(max(self.samples) * 1000, 2),
+        }
@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+
+# =========================================================
+#  백테스트 결과 강건성 분석 (부트스트랩 / 몬테카를로)
+#  - 90일 경로 1개로 나온 승률/수익률은 노이즈가 큼 -> 재표본 경로 수천 개로 신뢰구간 추정
+#  - 일별 수익률: 블록 부트스트랩 (자기상관 유지) -> 수익률 / 평가금 MDD 분포
+#  - 거래별 수익률: 복원 추출 -> 승률 / 수익률 분포, 순서 섞기 -> 거래 기준 MDD 분포
+#  - 티커마다 (경로 수 x 기간) 배열 한 번으로 계산
+# =========================================================
+
+
+def block_bootstrap(returns, n_paths=2000, block=5, rng=None):
+    """원형 블록 부트스트랩: (n_paths x len(returns)) 재표본 수익률"""
+    rng = rng or np.random.default_rng()
+    returns = np.asarray(returns, dtype=float)
+    n = len(returns)
+    block = max(1, min(block, n))
+    n_blocks = -(-n // block)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)) % n
+    return returns[idx.reshape(n_paths, -1)[:, :n]]
+
+
+def path_stats(paths):
+    """수익률 경로 행렬 -> (총수익률 %, MDD %) 벡터"""
+    equity = np.cumprod(1 + paths, axis=1)
+    equity = np.concatenate([np.ones((len(paths), 1)), equity], axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+    mdd = ((peak - equity) / peak).max(axis=1) * 100
+    return (equity[:, -1] - 1) * 100, mdd
+
+
+def trade_bootstrap(trade_returns, n_paths=2000, rng=None):
+    """거래 복원 추출 -> (승률 %, 총수익률 %) 벡터"""
+    rng = rng or np.random.default_rng()
+    trade_returns = np.asarray(trade_returns, dtype=float)
+    samples = trade_returns[rng.integers(0, len(trade_returns), size=(n_paths, len(trade_returns)))]
+    win_rate = (samples > 0).mean(axis=1) * 100
+    total = (np.prod(1 + samples, axis=1) - 1) * 100
+    return win_rate, total
+
+
+def shuffled_mdd(trade_returns, n_paths=2000, rng=None):
+    """거래 순서 섞기 -> 거래 기준 MDD % 벡터 (Backtester의 mdd와 같은 정의: 매도 시점 잔고 기준)"""
+    rng = rng or np.random.default_rng()
+    trade_returns = np.asarray(trade_returns, dtype=float)
+    order = np.argsort(rng.random((n_paths, len(trade_returns))), axis=1)
+    _, mdd = path_stats(trade_returns[order])
+    return mdd
+
+
+def _interval(values, ci):
+    lo, mid, hi = np.percentile(values, [(100 - ci) / 2, 50, 100 - (100 - ci) / 2])
+    return [round(float(lo), 2), round(float(mid), 2), round(float(hi), 2)]
+
+
+def analyze(daily_returns, trade_returns, n_paths=2000, block=5, ci=90, rng=None):
+    """
+    티커 1개 분석 -> 항목별 [하한, 중앙값, 상한] (ci% 구간)
+    - total_yield / path_mdd: 일별 수익률 블록 부트스트랩
+    - win_rate: 거래 부트스트랩 / mdd: 거래 순서 섞기 (거래 2건 미만이면 원래 값 그대로)
+    """
+    rng = rng or np.random.default_rng()
+    daily_returns = np.asarray(daily_returns, dtype=float)
+    trade_returns = np.asarray(trade_returns, dtype=float)
+    out = {"paths": n_paths, "ci": ci}
+
+    if len(daily_returns):
+        total, path_mdd = path_stats(block_bootstrap(daily_returns, n_paths, block, rng))
+        out["total_yield"] = _interval(total, ci)
+        out["path_mdd"] = _interval(path_mdd, ci)
+    else:
+        out["total_yield"] = out["path_mdd"] = [0.0, 0.0, 0.0]
+
+    if len(trade_returns) >= 2:
+        win_rate, _ = trade_bootstrap(trade_returns, n_paths, rng)
+        out["win_rate"] = _interval(win_rate, ci)
+        out["mdd"] = _interval(shuffled_mdd(trade_returns, n_paths, rng), ci)
+    else:
+        win = float((trade_returns > 0).mean() * 100) if len(trade_returns) else 0.0
+        _, mdd = path_stats(trade_returns[None, :]) if len(trade_returns) else (None, [0.0])
+        out["win_rate"] = [round(win, 2)] * 3
+        out["mdd"] = [round(float(mdd[0]), 2)] * 3
+    return out
+
+
+def analyze_market(series, n_paths=2000, block=5, ci=90, seed=None):
+    """{티커: (daily_returns, trade_returns)} -> {티커: analyze 결과} (+ 소요 시간 출력)"""
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    results = {}
+    for ticker, (daily, trades) in series.items():
+        try:
+            results[ticker] = analyze(daily, trades, n_paths, block, ci, rng)
+        except Exception as e:
+            print(f">>> ⚠️ [Robustness] {ticker} 실패: {e}")
+    print(f">>> 🎲 [Robustness] {len(results)}종목 x {n_paths}경로 ({time.perf_counter() - started:.2f}s)")
+    return results
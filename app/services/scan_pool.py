@@ -0,0 +1,69 @@
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import SpawnContext, SpawnProcess
+
+# =========================================================
+#  풀 스캔 전용 프로세스 풀 (서버 프로세스당 1개, 처음 쓸 때 생성 -> 스캔마다 재사용)
+#  - spawn 자식은 기본적으로 부모의 __main__을 __mp_main__으로 다시 import 함
+#    (python -m app.main 실행 시 app.main -> trade_manager = TradeManager()
+#     -> init_db DDL / 저장소 로드 / DbWriter 쓰레드 / Backtester 가 워커마다 생성됨)
+#  - 워커 프로세스를 띄우는 순간에만 __main__을 빈 모듈로 바꿔서
+#    자식은 워커 함수가 있는 모듈(backtester)만 import
+#  - 서버 종료 시 shutdown_scan_pool() (main.py lifespan)
+# =========================================================
+
+# 워커 입장에서의 __main__ (__file__ / __spec__ 없음 -> spawn이 main 모듈 복원을 건너뜀)
+_WORKER_MAIN = types.ModuleType("__mp_main__")
+
+
+class _ScanProcess(SpawnProcess):
+    @staticmethod
+    def _Popen(process_obj):
+        main = sys.modules.get("__main__")
+        sys.modules["__main__"] = _WORKER_MAIN
+        try:
+            return SpawnProcess._Popen(process_obj)
+        finally:
+            sys.modules["__main__"] = main
+
+
+class _ScanContext(SpawnContext):
+    Process = _ScanProcess
+
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def get_scan_pool(max_workers=None):
+    """공용 스캔 풀 (워커 수 설정이 바뀌면 새로 생성)"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != max_workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=_ScanContext())
+            _pool_workers = max_workers
+        return _pool
+
+
+def reset_scan_pool(pool):
+    """워커가 죽은 풀(BrokenProcessPool)은 버리고 다음 스캔 때 새로 생성"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_scan_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+        print(">>> 🧹 [Scan] 프로세스 풀 종료")
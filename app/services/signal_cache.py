@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+
+class SignalCache:
+    """
+    get_ensemble_signal 결과 메모이제이션 (LRU)
+    - 키: (티커, 마지막 캔들 타임스탬프, 현재가, 전략 가중치 버전)
+    - 같은 시장 상태면 매도/매수 루프, 분석 API 어디서 불러도 1번만 계산
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+        self.misses += 1
+        value = compute()
+        if value is not None:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, ticker=None):
+        if ticker is None:
+            self._data.clear()
+            return
+        for key in [k for k in self._data if k[0] == ticker]:
+            del self._data[key]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0.0,
+        }
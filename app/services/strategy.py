@@ -2,7 +2,25 @@ from datetime import datetime
 import pandas as pd
 import numpy as np
 
+from app.services import indicators as ind
+from app.services.indicator_registry import IndicatorContext
+
 class Strategy:
+    # 앙상블 입력: 결과 키 -> (지표 이름, 프레임)  (지표 정의는 indicator_registry.py)
+    # (1) 일봉: 추세(MA20), ADX, 거래량 / (2) 분봉: RSI, MFI, VWAP, 볼린저, ATR, MACD(참고용)
+    SIGNAL_SOURCES = {
+        "current_price": ("close", "day"),
+        "trend": ("trend", "day"),
+        "adx": ("adx_signal", "day"),
+        "volume": ("volume_signal", "day"),
+        "rsi": ("rsi", "min"),
+        "mfi": ("mfi", "min"),
+        "vwap": ("vwap_signal", "min"),
+        "bollinger": ("bollinger_signal", "min"),
+        "atr": ("atr", "min"),
+        "macd": ("macd_score", "min"),
+    }
+
     def __init__(self):
         # 📊 [리밸런싱] 지표 간 상관관계를 고려한 가중치 재설정
         # 총점: 12.0점 만점
@@ -32,6 +50,34 @@ class Strategy:
         # 매수 기준: 7.0 (확실할 때 진입)
         # 매도 기준: TradeManager에서 3.5 미만일 때 매도로 처리됨
         self.BUY_THRESHOLD = 7.0 
+        self.SELL_THRESHOLD = 3.5
+
+        # 매수 전 과열 필터 (TradeManager / Backtester 공용)
+        self.OVERHEAT = {
+            "rsi": 70,        # RSI 과열
+            "mfi": 80,        # MFI 과열 (고점 징후)
+            "wash_rsi": 60,   # 설거지 패턴: RSI는 높은데
+            "wash_mfi": 40,   #             자금은 빠지는 중
+        }
+
+        # 보유 중 지표 기반 매도 기준 (TradeManager.process_selling / 분봉 백테스트 공용)
+        self.EXIT = {
+            "min_profit": 0.5,  # 이 수익률(%) 초과일 때만 과열 익절 체크
+            "rsi": 80,          # RSI 과열 익절
+            "mfi": 85,          # MFI 과열 익절
+            "wash_rsi": 50,     # 이상 징후: RSI는 약한데
+            "wash_mfi": 75,     #           MFI만 높음 (설거지)
+        }
+
+    @property
+    def weights_version(self):
+        """가중치/기준값이 바뀌면 달라지는 키 (시그널 캐시 무효화용)"""
+        return hash((tuple(sorted(self.WEIGHTS.items())), self.BUY_THRESHOLD))
+
+    def is_overheated(self, rsi, mfi):
+        """과열/설거지 패턴 여부 (스칼라, ndarray 모두 가능)"""
+        o = self.OVERHEAT
+        return (rsi >= o["rsi"]) | (mfi >= o["mfi"]) | ((rsi >= o["wash_rsi"]) & (mfi < o["wash_mfi"]))
 
     def get_ensemble_signal(self, df_day: pd.DataFrame, df_min: pd.DataFrame = None, debug=False):
         """
@@ -43,35 +89,50 @@ class Strategy:
         if df_min is None or len(df_min) < 30:
             df_min = df_day
 
-        # --- 2. 지표 계산 ---
-        # (1) 일봉 분석
-        day_close = df_day['close']
-        ma20_day = day_close.rolling(window=20).mean().iloc[-1]
-        current_price = day_close.iloc[-1]
-        
-        # 추세 신호 (Trend): 패널티 방식 삭제 -> 점수 획득 방식으로 변경
-        is_bull_market = current_price >= ma20_day
-        adx_signal = self._calc_adx(df_day)
-        vol_signal = self._get_volume_signal(df_day)
-
-        # (2) 분봉 분석
-        closes = df_min['close']
-        opens = df_min['open']
-        highs = df_min['high']
-        lows = df_min['low']
-        volumes = df_min['volume']
-
-        # 개별 오실레이터 계산
-        rsi_val = self._calc_rsi_pandas(closes).iloc[-1]
-        mfi_val = self._calc_mfi_pandas(highs, lows, closes, volumes).iloc[-1]
-        # 기타 지표
-        vwap_signal = self._calc_vwap_signal(df_min)
-        bollinger_score = self._sig_bollinger(closes, opens)
-        atr_value = self._calc_atr_pandas(highs, lows, closes)
-        
-        # 기존 MACD 계산 (참고용)
-        macd_score = self._calc_macd_score(closes)
+        # 🔥 [속도 개선] DataFrame -> ndarray 1회 변환 후 NumPy 커널로 계산
+        day = self._to_arrays(df_day)
+        mins = day if df_min is df_day else self._to_arrays(df_min)
+        return self.get_ensemble_signal_arrays(day, mins, debug=debug)
 
+    def get_ensemble_signal_arrays(self, day, mins=None, debug=False):
+        """
+        get_ensemble_signal의 ndarray 버전
+        - day / mins: {"open", "high", "low", "close", "volume"} -> float64 배열
+        """
+        # --- 1. 데이터 유효성 검사 ---
+        if day is None or len(day['close']) < 30:
+            return None
+        if mins is None or len(mins['close']) < 30:
+            mins = day
+
+        # --- 2. 지표 계산 (전체 시계열 중 마지막 봉만 사용) ---
+        comp = self._indicator_arrays(day, mins)
+
+        return self.build_signal(
+            comp['current_price'][-1], bool(comp['trend'][-1]), int(comp['adx'][-1]), int(comp['volume'][-1]),
+            comp['rsi'][-1], comp['mfi'][-1], int(comp['vwap'][-1]), int(comp['bollinger'][-1]),
+            comp['atr'][-1], int(comp['macd'][-1]),
+            debug=debug
+        )
+
+    def _to_arrays(self, df):
+        return {col: df[col].to_numpy(dtype=float) for col in ('open', 'high', 'low', 'close', 'volume')}
+
+    def _indicator_arrays(self, day, mins):
+        """
+        앙상블에 쓰이는 지표를 봉 단위 배열로 계산 (시간축 = 마지막 축)
+        - SIGNAL_SOURCES에 선언된 지표만 IndicatorContext로 계산 (공용 중간값 1회 계산)
+        """
+        ctx = IndicatorContext(day=day, min=mins)
+        return {key: ctx.get(name, frame) for key, (name, frame) in self.SIGNAL_SOURCES.items()}
+
+    def build_signal(self, current_price, is_bull_market, adx_signal, vol_signal,
+                     rsi_val, mfi_val, vwap_signal, bollinger_score, atr_value, macd_score,
+                     debug=False):
+        """
+        계산된 지표 값들로 최종 점수/결과 dict 생성
+        (get_ensemble_signal, IndicatorState 등 지표 계산 경로가 달라도 채점은 여기 한 곳에서)
+        """
         # --- 3. 오실레이터 그룹 점수 통합 (핵심 변경 사항) ---
         # RSI/MFI만 사용하여 중복 신호를 줄이고 평균으로 그룹 점수를 계산합니다.
         # 각각 1점(긍정), 0점(중립), -1점(부정) 부여 후 평균 계산
@@ -176,167 +237,187 @@ class Strategy:
             "score_breakdown": logs
         }
 
+    def score_series(self, df_day: pd.DataFrame, df_min: pd.DataFrame = None):
+        """
+        전체 히스토리 일괄 채점 (백테스트용)
+        - i번째 행 = get_ensemble_signal(df_day.iloc[:i+1], df_min.iloc[:i+1]) 결과와 동일
+        - 모든 지표가 인과적(rolling/ewm/cumsum)이라 한 번의 벡터 연산으로 계산 가능 -> O(n)
+        - df_min은 df_day와 같은 축(같은 길이)이어야 함. 아니면 df_day로 대체
+        - 30봉 미만 구간은 score/rsi/mfi = NaN, should_buy = False
+        """
+        if df_day is None or len(df_day) == 0:
+            return None
+        if df_min is None or len(df_min) != len(df_day):
+            df_min = df_day
+
+        day = self._to_arrays(df_day)
+        mins = day if df_min is df_day else self._to_arrays(df_min)
+        comp = self._indicator_arrays(day, mins)
+        score = self._score_arrays(comp)
+
+        # get_ensemble_signal이 None을 반환하는 구간(30봉 미만) 마스킹
+        valid = np.arange(len(df_day)) >= 29
+        score = np.where(valid, score, np.nan)
+
+        return pd.DataFrame({
+            "score": score,
+            "rsi": np.where(valid, comp['rsi'], np.nan),
+            "mfi": np.where(valid, comp['mfi'], np.nan),
+            "atr": np.where(valid, comp['atr'], np.nan),
+            "should_buy": valid & (score >= self.BUY_THRESHOLD),
+        }, index=df_day.index)
+
+    def score_batch(self, day, mins=None):
+        """
+        여러 티커 일괄 채점 (전 종목 랭킹용)
+        - day / mins: {"open", "high", "low", "close", "volume"} -> (티커 x 봉) 2-D 배열
+          (행마다 같은 봉 수로 정렬된 상태여야 함)
+        - 모든 지표를 axis=1로 한 번에 계산하고 마지막 봉만 채점
+        - 반환: 티커 길이 벡터 dict (score, rsi, mfi, atr, current_price, should_buy + 개별 신호)
+        """
+        n_tickers, n_bars = day['close'].shape
+        if n_bars < 30:
+            nan = np.full(n_tickers, np.nan)
+            return {"score": nan, "rsi": nan, "mfi": nan, "atr": nan,
+                    "current_price": day['close'][:, -1] if n_bars else nan,
+                    "should_buy": np.zeros(n_tickers, dtype=bool)}
+        if mins is None or mins['close'].shape[0] != n_tickers or mins['close'].shape[1] < 30:
+            mins = day
+
+        comp = self._indicator_arrays(day, mins)
+        last = {k: v[..., -1] for k, v in comp.items()}
+        last['score'] = self._score_arrays(last)
+        last['should_buy'] = last['score'] >= self.BUY_THRESHOLD
+        return last
+
+    def score_frames(self, day_frames, min_frames=None, bars=None, min_bars=None):
+        """
+        {티커: DataFrame}을 받아 get_ensemble_signal과 같은 결과 dict를 티커별로 반환
+        - 각 티커의 마지막 bars(분봉은 min_bars)개 봉을 2-D로 쌓아 score_batch 한 번으로 계산
+        - 봉 수가 모자란 신규 상장 코인은 개별 계산 (결과는 get_ensemble_signal과 동일)
+        """
+        min_frames = min_frames or {}
+
+        def max_len(frames):
+            lengths = [len(df) for df in frames.values() if df is not None]
+            return max(lengths) if lengths else 0
+
+        if bars is None: bars = max_len(day_frames)
+        if min_bars is None: min_bars = max_len(min_frames)
+
+        # 분봉 유무에 따라 두 묶음으로 나눠 각각 한 번에 계산
+        def has_bars(df, n):
+            return df is not None and len(df) >= n
+
+        with_min = [
+            t for t, df in day_frames.items()
+            if has_bars(df, bars) and has_bars(min_frames.get(t), max(min_bars, 30))
+        ]
+        day_only = [
+            t for t, df in day_frames.items()
+            if has_bars(df, bars) and t not in with_min and min_frames.get(t) is None
+        ]
+        cols = ('open', 'high', 'low', 'close', 'volume')
+        results = {}
+
+        def stack(frames, group, n):
+            # (티커, 5, 봉) -> 컬럼별 (티커 x 봉) 연속 배열
+            cube = np.array([[frames[t][c].to_numpy(dtype=float)[-n:] for c in cols] for t in group])
+            cube = np.ascontiguousarray(cube.transpose(1, 0, 2))
+            return {c: cube[j] for j, c in enumerate(cols)}
+
+        for group, frames_for_min in ((with_min, min_frames), (day_only, None)):
+            if not group or bars < 30: continue
+            day = stack(day_frames, group, bars)
+            mins = stack(frames_for_min, group, min_bars) if frames_for_min is not None else None
+
+            out = self.score_batch(day, mins)
+            for i, t in enumerate(group):
+                results[t] = self.build_signal(
+                    out['current_price'][i], bool(out['trend'][i]), int(out['adx'][i]), int(out['volume'][i]),
+                    out['rsi'][i], out['mfi'][i], int(out['vwap'][i]), int(out['bollinger'][i]),
+                    out['atr'][i], int(out['macd'][i])
+                )
+
+        for t, df in day_frames.items():
+            if t in results or df is None: continue
+            df_min = min_frames.get(t)
+            if df_min is not None and min_bars: df_min = df_min.iloc[-min_bars:]
+            res = self.get_ensemble_signal(df.iloc[-bars:] if bars else df, df_min)
+            if res: results[t] = res
+        return results
+
+    def _score_arrays(self, comp):
+        """build_signal의 점수 계산을 배열 단위로 (합산 순서 동일)"""
+        rsi, mfi = comp['rsi'], comp['mfi']
+
+        # 오실레이터 그룹
+        rsi_pt = np.where(rsi < 35, 1, np.where(rsi > 65, -1, 0))
+        mfi_pt = np.where(mfi < 25, 1, np.where(mfi > 80, -1, 0))
+        final_osc = ((rsi_pt + mfi_pt) / 2) * self.WEIGHTS["oscillator_group"]
+
+        total = np.where(comp['trend'], self.WEIGHTS["trend"], 0.0)
+        total = total + np.where(comp['adx'] == 1, self.WEIGHTS["adx"], 0.0)
+        total = total + np.where(comp['volume'] == 1, self.WEIGHTS["volume"], 0.0)
+        total = total + np.where(comp['vwap'] == 1, self.WEIGHTS["vwap"], 0.0)
+        total = np.where(final_osc > 0, total + final_osc, total)
+        total = np.where(final_osc < 0, total - np.abs(final_osc) * 0.5, total)
+        total = np.where(comp['bollinger'] == 1, total + self.WEIGHTS["bollinger"], total)
+        total = np.where(comp['bollinger'] == -1, total - 1.0, total)
+        return np.round(np.maximum(0, total), 2)
+
     # =========================================================
-    #  Logic Methods (Indicators) - 기존 코드 유지
+    #  Logic Methods (Indicators) - NumPy 커널(app/services/indicators.py) 위임
     # =========================================================
 
     def _calc_adx(self, df, n=14):
         """ADX: 추세 강도(20이상) AND 상승 추세(PDI > MDI) 확인"""
         if len(df) < n * 2: return 0
-        
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        up_move = high.diff()
-        down_move = -low.diff()
-        
-        pdm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
-        mdm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
-        
-        pdm = pd.Series(pdm, index=df.index)
-        mdm = pd.Series(mdm, index=df.index)
-        
-        tr = self._calc_atr_series(high, low, close)
-        
-        tr_smooth = tr.ewm(alpha=1/n, min_periods=n).mean().replace(0, 0.0001)
-        pdm_smooth = pdm.ewm(alpha=1/n, min_periods=n).mean()
-        mdm_smooth = mdm.ewm(alpha=1/n, min_periods=n).mean()
-        
-        pdi = 100 * (pdm_smooth / tr_smooth)
-        mdi = 100 * (mdm_smooth / tr_smooth)
-        
-        div = (pdi + mdi).replace(0, 0.0001)
-        dx = (abs(pdi - mdi) / div) * 100
-        adx = dx.ewm(alpha=1/n, min_periods=n).mean()
-        
-        curr_adx = adx.iloc[-1]
-        curr_pdi = pdi.iloc[-1]
-        curr_mdi = mdi.iloc[-1]
-        
-        if curr_adx >= 20 and curr_pdi > curr_mdi:
-            return 1
-        return 0
+        sig = ind.adx_signal(
+            df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float), df['close'].to_numpy(dtype=float), n
+        )
+        return int(sig[-1])
 
     def _get_volume_signal(self, df):
         """거래량 폭발 AND 양봉(Close > Open) 확인"""
-        volume = df['volume']
-        close = df['close']
-        open_p = df['open']
-        
-        if len(volume) < 20: return 0
-        
-        vol_ma20 = volume.rolling(20).mean().iloc[-1]
-        curr_vol = volume.iloc[-1]
-        
-        is_explosive = curr_vol > (vol_ma20 * 1.5)
-        is_bullish = close.iloc[-1] > open_p.iloc[-1]
-        
-        if is_explosive and is_bullish:
-            return 1
-        return 0
+        if len(df) < 20: return 0
+        sig = ind.volume_signal(
+            df['volume'].to_numpy(dtype=float), df['close'].to_numpy(dtype=float), df['open'].to_numpy(dtype=float)
+        )
+        return int(sig[-1])
 
     def _sig_bollinger(self, closes, opens, period=20, k=2, threshold=1.02):
         """밴드 하단 터치 + 양봉 반등 확인"""
         if len(closes) < period: return 0
-            
-        ma = closes.rolling(period).mean()
-        std = closes.rolling(period).std()
-        upper = ma + (std * k)
-        lower = ma - (std * k)
-        
-        curr_price = closes.iloc[-1]
-        curr_open = opens.iloc[-1]
-        prev_price = closes.iloc[-2]
-        
-        curr_lower = lower.iloc[-1]
-        curr_upper = upper.iloc[-1]
-        
-        if np.isnan(curr_lower) or np.isnan(curr_upper): return 0
-
-        # 조건 A: 하단 밴드 근처
-        is_near_lower = curr_price <= (curr_lower * threshold)
-        
-        # 조건 B: 반등 (전봉 종가보다 상승 AND 양봉)
-        is_rebounding = (curr_price > prev_price) and (curr_price >= curr_open)
-        
-        if is_near_lower and is_rebounding:
-            return 1
-        if curr_price >= curr_upper:
-            return -1
-        return 0
+        sig = ind.bollinger_signal(closes.to_numpy(dtype=float), opens.to_numpy(dtype=float), period, k, threshold)
+        return int(sig[-1])
 
     def _calc_vwap_signal(self, df):
         """VWAP: 현재가가 VWAP 위에 있을 때"""
         if 'volume' not in df.columns: return 0
-        
-        v = df['volume']
-        tp = (df['high'] + df['low'] + df['close']) / 3
-        
-        cum_vol = v.cumsum().replace(0, 1)
-        cum_vol_price = (tp * v).cumsum()
-        
-        vwap = cum_vol_price / cum_vol
-        
-        curr_price = df['close'].iloc[-1]
-        curr_vwap = vwap.iloc[-1]
-        
-        if curr_price > curr_vwap:
-            return 1
-        return 0
+        arr = self._to_arrays(df)
+        return int(ind.vwap_signal(arr['high'], arr['low'], arr['close'], arr['volume'])[-1])
 
     def _calc_atr_series(self, high, low, close):
-        prev_close = close.shift(1)
-        tr = pd.concat([
-            high - low, 
-            (high - prev_close).abs(), 
-            (low - prev_close).abs()
-        ], axis=1).max(axis=1)
-        return tr
+        tr = ind.true_range(high.to_numpy(dtype=float), low.to_numpy(dtype=float), close.to_numpy(dtype=float))
+        return pd.Series(tr, index=close.index)
 
     def _calc_atr_pandas(self, highs, lows, closes, period=14):
-        tr = self._calc_atr_series(highs, lows, closes)
-        return tr.rolling(period).mean().iloc[-1] if not pd.isna(tr.iloc[-1]) else 0
+        atr = ind.atr(highs.to_numpy(dtype=float), lows.to_numpy(dtype=float), closes.to_numpy(dtype=float), period)
+        return atr[-1]
 
     def _calc_macd_score(self, closes):
-        exp1 = closes.ewm(span=12, adjust=False).mean()
-        exp2 = closes.ewm(span=26, adjust=False).mean()
-        macd_line = exp1 - exp2
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
-        
-        curr = macd_line.iloc[-1]
-        sig = signal_line.iloc[-1]
-        prev = macd_line.iloc[-2]
-        prev_sig = signal_line.iloc[-2]
-
-        if prev <= prev_sig and curr > sig: return 1 
-        elif curr > sig: return 1 
-        elif curr < sig: return -1 
-        return 0
+        return int(ind.macd_score(closes.to_numpy(dtype=float))[-1])
 
     def _calc_rsi_pandas(self, closes, period=14):
-        delta = closes.diff()
-        gain = delta.where(delta > 0, 0).ewm(alpha=1/period, min_periods=period).mean()
-        loss = -delta.where(delta < 0, 0).ewm(alpha=1/period, min_periods=period).mean()
-        rs = gain / loss.replace(0, 0.0001)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.ffill().fillna(50)
+        return pd.Series(ind.rsi(closes.to_numpy(dtype=float), period), index=closes.index)
 
     def _calc_mfi_pandas(self, highs, lows, closes, volumes, period=14):
-        tp = (highs + lows + closes) / 3
-        mf = tp * volumes
-        pos_flow = pd.Series(0.0, index=closes.index)
-        neg_flow = pd.Series(0.0, index=closes.index)
-        delta = tp.diff()
-        
-        pos_flow[delta > 0] = mf[delta > 0]
-        neg_flow[delta < 0] = mf[delta < 0]
-        
-        pos_sum = pos_flow.rolling(period).sum()
-        neg_sum = neg_flow.rolling(period).sum().replace(0, 0.0001)
-        
-        mfi = 100 - (100 / (1 + (pos_sum / neg_sum)))
-        return mfi.fillna(50)
+        mfi = ind.mfi(
+            highs.to_numpy(dtype=float), lows.to_numpy(dtype=float),
+            closes.to_numpy(dtype=float), volumes.to_numpy(dtype=float), period
+        )
+        return pd.Series(mfi, index=closes.index)
 
     def _eval_rsi(self, rsi_val):
         if rsi_val < 30: return 1
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import numpy as np
+
+# =========================================================
+#  실시간 시세 틱 저장소 (Collector -> TradeManager)
+#  - 티커별 고정 용량 링 버퍼 (미리 할당한 NumPy 배열, 틱마다 할당 X)
+#  - 필드: 현재가 / 24h 거래량 / 24h 거래대금 / 거래소 타임스탬프 / 수신 시각
+#  - 같은 값을 i, i+용량 두 칸에 써서 "최근 N틱"을 항상 연속 구간 뷰(복사 없음)로 반환
+#  - 메모리 = 티커 수 x 용량 x 필드 수 x 16B (구독 시간과 무관하게 고정)
+#  - 쓰기는 Collector 쓰레드 1개, 읽기는 이벤트 루프 -> 값 기록 후 카운터를 마지막에 올림
+# =========================================================
+
+FIELDS = ("price", "acc_trade_volume_24h", "acc_trade_price_24h", "exchange_ts", "recv_ts")
+
+
+class TickRing:
+    """티커 1개 링 버퍼 (필드별 float64 배열 2 x capacity)"""
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.data = np.zeros((len(FIELDS), capacity * 2))
+        self.count = 0  # 누적 틱 수 (마지막 틱 위치 = (count - 1) % capacity)
+
+    def push(self, values):
+        slot = self.count % self.capacity
+        self.data[:, slot] = values
+        self.data[:, slot + self.capacity] = values
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def last(self, n=None):
+        """최근 n틱 (필드 x n) 뷰 - 오래된 순, 복사 없음 (다음 push로 값이 바뀔 수 있으니 보관하려면 copy)"""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        end = (self.count - 1) % self.capacity + self.capacity + 1
+        return self.data[:, end - n:end]
+
+    def latest(self, field=0):
+        return float(self.data[field, (self.count - 1) % self.capacity]) if self.count else 0.0
+
+
+class TickStore:
+    """
+    {티커: TickRing}
+    - 기존 shared_dict 호환: `ticker in store`, `store[ticker]['current_price']`, `store.get(...)`, `items()`
+      (읽을 때만 최신값 dict 생성 / 쓰기 경로는 할당 없음)
+    - 수집기 외 경로(REST 보충 등)는 push()로 기록
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.rings = {}
+        self._lock = threading.Lock()
+
+    # --- 쓰기 ---
+    def _ring(self, ticker):
+        ring = self.rings.get(ticker)
+        if ring is None:
+            with self._lock:
+                ring = self.rings.setdefault(ticker, TickRing(self.capacity))
+        return ring
+
+    def push(self, ticker, price, acc_trade_volume_24h=0.0, acc_trade_price_24h=0.0, exchange_ts=None, recv_ts=None):
+        recv_ts = time.time() if recv_ts is None else recv_ts
+        self._ring(ticker).push((price, acc_trade_volume_24h, acc_trade_price_24h,
+                                 recv_ts if exchange_ts is None else exchange_ts, recv_ts))
+
+    # --- 읽기 ---
+    def latest_price(self, ticker, default=0.0):
+        ring = self.rings.get(ticker)
+        return ring.latest(0) if ring is not None and ring.count else default
+
+    def last(self, ticker, n=None):
+        """최근 n틱 {필드: 1-D 뷰} (티커 없으면 None)"""
+        ring = self.rings.get(ticker)
+        if ring is None or not ring.count: return None
+        view = ring.last(n)
+        return dict(zip(FIELDS, view))
+
+    def latest(self, ticker):
+        """shared_dict 형식 최신값 dict"""
+        ring = self.rings[ticker]
+        if not ring.count: raise KeyError(ticker)
+        col = ring.data[:, (ring.count - 1) % ring.capacity]
+        return {
+            "current_price": float(col[0]),
+            "acc_trade_volume_24h": float(col[1]),
+            "acc_trade_price_24h": float(col[2]),
+            "timestamp": float(col[4]),
+            "exchange_timestamp": float(col[3]),
+        }
+
+    def memory_bytes(self):
+        return sum(r.data.nbytes for r in list(self.rings.values()))
+
+    # --- dict 호환 ---
+    def __contains__(self, ticker):
+        ring = self.rings.get(ticker)
+        return ring is not None and ring.count > 0
+
+    def __getitem__(self, ticker):
+        return self.latest(ticker)
+
+    def __setitem__(self, ticker, data):
+        self.push(ticker, float(data.get("current_price", 0)), float(data.get("acc_trade_volume_24h", 0)),
+                  float(data.get("acc_trade_price_24h", 0)), recv_ts=data.get("timestamp"))
+
+    def get(self, ticker, default=None):
+        return self.latest(ticker) if ticker in self else default
+
+    def keys(self):
+        return [t for t, r in list(self.rings.items()) if r.count]
+
+    def items(self):
+        return [(t, self.latest(t)) for t in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __bool__(self):
+        return bool(self.rings)
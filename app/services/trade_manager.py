@@ -7,9 +7,15 @@ from datetime import datetime
 from app.core.trade_repository import TradeRepository
 from app.services.order_executor import OrderExecutor
 from app.services.strategy import Strategy
+from app.services.indicator_stream import IndicatorState
+from app.services.signal_cache import SignalCache
+from app.services.tick_store import TickStore
+from app.services.candle_builder import CandleBuilder
+from app.services.price_events import PriceEventQueue, LatencyStats
+from app.services.exit_index import ExitIndex
 from app.services.backtester import Backtester
+from app.services.upbit_rest import rest, ORDER, LIVE
 from app.core.database import init_db
-import pyupbit
 
 class TradeManager:
     def __init__(self):
@@ -21,7 +27,7 @@ class TradeManager:
         self.backtester = Backtester()
         
         self.is_active = False
-        self.shared_data = {}
+        self.shared_data = TickStore()
         self.market_status = {}
         self.target_coins = []
         
@@ -29,21 +35,31 @@ class TradeManager:
         self.frontend_cache = {} 
         
         # 캐시 및 쿨타임
-        self.cached_day_dfs = {}
-        self.cached_min_dfs = {}
+        self.candles = CandleBuilder(capacity=200)  # 🔥 [속도 개선] trade 스트림으로 만든 로컬 봉 (Collector가 갱신)
+        self.indicator_states = {}  # 🔥 [속도 개선] 티커별 증분 지표 상태 (틱마다 O(1) 채점)
+        self.indicator_keys = {}    # 지표 상태를 시딩한 봉 구성 (마지막 봉 시각 + 시딩 버전)
+        self.price_events = PriceEventQueue()  # 🔥 [속도 개선] Collector -> 매매 루프 가격 변경 알림
+        self.latency = LatencyStats()          # 틱 수신 -> 매매 판단 지연
+        self.signal_cache = SignalCache(maxsize=512)  # 🔥 [속도 개선] 같은 시장 상태 재채점 방지
+        self.buy_candidates = {}  # 매수 조건을 통과한 종목의 마지막 신호 (가격이 바뀐 종목만 재평가, 순위는 전체에서)
         self.last_api_call_time = {}
         self.sell_timestamps = {}
-        self.trailing_status = {}
+        self.exit_index = ExitIndex()  # 🔥 [속도 개선] 손절/트레일링 가격 레벨 (틱마다 O(1) 검사, 최고가 추적 포함)
+        self.indicator_exit_time = {}
         self.REBUY_COOLDOWN = 3600 
         
         # 설정값
         self.MAX_COIN_COUNT = 4 
         self.MIN_ORDER_KRW = 6000
-        self.CACHE_TTL_SECONDS = 300   # 🔥 [시스템최적화] 캐시 만료 시간 추가
-        self.MIN_OHLCV_INTERVAL = 60   # 🔥 [시스템최적화] API 호출 제한 시간 추가
+        self.MIN_OHLCV_INTERVAL = 60   # 🔥 [시스템최적화] REST 재동기화 최소 간격 (실패 시 재시도 간격)
+        self.CANDLE_COUNT = 60         # 지표 계산에 쓰는 봉 개수 (일봉 / 60분봉)
+        self.CANDLE_INTERVALS = ("day", "minute60")
+        self.LOOP_TIMEOUT = 1.0         # 가격 변경이 없어도 이 간격으로 깨어나 유지보수 체크
+        self.MAINTENANCE_INTERVAL = 300 # 대상 종목 갱신 / 캐시 정리 / 통계 출력 (초)
         self.TRAILING_START = 2.0
         self.TRAILING_CALLBACK = 1.0
         self.STOP_LOSS = -3.0
+        self.INDICATOR_EXIT_INTERVAL = 5  # 지표 기반 청산(과열/점수/설거지) 재평가 최소 간격 (초)
         
         self.STRATEGY_MAP = {
             "trend": "추세", "volume": "거래량폭발", "stoch": "골든크로스",
@@ -88,122 +104,167 @@ class TradeManager:
         # --- [본격적인 매매 루프] ---
         print(">>> 🚀 [System] 매매 로직 가동 시작!")
         
+        self.price_events.bind()
         await self.backtester.run_daily_scan()
         await self.update_target_coins()
         
-        loop_count = 0
+        last_maintenance = 0
+        last_frontend = 0
+        last_scan_date = datetime.now().date()
         while True:
             try:
-                # ... (기존 매매 로직 유지) ...
-                if loop_count % 300 == 0:
+                # 🔥 [속도 개선] 1초 폴링 대신 가격이 바뀐 티커만 도착 즉시 처리 (처리 중 쌓인 변경은 1건으로 합쳐짐)
+                changed = await self.price_events.get(timeout=self.LOOP_TIMEOUT)
+                tickers = set(changed)
+                now_ts = time.time()
+
+                if now_ts - last_maintenance >= self.MAINTENANCE_INTERVAL:
                     await self.update_target_coins()
                     self.cleanup_old_cache()
+                    print(f">>> 🧮 [Signal Cache] {self.signal_cache.stats()}")
+                    print(f">>> ⏱️ [Latency] 틱->판단 {self.latency.summary()} / 이벤트 {self.price_events.stats}")
+                    print(f">>> 🚦 [REST] {rest.stats}")
+                    last_maintenance = now_ts
+                    tickers = None  # 대상 종목이 바뀌었으니 전체 1회 평가
                 
                 now = datetime.now()
-                if now.hour == 0 and now.minute == 1 and loop_count % 60 == 0:
+                if now.hour == 0 and now.minute >= 1 and now.date() != last_scan_date:
+                    last_scan_date = now.date()
                     asyncio.create_task(self.backtester.run_daily_scan())
                     self.sell_timestamps.clear()
 
-                await self.process_selling()
-                if self.is_active:
-                    await self.process_buying()
-                
-                self.update_frontend_cache()
+                # 🔥 [속도 개선] 손절/트레일링 레벨을 건드린 틱은 캔들/점수 계산 없이 바로 매도
+                triggered = self.exit_index.pop_triggered()
+                handled = set()
+                if triggered and self.is_active:
+                    handled = await self.process_price_exits(triggered)
+
+                if tickers is None or tickers:
+                    # 방금 매도를 시도한 티커는 이번 회차에서 다시 검사하지 않음 (실패 시 같은 틱으로 2번 주문 방지)
+                    await self.process_selling(tickers, skip=handled)
+                    if self.is_active:
+                        await self.process_buying(tickers)
+                    decided = time.time()
+                    for tick_ts in changed.values():
+                        self.latency.add(decided - tick_ts)
                 
-                loop_count += 1
-                await asyncio.sleep(1)
+                if now_ts - last_frontend >= 1:
+                    self.update_frontend_cache()
+                    last_frontend = now_ts
                 
             except Exception as e:
                 print(f"[Loop Error] {e}")
                 await asyncio.sleep(5)
 
-    async def process_selling(self):
+    async def process_price_exits(self, triggered):
+        """ExitIndex가 잡은 손절/트레일링 교차 -> 즉시 매도 {티커: (trade_id, 교차 가격, 사유)} -> 처리한 티커"""
+        for ticker, (trade_id, price, reason) in triggered.items():
+            current = self.shared_data.latest_price(ticker, price)
+            print(f"👋 [매도 판단] {ticker} -> {reason}")
+            await self._execute_sell(trade_id, ticker, current, reason)
+        return set(triggered)
+
+    async def _execute_sell(self, trade_id, ticker, current, reason):
+        success = await self.executor.try_sell(trade_id, ticker, current, reason)
+        if success:
+            self.sell_timestamps[ticker] = time.time()
+            self.exit_index.disarm(ticker)
+            
+            if ticker in self.market_status:
+                self.market_status[ticker]["category"] = "관찰 종목"
+        return success
+
+    async def process_selling(self, tickers=None, skip=()):
         """
         [수정 내역]
         기존: for trade_id, ticker, buy_price, _, _ in open_trades:
         변경: for trade in open_trades: ... trade['id']
+        tickers: 가격이 바뀐 티커만 평가 (None이면 전체)
+        skip: 이번 회차에 process_price_exits가 이미 매도를 시도한 티커 (성공 / 실패 무관)
+        손절/트레일링은 ExitIndex(가격 레벨, O(1)), 지표 청산은 INDICATOR_EXIT_INTERVAL마다
         """
         open_trades = self.repo.get_open_trades()
+        self.exit_index.sync(open_trades, self.STOP_LOSS, self.TRAILING_START, self.TRAILING_CALLBACK)
+        if tickers is not None:
+            open_trades = [t for t in open_trades if t['ticker'] in tickers]
+        if skip:
+            open_trades = [t for t in open_trades if t['ticker'] not in skip]
         
+        now = time.time()
         for trade in open_trades:
             trade_id = trade['id']
             ticker = trade['ticker']
             buy_price = trade['buy_price']
             
-            # 캔들 데이터 조회
-            df_day, df_min, current, is_real = await self.get_smart_candles(ticker)
-            if not is_real or current == 0: continue
+            current = self.shared_data.latest_price(ticker)
+            if current == 0: continue
 
-            if buy_price <= 0: buy_price = current 
-            profit_rate = ((current - buy_price) / buy_price) * 100
-            
-            res = self.strategy.get_ensemble_signal(df_day, df_min)
-            self._update_market_status(ticker, current, res)
+            if buy_price <= 0:
+                buy_price = current
+                if self.exit_index.peak(ticker) is None: self.exit_index.arm(ticker, trade_id, buy_price)
 
             # --- [매도 로직 시작] ---
-            
-            # 0. 최고가(Peak) 업데이트
-            peak_price = self.trailing_status.get(ticker, buy_price)
-            if current > peak_price:
-                peak_price = current
-                self.trailing_status[ticker] = peak_price
-
-            reason = ""
-
-            # 1. 손절 기준 (Stop Loss)
-            if profit_rate <= self.STOP_LOSS:
-                reason = f"💧손절방어({profit_rate:.2f}%)"
-
-            # 2. 트레일링 스탑 (Trailing Stop)
-            elif profit_rate >= self.TRAILING_START:
-                drawdown_pct = ((peak_price - current) / peak_price) * 100 if peak_price > 0 else 0
-                if drawdown_pct >= self.TRAILING_CALLBACK:
-                    reason = (
-                        f"📉트레일링스탑({profit_rate:.2f}%, "
-                        f"피크-{drawdown_pct:.2f}%)"
-                    )
-            
-            # 3. 수익권일 때 과열 지표 체크
-            elif profit_rate > 0.5: 
-                if res['rsi'] >= 80: reason = f"🔥RSI과열({profit_rate:.2f}%)"
-                elif res.get('mfi', 0) >= 85: reason = f"🌊MFI과열({profit_rate:.2f}%)"
-            
-            # 4. 전략 점수 급락
-            elif res['score'] < 3.5:
-                reason = f"📉점수하락({res['score']}점)"
-            
-            # 5. 이상 징후 (설거지 감지)
-            elif res['rsi'] < 50 and res.get('mfi', 0) >= 75:
-                reason = f"⚠️이상징후(설거지감지)"
+            # 1~2. 손절 / 트레일링 스탑 (가격 레벨만 비교, 최고가 갱신 포함)
+            reason = self.exit_index.check(ticker, current)
+
+            # 트레일링 구간이면 지표 청산 안 함 (기존 elif 순서와 동일)
+            if not reason and self.exit_index.in_trailing_zone(ticker, current): continue
+
+            # 3~5. 지표 기반 청산 (캔들 + 앙상블 점수 -> 느린 주기)
+            if not reason:
+                if now - self.indicator_exit_time.get(ticker, 0) < self.INDICATOR_EXIT_INTERVAL: continue
+                self.indicator_exit_time[ticker] = now
+
+                df_day, df_min, current, is_real = await self.get_smart_candles(ticker)
+                if not is_real or current == 0: continue
+                profit_rate = ((current - buy_price) / buy_price) * 100
+                
+                res = self.get_signal(ticker, df_day, df_min)
+                self._update_market_status(ticker, current, res)
+                reason = self._indicator_exit_reason(profit_rate, res)
 
             # --- [매도 실행] ---
             if reason and self.is_active:
                 print(f"👋 [매도 판단] {ticker} -> {reason}")
-                success = await self.executor.try_sell(trade_id, ticker, current, reason)
-                if success:
-                    self.sell_timestamps[ticker] = time.time()
-                    self.trailing_status.pop(ticker, None)
-                    
-                    if ticker in self.market_status:
-                        self.market_status[ticker]["category"] = "관찰 종목"
+                await self._execute_sell(trade_id, ticker, current, reason)
+
+    def _indicator_exit_reason(self, profit_rate, res):
+        """process_selling 3~5단계 (손절/트레일링 구간이 아닐 때만 호출)"""
+        reason = ""
+        if not res: return reason
+        exit_rule = self.strategy.EXIT
+
+        # 3. 수익권일 때 과열 지표 체크
+        if profit_rate > exit_rule['min_profit']: 
+            if res['rsi'] >= exit_rule['rsi']: reason = f"🔥RSI과열({profit_rate:.2f}%)"
+            elif res.get('mfi', 0) >= exit_rule['mfi']: reason = f"🌊MFI과열({profit_rate:.2f}%)"
+        
+        # 4. 전략 점수 급락
+        elif res['score'] < self.strategy.SELL_THRESHOLD:
+            reason = f"📉점수하락({res['score']}점)"
+        
+        # 5. 이상 징후 (설거지 감지)
+        elif res['rsi'] < exit_rule['wash_rsi'] and res.get('mfi', 0) >= exit_rule['wash_mfi']:
+            reason = f"⚠️이상징후(설거지감지)"
+        return reason
 
-    async def process_buying(self):
-        # --- [1] 먼저 예산/슬롯 확인 ---
+    async def process_buying(self, tickers=None):
+        """
+        tickers: 가격이 바뀐 티커만 재평가 (None이면 대상 종목 전체)
+        - 재평가하지 않은 종목은 마지막 신호(buy_candidates)를 그대로 유지
+        - 순위/빈 슬롯 컷은 현재 조건을 통과한 전체 대상 종목에서 (PortfolioBacktester와 동일)
+        """
+        # --- [1] 먼저 슬롯 확인 (잔고 조회는 후보가 있을 때만 - 이벤트마다 REST 호출 방지) ---
         active_cnt = self.repo.get_trade_count()
         empty_slots = self.MAX_COIN_COUNT - active_cnt
-        
-        krw = self.executor.get_krw_balance()
-        can_buy = (empty_slots > 0) and (krw >= self.MIN_ORDER_KRW)
-        
-        budget = 0
-        if can_buy:
-            budget = (krw * 0.99) / empty_slots
-            if budget < self.MIN_ORDER_KRW: budget = krw * 0.99
+        can_buy = empty_slots > 0
 
         # --- [2] 종목 스캔 & 점수 업데이트 ---
-        candidates = []
+        targets = self.target_coins if tickers is None else [t for t in self.target_coins if t in tickers]
         
-        for ticker in self.target_coins:
+        for ticker in targets:
+            # 재평가 종목은 이전 신호를 버리고 이번 신호로 다시 판단
+            self.buy_candidates.pop(ticker, None)
             last_sell = self.sell_timestamps.get(ticker, 0)
             is_cooldown = (time.time() - last_sell < self.REBUY_COOLDOWN)
             is_holding = self._is_holding(ticker)
@@ -211,12 +272,12 @@ class TradeManager:
             df_day, df_min, current, is_real = await self.get_smart_candles(ticker)
             if not is_real: continue
             
-            res = self.strategy.get_ensemble_signal(df_day, df_min)
+            res = self.get_signal(ticker, df_day, df_min)
             
             # UI용 상태 업데이트
             self._update_market_status(ticker, current, res)
             
-            if not can_buy or is_holding or is_cooldown: continue
+            if is_holding or is_cooldown: continue
 
             # --- 매수 후보 필터링 로직 ---
             res['ticker'] = ticker 
@@ -226,10 +287,8 @@ class TradeManager:
             mfi = res.get('mfi', 50)
             score = res['score']
 
-            if rsi >= 70: continue         
-            if mfi >= 80: continue        
-            if rsi >= 60 and mfi < 40: continue
-            if score < 7.0: continue # 기준점
+            if self.strategy.is_overheated(rsi, mfi): continue  # RSI/MFI 과열, 설거지 패턴
+            if score < self.strategy.BUY_THRESHOLD: continue # 기준점
             
             # 🚫 Filter: Shooting Star Detected (Upper Wick > Body * 2)
             last_open = df_min['open'].iloc[-1]
@@ -252,9 +311,26 @@ class TradeManager:
             if price_range_pct > 10:
                 continue
 
-            candidates.append(res)
+            self.buy_candidates[ticker] = res
+
+        # 대상에서 빠진 종목 정리 + 보유/쿨타임 재확인 (마지막 평가 이후 매수/매도됐을 수 있음)
+        target_set = set(self.target_coins)
+        for ticker in [t for t in self.buy_candidates if t not in target_set]:
+            del self.buy_candidates[ticker]
+        now = time.time()
+        candidates = [
+            res for ticker, res in self.buy_candidates.items()
+            if not self._is_holding(ticker) and now - self.sell_timestamps.get(ticker, 0) >= self.REBUY_COOLDOWN
+        ]
         
-        # --- [3] 실제 매수 실행 ---
+        # --- [3] 예산 확인 후 실제 매수 실행 ---
+        budget = 0
+        if candidates and can_buy:
+            krw = self.executor.get_krw_balance()
+            can_buy = krw >= self.MIN_ORDER_KRW
+            budget = (krw * 0.99) / empty_slots
+            if budget < self.MIN_ORDER_KRW: budget = krw * 0.99
+
         if candidates and can_buy:
             candidates.sort(key=lambda x: (x['score'], x['mfi']), reverse=True)
             final_picks = candidates[:empty_slots]
@@ -270,6 +346,8 @@ class TradeManager:
                 
                 print(f"🏆 [Pick] {ticker} (점수:{pick['score']} / RSI:{pick['rsi']:.1f}) -> 매수")
                 
+                # 주문한 신호는 소진 (실패해도 다음 재평가 때 다시 후보가 됨)
+                self.buy_candidates.pop(ticker, None)
                 success = await self.executor.try_buy(ticker, price, budget, strategy_name)
                 if success:
                     if ticker in self.market_status:
@@ -283,10 +361,12 @@ class TradeManager:
             if current_krw < krw_amount:
                 return {"status": "error", "message": f"잔액 부족 (보유: {current_krw:,.0f}원)"}
             
-            current_price = pyupbit.get_current_price(ticker)
+            current_price = await rest.aget_current_price(ticker, priority=ORDER)
             success = await self.executor.try_buy(ticker, current_price, krw_amount, "Manual(수동)")
             
             if success:
+                await self.repo.wait_durable()  # 응답 전에 매수 기록 커밋 확인
+                self.price_events.add_watch(ticker)
                 if ticker in self.market_status:
                     self.market_status[ticker]['category'] = self.market_status[ticker].get("category", "") + " (보유중)"
                 self.update_frontend_cache()
@@ -303,13 +383,14 @@ class TradeManager:
             if balance <= 0:
                 return {"status": "error", "message": "매도할 잔액이 없습니다."}
             
-            current_price = pyupbit.get_current_price(ticker)
+            current_price = await rest.aget_current_price(ticker, priority=ORDER)
             trade_row = self.repo.get_open_trade(ticker)
-            trade_id = trade_row[0] if trade_row else 0
+            trade_id = trade_row['id'] if trade_row else 0
             
             success = await self.executor.try_sell(trade_id, ticker, current_price, "Manual(수동)")
             
             if success:
+                await self.repo.wait_durable()  # 응답 전에 매도 기록 커밋 확인
                 self.sell_timestamps[ticker] = time.time()
                 if ticker in self.market_status:
                     cat = self.market_status[ticker].get("category", "")
@@ -390,10 +471,10 @@ class TradeManager:
             missing_tickers = [t for t in final_targets if t not in self.shared_data]
             if missing_tickers:
                 try:
-                    prices = await asyncio.to_thread(pyupbit.get_current_price, missing_tickers)
+                    prices = await rest.aget_current_price(missing_tickers, priority=LIVE)
                     if isinstance(prices, (float, int)): prices = {missing_tickers[0]: prices}
                     for t, p in prices.items():
-                        self.shared_data[t] = {"current_price": float(p), "acc_trade_price_24h": 0}
+                        self.shared_data.push(t, float(p))
                 except Exception as e:
                     print(f"⚠️ [Price Fill Error] {missing_tickers}: {e}")
 
@@ -401,7 +482,7 @@ class TradeManager:
             for ticker in final_targets:
                 existing = self.market_status.get(ticker, {})
                 cached = self.backtester.get_analysis(ticker)
-                realtime_price = self.shared_data.get(ticker, {}).get('current_price', 0)
+                realtime_price = self.shared_data.latest_price(ticker)
                 
                 base_data = {
                     "price": realtime_price,
@@ -438,37 +519,54 @@ class TradeManager:
                 new_status[ticker] = base_data
                 
             self.target_coins = final_targets
+            self.price_events.watch(final_targets)  # 대상 + 보유 종목만 루프를 깨움
             self.market_status = new_status
             
         except Exception as e: print(f"Target Update Error: {e}")
 
-    async def get_smart_candles(self, ticker):
+    async def sync_candles(self, ticker):
+        """REST로 로컬 봉 시딩 (최초 1회 / 웹소켓 재연결 후). 실패 시 MIN_OHLCV_INTERVAL 뒤 재시도"""
         now = time.time()
-        last_call = self.last_api_call_time.get(ticker, 0)
-        
-        # 🔥 [시스템최적화] API 호출 제한 (MIN_OHLCV_INTERVAL) 적용
-        if now - last_call > self.MIN_OHLCV_INTERVAL or ticker not in self.cached_day_dfs:
-            try:
-                df_day = await asyncio.to_thread(pyupbit.get_ohlcv, ticker, interval="day", count=60)
-                df_min = await asyncio.to_thread(pyupbit.get_ohlcv, ticker, interval="minute60", count=60)
-                if df_day is not None:
-                    self.cached_day_dfs[ticker] = df_day
-                    self.cached_min_dfs[ticker] = df_min if df_min is not None else df_day
-                    self.last_api_call_time[ticker] = now
-            except Exception as e:
-                # 🔥 [시스템최적화] 조용한 에러 방지 (로그 출력)
-                print(f"⚠️ [Candle Error] {ticker}: {e}")
+        if now - self.last_api_call_time.get(ticker, 0) <= self.MIN_OHLCV_INTERVAL: return
+        self.last_api_call_time[ticker] = now
+        try:
+            df_day = await rest.aget_ohlcv(ticker, "day", self.CANDLE_COUNT, priority=LIVE)
+            df_min = await rest.aget_ohlcv(ticker, "minute60", self.CANDLE_COUNT, priority=LIVE)
+            if df_day is not None:
+                self.candles.seed(ticker, {"day": df_day, "minute60": df_min})
+        except Exception as e:
+            # 🔥 [시스템최적화] 조용한 에러 방지 (로그 출력)
+            print(f"⚠️ [Candle Error] {ticker}: {e}")
+
+    def get_local_candles(self, ticker):
+        """메모리 봉 -> (일봉 df, 60분봉 df) 복사본 (HTTP 없음, 없으면 None)"""
+        df_day = self.candles.frame(ticker, "day", self.CANDLE_COUNT)
+        if df_day is None: return None
+        df_min = self.candles.frame(ticker, "minute60", self.CANDLE_COUNT)
+        return df_day, (df_min if df_min is not None else df_day)
+
+    def _refresh_indicator_state(self, ticker, df_day, df_min):
+        """봉이 새로 생기거나 재시딩됐을 때만 지표 상태 재시딩 (진행 봉 변화는 get_signal에서 O(1) 반영)"""
+        key = (df_day.index[-1], df_min.index[-1], self.candles.version(ticker))
+        if self.indicator_keys.get(ticker) != key:
+            self.indicator_states[ticker] = IndicatorState(self.strategy, df_day, df_min)
+            self.indicator_keys[ticker] = key
+
+    async def get_smart_candles(self, ticker):
+        # 🔥 [속도 개선] 봉은 trade 스트림으로 메모리에서 생성 -> REST는 시딩 / 재동기화 때만
+        if self.candles.needs_sync(ticker, self.CANDLE_INTERVALS):
+            await self.sync_candles(ticker)
         
-        if ticker not in self.cached_day_dfs: return None, None, 0, False
+        frames = self.get_local_candles(ticker)
+        if frames is None: return None, None, 0, False
         
-        # 🔥 [시스템최적화] 데이터 복사(copy) 대신 덮어쓰기 방식으로 최적화
-        df_day = self.cached_day_dfs[ticker].copy()
-        df_min = self.cached_min_dfs[ticker].copy()
+        df_day, df_min = frames
+        self._refresh_indicator_state(ticker, df_day, df_min)
         is_realtime = False
         current_price = 0
         
         if self.shared_data and ticker in self.shared_data:
-            current_price = self.shared_data[ticker]['current_price']
+            current_price = self.shared_data.latest_price(ticker)
             is_realtime = True
             
         if is_realtime and current_price > 0:
@@ -481,28 +579,53 @@ class TradeManager:
             
         return df_day, df_min, current_price, is_realtime
 
+    def get_signal(self, ticker, df_day, df_min, debug=False):
+        """
+        get_smart_candles 결과로 앙상블 점수 산출
+        - 같은 시장 상태(캔들 + 현재가 + 가중치)면 캐시 재사용 (매도/매수/분석 API 공용)
+        - 캔들이 새로 시딩된 증분 상태가 있으면 진행 중인 마지막 봉만 반영해서 O(1) 채점
+          (상태의 봉 키가 지금 df와 다르면 먼저 재시딩 -> 새 봉이 이전 봉 슬롯을 덮어쓰지 않게)
+        - 없으면 기존 pandas 경로
+        - debug=True: 점수 내역(score_breakdown) + 콘솔 출력, 캐시 사용 안 함 (분석 API 전용)
+        """
+        cols = ('open', 'high', 'low', 'close', 'volume')
+        day_bar = tuple(float(df_day[c].iat[-1]) for c in cols)
+        min_bar = tuple(float(df_min[c].iat[-1]) for c in cols)
+        key = (
+            ticker,
+            (df_day.index[-1], df_min.index[-1], self.candles.version(ticker)),
+            (day_bar, min_bar),
+            self.strategy.weights_version,
+        )
+
+        def compute(debug=False):
+            # 🔥 [정합성] get_smart_candles를 안 거친 호출(분석 API 등)도 같은 봉 기준 상태로 채점
+            self._refresh_indicator_state(ticker, df_day, df_min)
+            state = self.indicator_states.get(ticker)
+            if state is None or not state.ready:
+                return self.strategy.get_ensemble_signal(df_day, df_min, debug=debug)
+            state.update_last(day_bar, min_bar)
+            return state.signal(debug)
+
+        res = compute(debug=True) if debug else self.signal_cache.get_or_compute(key, compute)
+        # 호출부에서 dict를 수정하므로 얕은 복사본 반환
+        return dict(res) if res else res
+
     def cleanup_old_cache(self):
         active_tickers = set(self.target_coins)
-        for ticker in list(self.cached_day_dfs.keys()):
-            if ticker not in active_tickers: del self.cached_day_dfs[ticker]
-        for ticker in list(self.cached_min_dfs.keys()):
-            if ticker not in active_tickers: del self.cached_min_dfs[ticker]
+        for ticker in self.candles.tickers():
+            if ticker not in active_tickers: self.candles.drop(ticker)
+        for ticker in list(self.indicator_states.keys()):
+            if ticker not in active_tickers:
+                del self.indicator_states[ticker]
+                self.indicator_keys.pop(ticker, None)
         for ticker in list(self.last_api_call_time.keys()):
             if ticker not in active_tickers: del self.last_api_call_time[ticker]
-        for ticker in list(self.trailing_status.keys()):
-            if ticker not in active_tickers: del self.trailing_status[ticker]
+        for ticker in list(self.indicator_exit_time.keys()):
+            if ticker not in active_tickers: del self.indicator_exit_time[ticker]
         
-        # 🔥 [시스템최적화] TTL 만료된 캐시 강제 삭제
+        # (로컬 봉은 체결로 계속 갱신되므로 TTL 만료 재조회 없음 - 재동기화는 재연결 시에만)
         now = time.time()
-        stale = [
-            t for t, ts in self.last_api_call_time.items()
-            if now - ts > self.CACHE_TTL_SECONDS
-        ]
-        for t in stale:
-            self.cached_day_dfs.pop(t, None)
-            self.cached_min_dfs.pop(t, None)
-            self.last_api_call_time.pop(t, None)
-        
         expired = [t for t, ts in self.sell_timestamps.items() if now - ts > self.REBUY_COOLDOWN]
         for t in expired:
             del self.sell_timestamps[t]
@@ -532,9 +655,8 @@ class TradeManager:
             })
             
     def _is_holding(self, ticker):
-        if ticker in self.market_status:
-            return "(보유중)" in self.market_status[ticker].get("category", "")
-        return False
+        # 🔥 [속도 개선] 화면용 카테고리 문자열 대신 보유 장부 (O(1), DB 조회 없음)
+        return self.repo.is_holding(ticker)
 
     def update_frontend_cache(self):
         open_trades = self.repo.get_open_trades() 
@@ -555,7 +677,7 @@ class TradeManager:
 
             for ticker in holdings_map.keys():
                 qty = balance_dict.get(ticker, 0)
-                current_price = self.shared_data.get(ticker, {}).get('current_price', 0)
+                current_price = self.shared_data.latest_price(ticker)
                 total_coin_val += (qty * current_price)
                 
         except Exception as e:
@@ -571,7 +693,7 @@ class TradeManager:
                 item['reasons'] = active_reasons
 
             if self.shared_data and ticker in self.shared_data:
-                item['price'] = self.shared_data[ticker]['current_price']
+                item['price'] = self.shared_data.latest_price(ticker)
             
             if ticker in holdings_map:
                 buy_price = holdings_map[ticker]
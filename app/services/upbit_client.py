@@ -1,6 +1,9 @@
 import pyupbit
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from app.services.upbit_rest import rest, ORDER, BALANCE
 
 load_dotenv()
 
@@ -15,10 +18,57 @@ class UpbitClient:
         else:
             self.upbit = pyupbit.Upbit(self.access_key, self.secret_key)
 
-    def get_balance(self, ticker="KRW"):
+        # 🔥 [속도 개선] 잔고 스냅샷 캐시 (get_balances 1번 -> 통화별 O(1) 조회)
+        #   - TTL 안에서는 REST 호출 없음 / 주문(성공·실패 무관) 직후 즉시 무효화
+        #   - single-flight: 여러 쓰레드가 동시에 만료를 보면 1번만 조회하고 나머지는 그 결과 사용
+        self.BALANCE_TTL = 2.0
+        self.balance_raw = []        # get_balances() 원본 리스트
+        self.balance_map = {}        # 통화 -> balance + locked
+        self.balance_fetched_at = 0  # 스냅샷 조회 시작 시각
+        self.balance_invalid_at = 0  # 마지막 무효화 시각 (이전에 시작한 조회 결과는 만료 취급)
+        self.balance_stats = {"hits": 0, "fetches": 0}
+        self._balance_lock = threading.Lock()
+
+    # --- 잔고 스냅샷 ---
+    def _balance_fresh(self, max_age, requested_at):
+        fetched = self.balance_fetched_at
+        if fetched <= self.balance_invalid_at: return False
+        if max_age is None: max_age = self.BALANCE_TTL
+        # max_age=0: 요청 이후 시작한 조회만 인정 (대기하는 동안 다른 쓰레드가 받아온 결과는 공유)
+        return fetched >= requested_at or time.time() - fetched < max_age
+
+    def _balance_snapshot(self, max_age=None):
+        requested_at = time.time()
+        if self._balance_fresh(max_age, requested_at):
+            self.balance_stats["hits"] += 1
+            return self.balance_raw, self.balance_map
+        with self._balance_lock:
+            if self._balance_fresh(max_age, requested_at):
+                self.balance_stats["hits"] += 1
+                return self.balance_raw, self.balance_map
+            started = time.time()
+            balances = rest.call("default", self.upbit.get_balances, contain_req=True, priority=BALANCE)
+            if not isinstance(balances, list):
+                raise RuntimeError(f"잔고 조회 응답 이상: {balances}")
+            balance_map = {}
+            for b in balances:
+                if isinstance(b, dict) and 'currency' in b:
+                    # balance: 사용 가능 잔고 / locked: 매도 주문 걸어놔서 묶인 잔고 -> 합쳐야 '진짜 내 재산'
+                    balance_map[b['currency']] = float(b['balance']) + float(b['locked'])
+            self.balance_raw, self.balance_map = balances, balance_map
+            self.balance_fetched_at = started
+            self.balance_stats["fetches"] += 1
+            return balances, balance_map
+
+    def invalidate_balances(self):
+        """주문 직후 호출 -> 다음 조회는 무조건 REST"""
+        self.balance_invalid_at = time.time()
+
+    def get_balance(self, ticker="KRW", max_age=None):
         """
         [최종 해결버전] 전체 리스트(get_balances)를 가져와서 직접 찾기
         이 방식은 진단 키트와 동일한 로직이므로 무조건 성공합니다.
+        max_age: 허용할 스냅샷 나이 (None이면 BALANCE_TTL, 0이면 새로 조회)
         """
         if not self.upbit: 
             return 0
@@ -30,29 +80,18 @@ class UpbitClient:
             if "-" in ticker and ticker.upper() != "KRW":
                 target_currency = ticker.split("-")[1]
             
-            # 2. [핵심] 전체 계좌 리스트 조회 (진단 키트가 성공한 그 방식!)
-            balances = self.upbit.get_balances()
-            
-            # 3. 리스트에서 내가 찾는 코인 검색해서 합산
-            for b in balances:
-                if b['currency'] == target_currency:
-                    # balance: 사용 가능 잔고
-                    # locked: 매도 주문 걸어놔서 묶인 잔고
-                    # 이 두 개를 합쳐야 '진짜 내 재산'입니다.
-                    total_qty = float(b['balance']) + float(b['locked'])
-                    return total_qty
-            
-            # 리스트를 다 뒤졌는데 없으면 진짜 0개
-            return 0
+            # 2. [핵심] 전체 계좌 스냅샷에서 바로 찾기 (없으면 진짜 0개)
+            _, balance_map = self._balance_snapshot(max_age)
+            return balance_map.get(target_currency, 0)
             
         except Exception as e:
             print(f"❌ [Balance Error] {ticker} 조회 실패: {e}")
             return 0
 
-    def get_balances(self):
-        """전체 계좌 잔고 조회 (동기화용)"""
+    def get_balances(self, max_age=None):
+        """전체 계좌 잔고 조회 (동기화용, 스냅샷 공유 - 수정하지 말 것)"""
         if not self.upbit: return []
-        return self.upbit.get_balances()
+        return self._balance_snapshot(max_age)[0]
 
     def buy_market_order(self, ticker, price):
         if not self.upbit: return None
@@ -60,17 +99,21 @@ class UpbitClient:
             if price < 5000:
                 print(f"⛔ [매수 실패] 최소 주문액(5,000원) 미만: {price}원")
                 return None
-            result = self.upbit.buy_market_order(ticker, price)
+            result = rest.call("order", self.upbit.buy_market_order, ticker, price, contain_req=True, priority=ORDER)
             return result
         except Exception as e:
             print(f"❌ [매수 에러] {e}")
             return None
+        finally:
+            self.invalidate_balances()
 
     def sell_market_order(self, ticker, volume):
         if not self.upbit: return None
         try:
-            result = self.upbit.sell_market_order(ticker, volume)
+            result = rest.call("order", self.upbit.sell_market_order, ticker, volume, contain_req=True, priority=ORDER)
             return result
         except Exception as e:
             print(f"❌ [매도 에러] {e}")
-            return None
\ No newline at end of file
+            return None
+        finally:
+            self.invalidate_balances()
\ No newline at end of file
@@ -0,0 +1,334 @@
+import asyncio
+import json
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+# =========================================================
+#  업비트 REST 호출 스케줄러 (모든 REST 호출이 이 관문을 지나감)
+#  - 요청 그룹별 토큰 버킷 (업비트 제한 단위: market / candles / ticker / default / order ...)
+#  - 응답 헤더 Remaining-Req ("group=candles; min=1799; sec=9")로 남은 횟수를 보정
+#    (서버가 남은 게 더 적다고 하면 버킷을 줄이고, 0이면 다음 초/분까지 그룹 정지)
+#  - 429 응답: 그룹을 PENALTY초 정지 후 재시도 (RETRIES회)
+#  - 우선순위: 주문 > 잔고 > 실시간 매매용 캔들/시세 > 스캔. 같은 그룹에서 높은 순위가 기다리면 낮은 순위는 양보
+#  - async 경로는 토큰을 이벤트 루프에서 기다린 뒤 쓰레드로 보냄
+#    (스캔 요청이 to_thread 워커를 붙잡고 기다리다 주문 요청이 밀리는 일 없음)
+#  - 시세(캔들 / 현재가 / 티커 목록)는 직접 HTTP (헤더를 읽기 위해, pyupbit와 같은 DataFrame 형식),
+#    인증 API(잔고 / 주문)는 pyupbit 호출을 contain_req=True로 감싸서 헤더만 반영
+# =========================================================
+
+BASE_URL = "https://api.upbit.com/v1"
+
+# 그룹별 초당 요청 수 (업비트 문서 기준)
+GROUP_LIMITS = {
+    "market": 10, "candles": 10, "ticker": 10, "orderbook": 10, "trades": 10,
+    "default": 30, "order": 8,
+}
+
+# 우선순위 (작을수록 먼저)
+ORDER, BALANCE, LIVE, SCAN = 0, 1, 2, 3
+
+CANDLE_PATHS = {
+    "day": "candles/days", "week": "candles/weeks", "month": "candles/months",
+    "minute1": "candles/minutes/1", "minute3": "candles/minutes/3", "minute5": "candles/minutes/5",
+    "minute10": "candles/minutes/10", "minute15": "candles/minutes/15", "minute30": "candles/minutes/30",
+    "minute60": "candles/minutes/60", "minute240": "candles/minutes/240",
+}
+CANDLE_FIELDS = {
+    "opening_price": "open", "high_price": "high", "low_price": "low", "trade_price": "close",
+    "candle_acc_trade_volume": "volume", "candle_acc_trade_price": "value",
+}
+# ticker 응답의 당일(00:00 UTC~) 누적값 = 진행 중인 일봉
+TICKER_DAY_FIELDS = {
+    "opening_price": "open", "high_price": "high", "low_price": "low", "trade_price": "close",
+    "acc_trade_volume": "volume", "acc_trade_price": "value",
+}
+KST = timedelta(hours=9)
+MAX_CANDLES = 200  # 업비트 캔들 1회 최대 개수
+
+_REMAINING = re.compile(r"group=([a-z\-]+); min=([0-9]+); sec=([0-9]+)")
+
+
+def parse_remaining(header):
+    """Remaining-Req 헤더 -> {"group", "min", "sec"} (형식이 다르면 None)"""
+    matched = _REMAINING.search(header or "")
+    if matched is None: return None
+    return {"group": matched.group(1), "min": int(matched.group(2)), "sec": int(matched.group(3))}
+
+
+class TooManyRequests(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate):
+        self.rate = rate
+        self.capacity = rate  # 1초치까지만 모아둠
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now):
+        """토큰 1개를 쓸 수 있을 때까지 남은 시간 (0이면 지금 가능)"""
+        if now < self.blocked_until: return self.blocked_until - now
+        self.refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class UpbitRestScheduler:
+    def __init__(self, base_url=BASE_URL, limits=None):
+        self.base_url = base_url.rstrip("/")
+        self.limits = dict(GROUP_LIMITS, **(limits or {}))
+        self.buckets = {}
+        self.waiting = {}  # 그룹 -> {우선순위: 대기 수}
+        self.TIMEOUT = 5.0   # HTTP 타임아웃 (초)
+        self.RETRIES = 3     # 429 / 일시 오류 재시도 횟수
+        self.PENALTY = 1.0   # 429 받은 그룹 정지 시간 (초)
+        self.POLL = 0.01     # 토큰 대기 확인 간격 (초)
+        self.stats = {"requests": 0, "throttled": 0, "too_many": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    # --- 토큰 ---
+    def _bucket(self, group):
+        bucket = self.buckets.get(group)
+        if bucket is None:
+            bucket = self.buckets[group] = TokenBucket(self.limits.get(group, self.limits["default"]))
+        return bucket
+
+    def _try_take(self, group, priority):
+        """토큰 1개 시도 -> 0이면 획득, 아니면 다시 볼 때까지 기다릴 시간"""
+        now = time.monotonic()
+        with self._lock:
+            waiting = self.waiting.get(group)
+            if waiting and any(p < priority and n > 0 for p, n in waiting.items()):
+                return self.POLL  # 더 급한 요청이 기다리는 중 -> 양보
+            bucket = self._bucket(group)
+            wait = bucket.wait_time(now)
+            if wait > 0: return wait
+            bucket.tokens -= 1
+            return 0.0
+
+    def _enter(self, group, priority, delta):
+        with self._lock:
+            waiting = self.waiting.setdefault(group, {})
+            waiting[priority] = waiting.get(priority, 0) + delta
+
+    def acquire(self, group, priority=SCAN):
+        """토큰 1개 (블로킹, 쓰레드용)"""
+        wait = self._try_take(group, priority)
+        if wait == 0: return
+        self.stats["throttled"] += 1
+        self._enter(group, priority, 1)
+        try:
+            while wait > 0:
+                time.sleep(min(wait, 0.1))
+                wait = self._try_take(group, priority)
+        finally:
+            self._enter(group, priority, -1)
+
+    async def wait_turn(self, group, priority=SCAN):
+        """토큰 1개 (이벤트 루프용, 워커 쓰레드를 붙잡지 않음)"""
+        wait = self._try_take(group, priority)
+        if wait == 0: return
+        self.stats["throttled"] += 1
+        self._enter(group, priority, 1)
+        try:
+            while wait > 0:
+                await asyncio.sleep(min(wait, 0.1))
+                wait = self._try_take(group, priority)
+        finally:
+            self._enter(group, priority, -1)
+
+    def observe(self, remaining):
+        """Remaining-Req (헤더 문자열 또는 parse_remaining dict) 반영"""
+        if isinstance(remaining, str): remaining = parse_remaining(remaining)
+        if not remaining: return
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(remaining["group"])
+            bucket.refill(now)
+            bucket.tokens = min(bucket.tokens, remaining["sec"])
+            if remaining["min"] == 0:
+                bucket.blocked_until = max(bucket.blocked_until, now + 60 - time.time() % 60)
+            elif remaining["sec"] == 0:
+                bucket.blocked_until = max(bucket.blocked_until, now + 1 - time.time() % 1)
+
+    def penalize(self, group):
+        """429 -> 그룹 정지"""
+        self.stats["too_many"] += 1
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(group)
+            bucket.tokens = 0
+            bucket.blocked_until = max(bucket.blocked_until, now + self.PENALTY)
+
+    # --- 인증 API (pyupbit 호출 감싸기) ---
+    def _unwrap(self, result):
+        # contain_req=True 결과: (데이터, {"group", "min", "sec"})
+        if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], dict) and "group" in result[1]:
+            self.observe(result[1])
+            return result[0]
+        return result
+
+    def call(self, group, fn, *args, priority=SCAN, **kwargs):
+        """fn(*args, **kwargs)를 그룹 토큰을 받은 뒤 실행 (쓰레드용)"""
+        self.acquire(group, priority)
+        self.stats["requests"] += 1
+        return self._unwrap(fn(*args, **kwargs))
+
+    async def run(self, group, fn, *args, priority=SCAN, **kwargs):
+        """call()의 async 버전 (토큰은 루프에서 기다리고 실행만 쓰레드)"""
+        await self.wait_turn(group, priority)
+        self.stats["requests"] += 1
+        return self._unwrap(await asyncio.to_thread(fn, *args, **kwargs))
+
+    # --- 시세 API (직접 HTTP) ---
+    def _http_get(self, path, params):
+        """GET 1회 -> (JSON, Remaining-Req dict). 429면 TooManyRequests"""
+        url = f"{self.base_url}/{path}"
+        if params: url += "?" + urllib.parse.urlencode(params, safe=",")
+        request = urllib.request.Request(url, headers={"Accept": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.TIMEOUT) as resp:
+                remaining = parse_remaining(resp.headers.get("Remaining-Req"))
+                return json.loads(resp.read()), remaining
+        except urllib.error.HTTPError as e:
+            if e.code == 429: raise TooManyRequests(path) from e
+            raise
+
+    def fetch(self, path, params=None, group="default", priority=SCAN):
+        """GET (토큰 대기 + 헤더 반영 + 429 재시도, 쓰레드용)"""
+        for attempt in range(self.RETRIES + 1):
+            self.acquire(group, priority)
+            self.stats["requests"] += 1
+            try:
+                data, remaining = self._http_get(path, params)
+                self.observe(remaining)
+                return data
+            except TooManyRequests:
+                self.penalize(group)
+                if attempt == self.RETRIES: raise
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+
+    async def afetch(self, path, params=None, group="default", priority=SCAN):
+        """fetch()의 async 버전"""
+        for attempt in range(self.RETRIES + 1):
+            await self.wait_turn(group, priority)
+            self.stats["requests"] += 1
+            try:
+                data, remaining = await asyncio.to_thread(self._http_get, path, params)
+                self.observe(remaining)
+                return data
+            except TooManyRequests:
+                self.penalize(group)
+                if attempt == self.RETRIES: raise
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+
+    # --- pyupbit 호환 헬퍼 ---
+    @staticmethod
+    def _candle_params(ticker, count, to):
+        return {"market": ticker, "count": count, "to": to.strftime("%Y-%m-%d %H:%M:%S")}
+
+    @staticmethod
+    def _candle_frame(pages):
+        """캔들 응답 페이지들 -> pyupbit.get_ohlcv와 같은 DataFrame (KST naive 인덱스, 오름차순)"""
+        rows = [row for page in pages for row in page]
+        if not rows: return None
+        index = pd.to_datetime([row["candle_date_time_kst"] for row in rows], format="%Y-%m-%dT%H:%M:%S")
+        df = pd.DataFrame(rows, columns=list(CANDLE_FIELDS), index=index).rename(columns=CANDLE_FIELDS)
+        df = df[~df.index.duplicated(keep="first")]
+        return df.sort_index()
+
+    @staticmethod
+    def _next_to(page):
+        return datetime.strptime(page[-1]["candle_date_time_utc"], "%Y-%m-%dT%H:%M:%S")
+
+    def get_ohlcv(self, ticker, interval="day", count=200, priority=SCAN):
+        """pyupbit.get_ohlcv 대체 (200개 넘으면 여러 번 나눠 조회, 실패 시 None)"""
+        try:
+            path = CANDLE_PATHS[interval]
+            to = datetime.now(timezone.utc).replace(tzinfo=None)
+            pages = []
+            for pos in range(max(count, 1), 0, -MAX_CANDLES):
+                page = self.fetch(path, self._candle_params(ticker, min(MAX_CANDLES, pos), to), "candles", priority)
+                if not page: break
+                pages.append(page)
+                to = self._next_to(page)
+            return self._candle_frame(pages)
+        except Exception:
+            return None
+
+    async def aget_ohlcv(self, ticker, interval="day", count=200, priority=SCAN):
+        """get_ohlcv()의 async 버전"""
+        try:
+            path = CANDLE_PATHS[interval]
+            to = datetime.now(timezone.utc).replace(tzinfo=None)
+            pages = []
+            for pos in range(max(count, 1), 0, -MAX_CANDLES):
+                page = await self.afetch(path, self._candle_params(ticker, min(MAX_CANDLES, pos), to), "candles", priority)
+                if not page: break
+                pages.append(page)
+                to = self._next_to(page)
+            return self._candle_frame(pages)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _prices(tickers, data):
+        prices = {row["market"]: row["trade_price"] for row in data}
+        return prices.get(tickers) if isinstance(tickers, str) else prices
+
+    def get_current_price(self, tickers, priority=LIVE):
+        """pyupbit.get_current_price 대체 (티커 1개면 float, 리스트면 {티커: 가격})"""
+        markets = tickers if isinstance(tickers, str) else ",".join(tickers)
+        return self._prices(tickers, self.fetch("ticker", {"markets": markets}, "ticker", priority))
+
+    async def aget_current_price(self, tickers, priority=LIVE):
+        markets = tickers if isinstance(tickers, str) else ",".join(tickers)
+        return self._prices(tickers, await self.afetch("ticker", {"markets": markets}, "ticker", priority))
+
+    @staticmethod
+    def _day_bars(data):
+        """ticker 응답 -> {티커: (일봉 시작 시각(KST naive, 캔들 인덱스와 동일), {open, high, low, close, volume, value})}"""
+        return {
+            row["market"]: (
+                datetime.strptime(row["trade_date"], "%Y%m%d") + KST,
+                {col: row[field] for field, col in TICKER_DAY_FIELDS.items()},
+            )
+            for row in data
+        }
+
+    def get_day_bars(self, tickers, priority=SCAN):
+        """진행 중인 일봉 전체(거래량 포함)를 티커 여러 개 한 번에 (일봉 캔들 1개씩 재조회하는 것과 같은 값, HTTP 1회)"""
+        return self._day_bars(self.fetch("ticker", {"markets": ",".join(tickers)}, "ticker", priority))
+
+    async def aget_day_bars(self, tickers, priority=SCAN):
+        return self._day_bars(await self.afetch("ticker", {"markets": ",".join(tickers)}, "ticker", priority))
+
+    def get_tickers(self, fiat="KRW", priority=SCAN):
+        """pyupbit.get_tickers 대체"""
+        data = self.fetch("market/all", {"isDetails": "false"}, "market", priority)
+        return [row["market"] for row in data if row["market"].startswith(f"{fiat}-")]
+
+    async def aget_tickers(self, fiat="KRW", priority=SCAN):
+        data = await self.afetch("market/all", {"isDetails": "false"}, "market", priority)
+        return [row["market"] for row in data if row["market"].startswith(f"{fiat}-")]
+
+
+# 전역 스케줄러 (프로세스 내 모든 REST 호출이 공유)
+rest = UpbitRestScheduler()
@@ -0,0 +1,71 @@
+import json
+import sys
+
+# =========================================================
+#  벤치마크 결과 비교 (benchmarks/run.py 출력 JSON 2개)
+#  - 케이스별 (새 값 / 기준 값) 비율 -> threshold 이상 느려지면 회귀로 표시
+#  - 회귀가 하나라도 있으면 종료 코드 1 (CI / 커밋 전 체크용)
+#  실행: python -m benchmarks.compare base.json new.json [--threshold 0.1] [--metric median_ms]
+# =========================================================
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(base, new, threshold=0.10, metric="median_ms", min_ms=0.0):
+    """
+    반환: [(케이스, 기준 ms, 새 ms, 비율, 상태)] / 상태: "REGRESSION" | "FASTER" | "ok" | "new" | "missing"
+    - min_ms: 기준 값이 이보다 작은 케이스는 타이머 노이즈로 보고 회귀 판정 제외
+    """
+    base_res, new_res = base["results"], new["results"]
+    rows = []
+    for key in sorted(set(base_res) | set(new_res)):
+        if key not in base_res:
+            rows.append((key, None, new_res[key][metric], None, "new"))
+            continue
+        if key not in new_res:
+            rows.append((key, base_res[key][metric], None, None, "missing"))
+            continue
+        a, b = base_res[key][metric], new_res[key][metric]
+        ratio = b / a if a > 0 else float("inf")
+        if a >= min_ms and ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 - threshold:
+            status = "FASTER"
+        else:
+            status = "ok"
+        rows.append((key, a, b, ratio, status))
+    return rows
+
+
+def report(rows, base_meta=None, new_meta=None):
+    if base_meta and new_meta:
+        print(f">>> 📊 [Bench] 기준 {base_meta.get('commit')} ({base_meta.get('timestamp')})"
+              f" -> 비교 {new_meta.get('commit')} ({new_meta.get('timestamp')})")
+    fmt = lambda x: "-" if x is None else f"{x:.3f}"
+    print(f"    {'case':<50} {'base ms':>10} {'new ms':>10} {'ratio':>7}  status")
+    for key, a, b, ratio, status in rows:
+        mark = "❌ " if status == "REGRESSION" else "✅ " if status == "FASTER" else ""
+        print(f"    {key:<50} {fmt(a):>10} {fmt(b):>10} {fmt(ratio):>7}  {mark}{status}")
+    regressions = [r for r in rows if r[4] == "REGRESSION"]
+    print(f">>> {'❌' if regressions else '✅'} [Bench] 회귀 {len(regressions)}건 / 전체 {len(rows)}건")
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교 (회귀 감지)")
+    parser.add_argument("base", help="기준 결과 JSON")
+    parser.add_argument("new", help="비교할 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀 판정 비율 (0.10 = 10%% 느려짐)")
+    parser.add_argument("--metric", default="median_ms", choices=["median_ms", "min_ms", "max_ms"])
+    parser.add_argument("--min-ms", type=float, default=0.0, help="기준 값이 이보다 작은 케이스는 판정 제외")
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    rows = compare(base, new, args.threshold, args.metric, args.min_ms)
+    regressions = report(rows, base.get("meta"), new.get("meta"))
+    sys.exit(1 if regressions else 0)
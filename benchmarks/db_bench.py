@@ -0,0 +1,146 @@
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+from app.core.database import ConnectionPool
+from app.core.trade_repository import TradeRepository
+from benchmarks.run import meta, save
+
+# =========================================================
+#  TradeRepository 초당 쿼리 수 (임시 DB 파일, 실제 coin_mate.db는 건드리지 않음)
+#  - before: 쿼리마다 sqlite3.connect + 이벤트 루프에서 동기 커밋 (기존 방식)
+#  - after: 쓰레드별 상주 연결 (ConnectionPool) + writer 쓰레드 배치 커밋 (DbWriter)
+#  - 읽기: open 거래 조회 (보유 장부 재구성 쿼리 - 루프 조회는 메모리 장부라 DB를 안 읽음)
+#  - 쓰기: log_buy + log_sell 왕복 (커밋 완료까지 / 큐에 넣기만 / 10건 묶음)
+#  실행: python -m benchmarks.db_bench [--seconds 1.0] [--open 10] [--closed 2000]
+# =========================================================
+
+SCHEMA = """
+CREATE TABLE trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, ticker TEXT, buy_price REAL, buy_amount REAL,
+    buy_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP, sell_price REAL, sell_time TIMESTAMP,
+    status TEXT DEFAULT 'open', profit_rate REAL, strategy_name TEXT, sell_reason TEXT
+)
+"""
+
+
+class ConnectPerQueryPool(ConnectionPool):
+    """기존 방식 재현: connection()마다 새 연결 (pragma / 문장 캐시 없음)"""
+
+    def connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = self.row_factory
+        return conn
+
+
+def make_db(path, n_open, n_closed):
+    with sqlite3.connect(path) as conn:
+        conn.execute(SCHEMA)
+        conn.execute("CREATE INDEX idx_trades_status_ticker ON trades (status, ticker)")
+        conn.executemany(
+            "INSERT INTO trades (ticker, buy_price, buy_amount, status, strategy_name) VALUES (?, ?, ?, ?, 'Bench')",
+            [(f"KRW-C{i}", 100.0 + i, 1.0, 'open' if i < n_open else 'closed') for i in range(n_open + n_closed)]
+        )
+
+
+def _qps(fn, seconds):
+    fn()  # 워밍업 (첫 연결 / prepare 제외)
+    count, started = 0, time.perf_counter()
+    while True:
+        fn()
+        count += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds: return round(count / elapsed, 1)
+
+
+def legacy_write(path):
+    """기존 방식 log_buy + log_sell (쓰기마다 connect / SELECT / 동기 커밋)"""
+    with sqlite3.connect(path) as conn:
+        cur = conn.execute(
+            "INSERT INTO trades (ticker, buy_price, buy_amount, buy_time, status, strategy_name) VALUES (?, ?, ?, ?, 'open', ?)",
+            ("KRW-BENCH", 100.0, 1.0, datetime.now(), "Bench")
+        )
+        conn.commit()
+        trade_id = cur.lastrowid
+    with sqlite3.connect(path) as conn:
+        buy_price = conn.execute("SELECT buy_price FROM trades WHERE id=?", (trade_id,)).fetchone()[0]
+        conn.execute(
+            "UPDATE trades SET status='closed', sell_price=?, sell_time=?, sell_reason=?, profit_rate=? WHERE id=?",
+            (101.0, datetime.now(), "bench", (101.0 - buy_price) / buy_price * 100, trade_id)
+        )
+        conn.commit()
+
+
+def cases(repo, mode):
+    """before: 쿼리마다 connect + 동기 쓰기 / after: ConnectionPool + DbWriter"""
+    if mode == "before":
+        write = lambda: legacy_write(repo.pool.path)
+        return {
+            "load_open_trades": repo.load_open_trades,
+            "log_buy+log_sell": write,
+            "log_buy+log_sell (no wait)": write,
+            "10x log_buy+log_sell": lambda: [write() for _ in range(10)],
+        }
+
+    def enqueue():
+        repo.log_buy("KRW-BENCH", 100.0, 1.0, "Bench")
+        repo.log_sell(repo.get_open_trade("KRW-BENCH")['id'], 101.0, "bench")
+
+    def durable(n):
+        for _ in range(n): enqueue()
+        repo.flush()
+
+    return {
+        "load_open_trades": repo.load_open_trades,
+        "log_buy+log_sell": lambda: durable(1),        # 커밋 완료까지
+        "log_buy+log_sell (no wait)": enqueue,          # 이벤트 루프가 막히는 시간 (큐에 넣기만)
+        "10x log_buy+log_sell": lambda: durable(10),    # 한 번에 쌓인 쓰기 -> 배치 커밋
+    }
+
+
+def run_db_benchmarks(seconds=1.0, n_open=10, n_closed=2000):
+    """{케이스: {before_qps, after_qps, speedup}}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        make_db(path, n_open, n_closed)
+        repo = TradeRepository(path)
+        repos = {"before": ConnectPerQueryPool(path), "after": ConnectionPool(path)}
+
+        for mode, pool in repos.items():
+            repo.pool = pool
+            with contextlib.redirect_stdout(io.StringIO()):  # log_buy / log_sell 출력 숨김
+                for name, fn in cases(repo, mode).items():
+                    results.setdefault(name, {})[f"{mode}_qps"] = _qps(fn, seconds)
+                repo.flush()
+        repos["after"].close_all()
+        repo.writer.close()
+
+    for name, res in results.items():
+        res["speedup"] = round(res["after_qps"] / res["before_qps"], 2)
+        print(f"    {name:<28} {res['before_qps']:>10.1f} -> {res['after_qps']:>10.1f} q/s  (x{res['speedup']})")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TradeRepository 초당 쿼리 수 (connect per query vs ConnectionPool + DbWriter)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="케이스당 측정 시간")
+    parser.add_argument("--open", type=int, default=10, help="보유(open) 거래 수")
+    parser.add_argument("--closed", type=int, default=2000, help="청산(closed) 거래 수")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본: benchmarks/results/bench_<시각>.json)")
+    args = parser.parse_args()
+
+    config = {"bench": "db", "seconds": args.seconds, "open": args.open, "closed": args.closed}
+    print(">>> ⏱️ [Bench] TradeRepository QPS (before -> after)")
+    results = run_db_benchmarks(args.seconds, args.open, args.closed)
+    save(results, meta(config), args.out)
@@ -0,0 +1,160 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+from app.services.backtester import Backtester
+from app.services.strategy import Strategy
+from benchmarks.synthetic import KINDS, make_ohlcv, make_universe
+
+# =========================================================
+#  Strategy / Backtester 벤치마크 (오프라인, 시드 고정 합성 데이터)
+#  - 이력 길이별로 get_ensemble_signal / 지표 헬퍼 / _simulate / 전 종목 스캔 시간 측정
+#  - 결과는 JSON (benchmarks/results/) -> benchmarks/compare.py로 이전 결과와 비교
+#  실행: python -m benchmarks.run [--lengths 100 200 500] [--tickers 200] [--repeat 5]
+# =========================================================
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_LENGTHS = (100, 200, 500)
+
+
+def _time(fn, repeat, number=1):
+    """fn을 number회 실행하는 측정을 repeat번 -> 1회당 ms 목록"""
+    fn()  # 워밍업 (lazy import / 캐시 생성 제외)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number * 1000)
+    return samples
+
+
+def _summary(samples, number):
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "max_ms": round(max(samples), 4),
+        "repeat": len(samples),
+        "number": number,
+    }
+
+
+def helper_cases(strategy, df):
+    """지표 헬퍼별 호출 (get_ensemble_signal 내부와 같은 입력)"""
+    o, h, l, c, v = (df[k] for k in ('open', 'high', 'low', 'close', 'volume'))
+    return {
+        "helper._calc_adx": lambda: strategy._calc_adx(df),
+        "helper._get_volume_signal": lambda: strategy._get_volume_signal(df),
+        "helper._sig_bollinger": lambda: strategy._sig_bollinger(c, o),
+        "helper._calc_vwap_signal": lambda: strategy._calc_vwap_signal(df),
+        "helper._calc_atr_series": lambda: strategy._calc_atr_series(h, l, c),
+        "helper._calc_atr_pandas": lambda: strategy._calc_atr_pandas(h, l, c),
+        "helper._calc_macd_score": lambda: strategy._calc_macd_score(c),
+        "helper._calc_rsi_pandas": lambda: strategy._calc_rsi_pandas(c),
+        "helper._calc_mfi_pandas": lambda: strategy._calc_mfi_pandas(h, l, c, v),
+    }
+
+
+def run_benchmarks(lengths=DEFAULT_LENGTHS, n_tickers=200, repeat=5, number=20, seed=0, scan=True):
+    """{케이스 이름: 측정 요약} (케이스 이름 = "L{길이}/{대상}[/{데이터 종류}]")"""
+    strategy = Strategy()
+    backtester = Backtester()
+    backtester.SCAN_MODE = "thread"  # 워커 수에 따라 흔들리지 않도록 단일 프로세스 경로만 측정
+
+    results = {}
+    for n in lengths:
+        print(f">>> ⏱️ [Bench] 이력 {n}봉")
+        for kind in KINDS:
+            df = make_ohlcv(kind, n, seed)
+            results[f"L{n}/get_ensemble_signal/{kind}"] = _summary(
+                _time(lambda: strategy.get_ensemble_signal(df, df), repeat, number), number
+            )
+            results[f"L{n}/_simulate/{kind}"] = _summary(
+                _time(lambda: backtester._simulate(df), repeat, max(1, number // 10)), max(1, number // 10)
+            )
+
+        df = make_ohlcv("random_walk", n, seed)
+        for name, fn in helper_cases(strategy, df).items():
+            results[f"L{n}/{name}"] = _summary(_time(fn, repeat, number), number)
+
+        if scan:
+            frames = make_universe(n_tickers, n, seed)
+
+            def full_scan():
+                backtester.results_cache = {}
+                with contextlib.redirect_stdout(io.StringIO()):
+                    backtester._analyze_frames(frames)
+
+            results[f"L{n}/scan_{n_tickers}"] = _summary(_time(full_scan, max(1, repeat // 2)), 1)
+
+        for key, res in results.items():
+            if key.startswith(f"L{n}/"):
+                print(f"    {key:<45} {res['median_ms']:>10.3f} ms")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def meta(args):
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "config": args,
+    }
+
+
+def save(results, info, path=None):
+    if path is None:
+        if not os.path.exists(RESULTS_DIR): os.makedirs(RESULTS_DIR)
+        path = os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"meta": info, "results": results}, f, ensure_ascii=False, indent=2)
+    print(f">>> 💾 [Bench] 결과 저장: {path}")
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Strategy / Backtester 벤치마크 (합성 데이터)")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(DEFAULT_LENGTHS), help="이력 길이 (봉 수)")
+    parser.add_argument("--tickers", type=int, default=200, help="스캔 벤치마크 종목 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20, help="측정 1회당 호출 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-scan", action="store_true", help="전 종목 스캔 측정 생략")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본: benchmarks/results/bench_<시각>.json)")
+    args = parser.parse_args()
+
+    config = {
+        "lengths": args.lengths, "tickers": args.tickers, "repeat": args.repeat,
+        "number": args.number, "seed": args.seed, "scan": not args.no_scan,
+    }
+    results = run_benchmarks(args.lengths, args.tickers, args.repeat, args.number, args.seed, scan=not args.no_scan)
+    save(results, meta(config), args.out)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+# =========================================================
+#  벤치마크용 합성 OHLCV (시드 고정 -> 항상 같은 데이터)
+#  - random_walk: 기하 랜덤워크
+#  - trending: 드리프트 + 랜덤워크
+#  - mean_reverting: OU 과정 (평균 회귀)
+#  - 거래량: 로그정규 + 가격 변동폭에 비례한 급증
+# =========================================================
+
+KINDS = ("random_walk", "trending", "mean_reverting")
+
+
+def _log_returns(kind, n, rng, vol):
+    if kind == "random_walk":
+        return rng.normal(0, vol, n)
+    if kind == "trending":
+        drift = rng.choice([-1, 1]) * vol * 0.3
+        return rng.normal(drift, vol, n)
+    if kind == "mean_reverting":
+        theta, level = 0.1, 0.0
+        x = np.empty(n)
+        prev = 0.0
+        for i, shock in enumerate(rng.normal(0, vol, n)):
+            prev = prev + theta * (level - prev) + shock
+            x[i] = prev
+        return np.diff(np.r_[0.0, x])
+    raise ValueError(f"알 수 없는 종류: {kind}")
+
+
+def make_ohlcv(kind="random_walk", n=200, seed=0, start_price=10000.0, vol=0.03, freq="D",
+               end="2026-01-01 09:00"):
+    """합성 캔들 1개 (pyupbit.get_ohlcv와 같은 컬럼 / 시간 인덱스)"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(_log_returns(kind, n, rng, vol)))
+    open_ = np.r_[start_price, close[:-1]] * (1 + rng.normal(0, vol / 6, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 3, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 3, n)))
+    move = np.abs(close / open_ - 1) / vol
+    volume = rng.lognormal(10, 0.8, n) * (1 + 2 * move)
+    index = pd.date_range(end=end, periods=n, freq=freq)
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume, "value": close * volume},
+        index=index,
+    )
+
+
+def make_universe(n_tickers=200, n=200, seed=0, freq="D"):
+    """{"KRW-SYN000": df, ...} - 종류는 티커마다 돌아가며 배정"""
+    return {
+        f"KRW-SYN{i:03d}": make_ohlcv(KINDS[i % len(KINDS)], n, seed * 100003 + i, freq=freq)
+        for i in range(n_tickers)
+    }
@@ -0,0 +1,105 @@
+"""
+CandleSeries / CandleBuilder
+- 봉 경계: 업비트와 같은 UTC 구간 (일봉 00:00 UTC = 인덱스 09:00 KST), 경계 시각 체결은 새 봉
+- 지난 봉에 늦게 도착한 체결은 무시 / 진행 봉 OHLCV 갱신
+- 시딩 (REST df -> 같은 인덱스 / 값), version, 재연결 시 stale
+"""
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from app.services.candle_builder import CandleBuilder, CandleSeries
+
+DAY = 86400
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def test_trades_within_bucket_update_ohlcv():
+    series = CandleSeries(3600, capacity=4)
+    start = utc(2025, 3, 1, 5)
+    assert series.update(start + 10, 100.0, 1.0)
+    assert not series.update(start + 20, 105.0, 2.0)
+    assert not series.update(start + 30, 95.0, 0.5)
+    assert not series.update(start + 3599.9, 101.0, 1.5)
+
+    df = series.frame()
+    assert list(df.index) == [pd.Timestamp(2025, 3, 1, 14)]  # 05:00 UTC -> 14:00 KST
+    assert df.iloc[0].tolist() == [100.0, 105.0, 95.0, 101.0, 5.0]
+
+
+@pytest.mark.parametrize("interval, ts, start", [
+    (60, utc(2025, 3, 1, 5, 30, 59), utc(2025, 3, 1, 5, 30)),
+    (3600, utc(2025, 3, 1, 5, 59, 59), utc(2025, 3, 1, 5)),
+    (DAY, utc(2025, 3, 1, 23, 59, 59), utc(2025, 3, 1)),   # KST 3/2 08:59 -> 아직 3/1 일봉
+    (DAY, utc(2025, 3, 2), utc(2025, 3, 2)),               # KST 09:00 정각 -> 새 일봉
+])
+def test_bucket_boundaries(interval, ts, start):
+    series = CandleSeries(interval)
+    series.update(ts, 1.0, 1.0)
+    assert series.times[0] == start
+
+
+def test_new_bucket_opens_bar_and_late_trade_is_dropped():
+    series = CandleSeries(DAY, capacity=3)
+    day1, day2 = utc(2025, 3, 1, 12), utc(2025, 3, 2, 0)
+    series.update(day1, 100.0, 1.0)
+    assert series.update(day2, 110.0, 2.0)          # 새 봉
+    assert not series.update(day2 - 1, 50.0, 9.0)   # 어제 봉에 늦게 온 체결 -> 무시
+
+    df = series.frame()
+    assert list(df.index) == [pd.Timestamp(2025, 3, 1, 9), pd.Timestamp(2025, 3, 2, 9)]
+    assert df["close"].tolist() == [100.0, 110.0]
+    assert df["volume"].tolist() == [1.0, 2.0]
+    assert df["low"].min() == 100.0
+
+
+def test_capacity_keeps_latest_bars_in_order():
+    series = CandleSeries(60, capacity=3)
+    for i in range(7):
+        series.update(utc(2025, 3, 1) + 60 * i, float(i), 1.0)
+    df = series.frame()
+    assert df["close"].tolist() == [4.0, 5.0, 6.0]
+    assert df.index.is_monotonic_increasing
+    assert series.frame(2)["close"].tolist() == [5.0, 6.0]
+
+
+def day_frame(n=5):
+    index = pd.date_range("2025-03-01 09:00", periods=n, freq="D")
+    return pd.DataFrame({
+        "open": range(n), "high": range(1, n + 1), "low": range(n), "close": range(n), "volume": [1.0] * n,
+    }, index=index, dtype=float)
+
+
+def test_builder_seed_round_trip_and_trade_flow():
+    builder = CandleBuilder(capacity=10)
+    builder.on_trade("KRW-A", utc(2025, 3, 1), 1.0, 1.0)   # 시딩 전 체결은 무시
+    assert builder.stats["ignored"] == 1
+    assert builder.needs_sync("KRW-A", ["day"])
+
+    df = day_frame()
+    builder.seed("KRW-A", {"day": df, "minute60": None})
+    assert builder.version("KRW-A") == 1
+    seeded = builder.frame("KRW-A", "day")
+    assert list(seeded.index) == list(df.index)
+    assert seeded.to_numpy().tolist() == df.to_numpy().tolist()
+    # 시딩 안 된 주기는 빈 배열 -> 재동기화 대상
+    assert builder.needs_sync("KRW-A", ["day", "minute60"]) and not builder.needs_sync("KRW-A", ["day"])
+
+    # 진행 중인 마지막 일봉(3/5) 갱신 -> 3/6 00:00 UTC 에 새 봉
+    builder.on_trade("KRW-A", utc(2025, 3, 5, 3), 9.0, 2.0)
+    builder.on_trade("KRW-A", utc(2025, 3, 6), 8.0, 1.0)
+    day = builder.frame("KRW-A", "day")
+    assert day.index[-1] == pd.Timestamp(2025, 3, 6, 9)
+    assert day.loc[pd.Timestamp(2025, 3, 5, 9)].tolist() == [4.0, 9.0, 4.0, 9.0, 3.0]
+    assert builder.stats["new_bars"] >= 1
+
+    builder.invalidate_all()
+    assert builder.needs_sync("KRW-A", ["day"])
+    builder.seed("KRW-A", {"day": df})
+    assert builder.version("KRW-A") == 2 and not builder.needs_sync("KRW-A", ["day"])
+    builder.drop("KRW-A")
+    assert builder.frame("KRW-A", "day") is None and builder.tickers() == []
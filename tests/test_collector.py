@@ -0,0 +1,110 @@
+"""
+Collector.handle_message (SIMPLE 축약 포맷, 웹소켓 연결 없이 원본 메시지 직접 주입)
+- ticker -> TickStore (거래소 ms 타임스탬프 -> 초), trade -> CandleBuilder
+- 깨진 JSON / 필드 누락 / 모르는 타입은 버림 (dropped)
+- 티커당 COALESCE_INTERVAL 안의 시세는 최신 값만 보류 -> flush()로 반영, 손절 레벨은 매 틱 검사
+"""
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from app.services.candle_builder import CandleBuilder  # noqa: E402
+from app.services.collector import Collector  # noqa: E402
+from app.services.exit_index import ExitIndex  # noqa: E402
+from app.services.tick_store import TickStore  # noqa: E402
+
+TS = datetime(2025, 3, 1, 5, tzinfo=timezone.utc).timestamp()
+
+
+def ticker_msg(code, price, ts_ms=TS * 1000, **extra):
+    msg = {"ty": "ticker", "cd": code, "tp": price, "atv24h": 12.5, "atp24h": 3400.0, "tms": ts_ms}
+    msg.update(extra)
+    return json.dumps(msg).encode()
+
+
+def trade_msg(code, price, volume, ts_ms):
+    return json.dumps({"ty": "trade", "cd": code, "tp": price, "tv": volume, "ttms": ts_ms}).encode()
+
+
+class Events:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, ticker, tick_ts=None):
+        self.published.append(ticker)
+
+
+@pytest.fixture
+def collector():
+    c = Collector(TickStore(capacity=16), CandleBuilder(capacity=10), Events(), ExitIndex())
+    c.COALESCE_INTERVAL = 0
+    return c
+
+
+def test_simple_ticker_goes_to_tick_store(collector):
+    data = collector.handle_message(ticker_msg("KRW-A", 101.5))
+    assert data["cd"] == "KRW-A"
+
+    latest = collector.shared_dict["KRW-A"]
+    assert latest["current_price"] == 101.5
+    assert latest["acc_trade_volume_24h"] == 12.5 and latest["acc_trade_price_24h"] == 3400.0
+    assert latest["exchange_timestamp"] == pytest.approx(TS)
+    assert collector.events.published == ["KRW-A"]
+    assert collector.stats["ticker"] == 1 and collector.stats["messages"] == 1
+
+
+def test_simple_trade_goes_to_candles(collector):
+    collector.candles.seed("KRW-A", {})
+    collector.handle_message(trade_msg("KRW-A", 100.0, 2.0, TS * 1000))
+    collector.handle_message(trade_msg("KRW-A", 104.0, 1.0, TS * 1000 + 500))
+
+    bar = collector.candles.frame("KRW-A", "minute60").iloc[-1]
+    assert bar.tolist() == [100.0, 104.0, 100.0, 104.0, 3.0]
+    assert collector.stats["trade"] == 2
+    assert "KRW-A" not in collector.shared_dict  # 체결은 시세 저장소에 쓰지 않음
+
+
+@pytest.mark.parametrize("raw", [
+    b"not json",
+    json.dumps({"ty": "ticker", "cd": "KRW-A"}).encode(),            # tp 누락
+    json.dumps({"ty": "ticker", "cd": "KRW-A", "tp": "abc"}).encode(),
+])
+def test_bad_messages_are_dropped(collector, raw):
+    assert collector.handle_message(raw) is None
+    assert collector.stats["dropped"] == 1
+    assert len(collector.shared_dict) == 0
+
+
+@pytest.mark.parametrize("raw", [
+    json.dumps({"ty": "orderbook", "cd": "KRW-A"}).encode(),
+    json.dumps({"type": "ticker", "code": "KRW-A", "trade_price": 1.0}).encode(),  # DEFAULT 필드명
+])
+def test_unknown_types_are_dropped(collector, raw):
+    assert collector.handle_message(raw) is not None  # 디코드는 성공
+    assert collector.stats["dropped"] == 1
+    assert collector.stats["ticker"] == collector.stats["trade"] == 0
+    assert "KRW-A" not in collector.shared_dict
+
+
+def test_coalescing_keeps_latest_and_flush_delivers(collector, monkeypatch):
+    collector.COALESCE_INTERVAL = 10
+    exit_checks = []
+    monkeypatch.setattr(collector.exits, "on_tick", lambda ticker, price: exit_checks.append(price))
+
+    for price in (100.0, 101.0, 102.0, 102.0):
+        collector.handle_message(ticker_msg("KRW-A", price))
+
+    # 첫 틱만 바로 반영, 나머지는 최신 값 1개로 보류
+    assert collector.shared_dict.latest_price("KRW-A") == 100.0
+    assert collector.stats["coalesced"] == 2 and len(collector.pending) == 1
+    # 손절 레벨 검사는 가격이 바뀐 틱마다
+    assert exit_checks == [100.0, 101.0, 102.0]
+
+    collector.flush(now=collector.delivered_at["KRW-A"] + 10)
+    assert collector.shared_dict.latest_price("KRW-A") == 102.0
+    assert collector.pending == {}
+    assert collector.events.published == ["KRW-A", "KRW-A"]
+    assert collector.report()["delivered"] == 2
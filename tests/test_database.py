@@ -0,0 +1,80 @@
+"""
+ConnectionPool / get_pool (임시 DB 파일)
+- 쓰레드당 연결 1개를 계속 재사용, 쓰레드끼리는 서로 다른 연결
+- PRAGMA(WAL 등) 적용, with 블록은 커밋 / 롤백만 하고 연결은 유지
+- close_thread / close_all 후에는 새 연결
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from app.core.database import ConnectionPool, get_pool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"))
+    yield pool
+    pool.close_all()
+
+
+def test_same_thread_reuses_connection(pool):
+    conn = pool.connection()
+    assert pool.connection() is conn
+    assert conn.row_factory is sqlite3.Row
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+def test_threads_get_their_own_connection(pool):
+    main = pool.connection()
+    seen = []
+
+    def worker():
+        seen.append(pool.connection())
+        seen.append(pool.connection())
+        pool.close_thread()
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert all(seen[i] is seen[i + 1] for i in range(0, 6, 2))
+    assert len({id(c) for c in seen}) == 3 and main not in seen
+    assert pool._conns == [main]  # 쓰레드 종료 시 닫은 연결은 목록에서 빠짐
+
+
+def test_with_block_commits_or_rolls_back_and_keeps_connection(pool):
+    conn = pool.connection()
+    with conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+    with pytest.raises(sqlite3.IntegrityError):
+        with conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            raise sqlite3.IntegrityError("rollback")
+
+    assert pool.connection() is conn
+    assert [r["v"] for r in conn.execute("SELECT v FROM t")] == [1]
+    # 다른 연결(다른 쓰레드)에서도 커밋된 값만 보임
+    result = []
+    thread = threading.Thread(target=lambda: result.extend(r[0] for r in pool.connection().execute("SELECT v FROM t")))
+    thread.start()
+    thread.join()
+    assert result == [1]
+
+
+def test_close_all_then_reconnect(pool):
+    conn = pool.connection()
+    pool.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert pool.connection() is not conn
+
+
+def test_get_pool_is_shared_per_path(tmp_path):
+    a, b = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    assert get_pool(a) is get_pool(a)
+    assert get_pool(a) is not get_pool(b)
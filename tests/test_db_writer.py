@@ -0,0 +1,73 @@
+"""
+DbWriter (임시 DB 파일)
+- close(): 큐에 남은 쓰기를 모두 커밋한 뒤 쓰레드 종료 -> 다른 연결에서 다시 읽힘
+- 배치 안의 잘못된 1건만 실패, 나머지는 커밋 / 닫힌 writer에 submit 하면 실패 Future
+"""
+import sqlite3
+
+import pytest
+
+from app.core import database
+from app.core.db_writer import DbWriter
+from app.core.trade_repository import TradeRepository
+
+INSERT = "INSERT INTO t (id, v) VALUES (?, ?)"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "writer.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    yield path
+    database.get_pool(path).close_all()
+
+
+def read_rows(path, table="t"):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+
+
+def test_close_commits_queued_writes(db_path):
+    writer = DbWriter(db_path)
+    futures = [writer.submit(INSERT, (i, f"row{i}")) for i in range(500)]
+    writer.close()
+
+    assert not writer.thread.is_alive()
+    assert all(f.done() and f.exception() is None for f in futures)
+    assert read_rows(db_path) == [(i, f"row{i}") for i in range(500)]
+    assert writer.stats["writes"] == 500
+
+
+def test_bad_write_fails_alone(db_path):
+    writer = DbWriter(db_path)
+    ok = writer.submit(INSERT, (1, "a"))
+    dup = writer.submit(INSERT, (1, "dup"))
+    after = writer.submit(INSERT, (2, "b"))
+    writer.close()
+
+    assert ok.result() and after.result()
+    with pytest.raises(sqlite3.IntegrityError):
+        dup.result()
+    assert read_rows(db_path) == [(1, "a"), (2, "b")]
+
+
+def test_submit_after_close_fails(db_path):
+    writer = DbWriter(db_path)
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit(INSERT, (1, "late")).result(1)
+
+
+def test_repository_close_persists_trades(tmp_path, monkeypatch):
+    path = str(tmp_path / "trades.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.init_db()
+    repo = TradeRepository(path)
+    for i in range(20):
+        repo.log_buy(f"KRW-{i}", 100.0 + i, 5000)
+    repo.close()  # 서버 종료(lifespan)와 같은 경로
+
+    rows = read_rows(path, "trades")
+    assert [(r[0], r[1], r[2]) for r in rows] == [(i + 1, f"KRW-{i}", 100.0 + i) for i in range(20)]
+    database.get_pool(path).close_all()
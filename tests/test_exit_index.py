@@ -0,0 +1,121 @@
+"""
+ExitIndex 가격 레벨 <-> 기존 process_selling 손절 / 트레일링 규칙
+(STOP_LOSS -3.0, TRAILING_START 2.0, TRAILING_CALLBACK 1.0)
+- check / on_tick 결과가 기존 수익률 / 최고가 계산과 같은 틱에서 같은 사유로 발동
+- sync: 새 보유 등록 / 청산된 보유 삭제 / 규칙 변경 시 재계산, arm: 매수가 없는 보유
+"""
+import numpy as np
+import pytest
+
+from app.services.exit_index import ExitIndex
+
+RULES = (-3.0, 2.0, 1.0)
+
+
+class LegacyExit:
+    """기존 process_selling 1~2단계 (최고가 갱신 -> 손절 -> 트레일링)"""
+
+    def __init__(self, buy_price):
+        self.buy_price = buy_price
+        self.peak = buy_price
+
+    def check(self, current):
+        stop_loss, trailing_start, trailing_callback = RULES
+        profit_rate = (current - self.buy_price) / self.buy_price * 100
+        if current > self.peak: self.peak = current
+        if profit_rate <= stop_loss: return "stop"
+        if profit_rate >= trailing_start:
+            drawdown_pct = (self.peak - current) / self.peak * 100
+            if drawdown_pct >= trailing_callback: return "trailing"
+            return "hold"  # 트레일링 구간 (지표 청산 건너뜀)
+        return ""
+
+
+def kind(reason):
+    if reason.startswith("💧손절방어"): return "stop"
+    if reason.startswith("📉트레일링스탑"): return "trailing"
+    return reason
+
+
+def held(index, trades):
+    index.sync(trades, *RULES)
+    return index
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_legacy_rules_on_random_paths(seed):
+    rng = np.random.default_rng(seed)
+    buy = float(rng.uniform(10, 10000))
+    prices = buy * np.exp(np.cumsum(rng.normal(0, 0.006, 400)))
+    index = held(ExitIndex(), [{"id": 1, "ticker": "KRW-A", "buy_price": buy}])
+    legacy = LegacyExit(buy)
+
+    for price in prices:
+        expected = legacy.check(price)
+        reason = index.check("KRW-A", price)
+        if expected == "hold":
+            assert reason == "" and index.in_trailing_zone("KRW-A", price)
+        else:
+            assert kind(reason) == expected
+            assert index.in_trailing_zone("KRW-A", price) == (expected == "trailing")
+        assert index.peak("KRW-A") == pytest.approx(legacy.peak)
+
+
+@pytest.mark.parametrize("price, expected", [
+    (97.0, "stop"),          # 정확히 -3%
+    (97.01, ""),
+    (101.99, ""),            # 트레일링 시작 전
+])
+def test_boundaries_from_buy_price(price, expected):
+    index = held(ExitIndex(), [{"id": 1, "ticker": "KRW-A", "buy_price": 100.0}])
+    assert kind(index.check("KRW-A", price)) == expected
+    assert LegacyExit(100.0).check(price) == expected
+
+
+def test_trailing_fires_on_callback_from_peak():
+    index = held(ExitIndex(), [{"id": 1, "ticker": "KRW-A", "buy_price": 100.0}])
+    assert index.check("KRW-A", 110.0) == ""
+    assert index.check("KRW-A", 109.0) == ""      # 피크 대비 -0.91%
+    reason = index.check("KRW-A", 108.9)          # 피크 대비 -1%
+    assert kind(reason) == "trailing" and "8.90%" in reason
+    # 수익률이 TRAILING_START 아래로 내려가면 트레일링 대신 지표 청산 구간
+    assert index.check("KRW-A", 101.5) == "" and not index.in_trailing_zone("KRW-A", 101.5)
+
+
+def test_on_tick_records_first_crossing_once():
+    index = held(ExitIndex(), [{"id": 7, "ticker": "KRW-A", "buy_price": 100.0}])
+    assert not index.on_tick("KRW-A", 99.0)
+    assert index.on_tick("KRW-A", 96.5)
+    assert not index.on_tick("KRW-A", 96.0)       # 이미 기록됨
+    assert not index.on_tick("KRW-B", 1.0)        # 보유 아님
+    triggered = index.pop_triggered()
+    assert list(triggered) == ["KRW-A"]
+    trade_id, price, reason = triggered["KRW-A"]
+    assert (trade_id, price, kind(reason)) == (7, 96.5, "stop")
+    # 꺼낸 뒤(매도 실패)에는 다음 교차 틱에서 다시 기록
+    assert index.pop_triggered() == {}
+    assert index.on_tick("KRW-A", 96.4)
+
+
+def test_sync_adds_drops_and_relevels():
+    index = held(ExitIndex(), [
+        {"id": 1, "ticker": "KRW-A", "buy_price": 100.0},
+        {"id": 2, "ticker": "KRW-B", "buy_price": 0},   # 매수가 없음 -> 등록 안 함
+    ])
+    assert index.peak("KRW-A") == 100.0 and index.peak("KRW-B") is None
+    index.check("KRW-A", 105.0)
+    index.on_tick("KRW-A", 50.0)
+
+    # 같은 거래 -> 최고가 유지, 규칙 변경 -> 레벨만 재계산
+    index.sync([{"id": 1, "ticker": "KRW-A", "buy_price": 100.0}], -5.0, 2.0, 1.0)
+    assert index.peak("KRW-A") == 105.0
+    assert index.check("KRW-A", 96.0) == ""
+    assert kind(index.check("KRW-A", 95.0)) == "stop"
+
+    # 같은 티커 새 거래 -> 새 레벨, 청산된 티커 -> 삭제 (기록된 교차도 같이)
+    index.sync([{"id": 3, "ticker": "KRW-C", "buy_price": 10.0}], *RULES)
+    assert index.peak("KRW-A") is None and index.pop_triggered() == {}
+    index.arm("KRW-B", 2, 20.0)
+    assert kind(index.check("KRW-B", 19.4)) == "stop"
+    index.disarm("KRW-B")
+    assert index.check("KRW-B", 1.0) == ""
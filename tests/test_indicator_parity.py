@@ -0,0 +1,313 @@
+"""
+NumPy 지표 커널(app/services/indicators.py) <-> 기존 pandas 구현 동일성 검증
+- LegacyStrategy: NumPy 이전 Strategy의 pandas 헬퍼/get_ensemble_signal 원본 그대로
+- 시드 고정 OHLCV + 거래량 0 구간 + 가격 횡보(완전 평탄) 구간 포함
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import indicators as ind
+from app.services.strategy import Strategy
+
+SEEDS = range(8)
+LENGTHS = (30, 45, 120, 200)
+TOL = dict(rtol=1e-9, atol=1e-9)
+
+
+def make_ohlcv(seed, n, zero_volume=True, flat=True):
+    """랜덤워크 OHLCV (거래량 0 구간 / 완전 평탄 구간을 중간에 삽입)"""
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * np.exp(rng.normal(0, 0.01, n))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, n))
+    volume = rng.lognormal(10, 1, n)
+    volume[rng.random(n) < 0.05] = 0.0
+
+    if zero_volume and n >= 40:
+        start = int(rng.integers(0, n - 15))
+        volume[start:start + 15] = 0.0
+    if flat and n >= 60:
+        start = int(rng.integers(n // 3, n - 25))
+        price = close[start - 1]
+        open_[start:start + 25] = high[start:start + 25] = price
+        low[start:start + 25] = close[start:start + 25] = price
+
+    idx = pd.date_range("2024-01-01 09:00", periods=n, freq="D")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume}, index=idx)
+
+
+def _frames():
+    for seed in SEEDS:
+        for n in LENGTHS:
+            yield pytest.param(make_ohlcv(seed, n), id=f"seed{seed}-n{n}")
+    # 처음부터 거래량 0 (누적 거래량 0 -> VWAP 분모 대체) / 전 구간 평탄
+    df = make_ohlcv(100, 80)
+    df.iloc[:35, df.columns.get_loc("volume")] = 0.0
+    yield pytest.param(df, id="leading-zero-volume")
+    df = make_ohlcv(101, 60, flat=False)
+    for col in ("open", "high", "low", "close"):
+        df[col] = 1234.0
+    yield pytest.param(df, id="all-flat")
+
+
+def frames():
+    return list(_frames())
+
+
+def flat_exact(s, period):
+    """
+    pandas rolling mean/std + 횡보 윈도우(값이 전부 같음)는 정의값(평균=그 값, std=0)
+    - pandas 온라인 분산은 평탄 구간에도 이전 값의 누적 오차(~1e-5)가 남아
+      종가 == 상단밴드 동점 판정이 오차 방향에 따라 갈림 -> 커널/증분 엔진은 정의값으로 고정
+    """
+    roll = s.rolling(period)
+    flat = roll.max() == roll.min()
+    return roll.mean().mask(flat, s), roll.std().mask(flat, 0.0)
+
+
+class LegacyStrategy(Strategy):
+    """NumPy 커널 도입 전 pandas 구현 (비교 기준)"""
+
+    def get_ensemble_signal(self, df_day, df_min=None, debug=False):
+        if df_day is None or len(df_day) < 30:
+            return None
+        if df_min is None or len(df_min) < 30:
+            df_min = df_day
+
+        day_close = df_day['close']
+        ma20_day = flat_exact(day_close, 20)[0].iloc[-1]
+        current_price = day_close.iloc[-1]
+
+        is_bull_market = current_price >= ma20_day
+        adx_signal = self._calc_adx(df_day)
+        vol_signal = self._get_volume_signal(df_day)
+
+        closes = df_min['close']
+        opens = df_min['open']
+        highs = df_min['high']
+        lows = df_min['low']
+        volumes = df_min['volume']
+
+        rsi_val = self._calc_rsi_pandas(closes).iloc[-1]
+        mfi_val = self._calc_mfi_pandas(highs, lows, closes, volumes).iloc[-1]
+        vwap_signal = self._calc_vwap_signal(df_min)
+        bollinger_score = self._sig_bollinger(closes, opens)
+        atr_value = self._calc_atr_pandas(highs, lows, closes)
+        macd_score = self._calc_macd_score(closes)
+
+        # 채점은 build_signal과 동일 (지표 계산 경로만 비교)
+        return self.build_signal(current_price, is_bull_market, adx_signal, vol_signal,
+                                 rsi_val, mfi_val, vwap_signal, bollinger_score, atr_value, macd_score,
+                                 debug=debug)
+
+    def _calc_adx(self, df, n=14):
+        if len(df) < n * 2: return 0
+        high, low, close = df['high'], df['low'], df['close']
+
+        up_move = high.diff()
+        down_move = -low.diff()
+        pdm = pd.Series(np.where((up_move > down_move) & (up_move > 0), up_move, 0.0), index=df.index)
+        mdm = pd.Series(np.where((down_move > up_move) & (down_move > 0), down_move, 0.0), index=df.index)
+
+        tr = self._calc_atr_series(high, low, close)
+        tr_smooth = tr.ewm(alpha=1/n, min_periods=n).mean().replace(0, 0.0001)
+        pdm_smooth = pdm.ewm(alpha=1/n, min_periods=n).mean()
+        mdm_smooth = mdm.ewm(alpha=1/n, min_periods=n).mean()
+
+        pdi = 100 * (pdm_smooth / tr_smooth)
+        mdi = 100 * (mdm_smooth / tr_smooth)
+        div = (pdi + mdi).replace(0, 0.0001)
+        dx = (abs(pdi - mdi) / div) * 100
+        adx = dx.ewm(alpha=1/n, min_periods=n).mean()
+
+        if adx.iloc[-1] >= 20 and pdi.iloc[-1] > mdi.iloc[-1]:
+            return 1
+        return 0
+
+    def _get_volume_signal(self, df):
+        volume, close, open_p = df['volume'], df['close'], df['open']
+        if len(volume) < 20: return 0
+        vol_ma20 = volume.rolling(20).mean().iloc[-1]
+        if volume.iloc[-1] > (vol_ma20 * 1.5) and close.iloc[-1] > open_p.iloc[-1]:
+            return 1
+        return 0
+
+    def _sig_bollinger(self, closes, opens, period=20, k=2, threshold=1.02):
+        if len(closes) < period: return 0
+        ma, std = flat_exact(closes, period)
+        curr_upper = (ma + (std * k)).iloc[-1]
+        curr_lower = (ma - (std * k)).iloc[-1]
+        curr_price, curr_open, prev_price = closes.iloc[-1], opens.iloc[-1], closes.iloc[-2]
+
+        if np.isnan(curr_lower) or np.isnan(curr_upper): return 0
+        is_near_lower = curr_price <= (curr_lower * threshold)
+        is_rebounding = (curr_price > prev_price) and (curr_price >= curr_open)
+        if is_near_lower and is_rebounding:
+            return 1
+        if curr_price >= curr_upper:
+            return -1
+        return 0
+
+    def _calc_vwap_signal(self, df):
+        v = df['volume']
+        tp = (df['high'] + df['low'] + df['close']) / 3
+        vwap = (tp * v).cumsum() / v.cumsum().replace(0, 1)
+        return 1 if df['close'].iloc[-1] > vwap.iloc[-1] else 0
+
+    def _calc_atr_series(self, high, low, close):
+        prev_close = close.shift(1)
+        return pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+
+    def _calc_atr_pandas(self, highs, lows, closes, period=14):
+        tr = self._calc_atr_series(highs, lows, closes)
+        return tr.rolling(period).mean().iloc[-1] if not pd.isna(tr.iloc[-1]) else 0
+
+    def _calc_macd_score(self, closes):
+        macd_line = closes.ewm(span=12, adjust=False).mean() - closes.ewm(span=26, adjust=False).mean()
+        signal_line = macd_line.ewm(span=9, adjust=False).mean()
+        curr, sig = macd_line.iloc[-1], signal_line.iloc[-1]
+        if curr > sig: return 1
+        elif curr < sig: return -1
+        return 0
+
+    def _calc_rsi_pandas(self, closes, period=14):
+        delta = closes.diff()
+        gain = delta.where(delta > 0, 0).ewm(alpha=1/period, min_periods=period).mean()
+        loss = -delta.where(delta < 0, 0).ewm(alpha=1/period, min_periods=period).mean()
+        rs = gain / loss.replace(0, 0.0001)
+        return (100 - (100 / (1 + rs))).ffill().fillna(50)
+
+    def _calc_mfi_pandas(self, highs, lows, closes, volumes, period=14):
+        tp = (highs + lows + closes) / 3
+        mf = tp * volumes
+        pos_flow = pd.Series(0.0, index=closes.index)
+        neg_flow = pd.Series(0.0, index=closes.index)
+        delta = tp.diff()
+        pos_flow[delta > 0] = mf[delta > 0]
+        neg_flow[delta < 0] = mf[delta < 0]
+        pos_sum = pos_flow.rolling(period).sum()
+        neg_sum = neg_flow.rolling(period).sum().replace(0, 0.0001)
+        return (100 - (100 / (1 + (pos_sum / neg_sum)))).fillna(50)
+
+
+legacy = LegacyStrategy()
+strategy = Strategy()
+
+
+def arrays(df):
+    return {c: df[c].to_numpy(dtype=float) for c in ("open", "high", "low", "close", "volume")}
+
+
+def assert_series(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), equal_nan=True, **TOL)
+
+
+def assert_signal(actual, expected):
+    """결과 dict 비교: 신호/점수/가격은 정확히, 연속값(RSI/MFI)은 합산 순서 차이(ulp)만 허용"""
+    if expected is None:
+        assert actual is None
+        return
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if key in ("rsi", "mfi"):
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+        else:
+            assert actual[key] == value, key
+
+
+# --- 커널 단위 (전체 시계열) ---
+
+@pytest.mark.parametrize("df", frames())
+def test_series_kernels(df):
+    a = arrays(df)
+    h, l, c, v = a['high'], a['low'], a['close'], a['volume']
+
+    assert_series(ind.true_range(h, l, c), legacy._calc_atr_series(df['high'], df['low'], df['close']))
+    assert_series(ind.atr(h, l, c), legacy._calc_atr_series(df['high'], df['low'], df['close']).rolling(14).mean())
+    assert_series(ind.rsi(c), legacy._calc_rsi_pandas(df['close']))
+    assert_series(ind.mfi(h, l, c, v), legacy._calc_mfi_pandas(df['high'], df['low'], df['close'], df['volume']))
+    ma, std = flat_exact(df['close'], 20)
+    assert_series(ind.rolling_mean(c, 20), ma)
+    assert_series(ind.rolling_std(c, 20), std)
+    # 평탄 구간 밖은 pandas 원래 값 그대로
+    assert_series(ind.rolling_mean(v, 20), df['volume'].rolling(20).mean())
+
+    tp = (df['high'] + df['low'] + df['close']) / 3
+    assert_series(ind.vwap(h, l, c, v), (tp * df['volume']).cumsum() / df['volume'].cumsum().replace(0, 1))
+
+    macd_line, signal_line = ind.macd(c)
+    exp = df['close'].ewm(span=12, adjust=False).mean() - df['close'].ewm(span=26, adjust=False).mean()
+    assert_series(macd_line, exp)
+    assert_series(signal_line, exp.ewm(span=9, adjust=False).mean())
+
+
+@pytest.mark.parametrize("adjust", (True, False))
+@pytest.mark.parametrize("min_periods", (0, 14))
+def test_ewm_mean_matches_pandas(adjust, min_periods):
+    x = make_ohlcv(7, 120)['close'].to_numpy().copy()
+    x[10:13] = np.nan
+    s = pd.Series(x)
+    assert_series(ind.ewm_mean(x, alpha=1/14, adjust=adjust, min_periods=min_periods),
+                  s.ewm(alpha=1/14, adjust=adjust, min_periods=min_periods).mean())
+    assert_series(ind.ewm_mean(x, span=12, adjust=adjust, min_periods=min_periods),
+                  s.ewm(span=12, adjust=adjust, min_periods=min_periods).mean())
+
+
+# --- 신호 단위 (매 시점: 접두 구간마다 기존 헬퍼와 비교) ---
+
+@pytest.mark.parametrize("df", frames())
+def test_signal_kernels_every_bar(df):
+    a = arrays(df)
+    h, l, c, o, v = a['high'], a['low'], a['close'], a['open'], a['volume']
+    adx_sig = ind.adx_signal(h, l, c)
+    vol_sig = ind.volume_signal(v, c, o)
+    bb_sig = ind.bollinger_signal(c, o)
+    vwap_sig = ind.vwap_signal(h, l, c, v)
+    macd_sig = ind.macd_score(c)
+
+    for i in range(2, len(df)):
+        part = df.iloc[:i + 1]
+        assert adx_sig[i] == legacy._calc_adx(part), i
+        if i + 1 >= 20:
+            assert vol_sig[i] == legacy._get_volume_signal(part), i
+        assert bb_sig[i] == legacy._sig_bollinger(part['close'], part['open']), i
+        assert vwap_sig[i] == legacy._calc_vwap_signal(part), i
+        assert macd_sig[i] == legacy._calc_macd_score(part['close']), i
+
+
+# --- 전체 결과 dict ---
+
+@pytest.mark.parametrize("df", frames())
+def test_ensemble_signal_matches_legacy(df):
+    for end in range(30, len(df) + 1, 5):
+        part = df.iloc[:end]
+        assert_signal(strategy.get_ensemble_signal(part), legacy.get_ensemble_signal(part))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_ensemble_signal_with_minute_frame(seed):
+    df_day = make_ohlcv(seed, 60)
+    df_min = make_ohlcv(seed + 1000, 200)
+    assert_signal(strategy.get_ensemble_signal(df_day, df_min), legacy.get_ensemble_signal(df_day, df_min))
+    # 분봉 30개 미만이면 일봉으로 대체
+    assert_signal(strategy.get_ensemble_signal(df_day, df_min.iloc[:20]), legacy.get_ensemble_signal(df_day))
+
+
+def test_short_frame_returns_none():
+    df = make_ohlcv(0, 29)
+    assert strategy.get_ensemble_signal(df) is None
+    assert legacy.get_ensemble_signal(df) is None
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_score_series_matches_legacy_rows(seed):
+    df = make_ohlcv(seed, 120)
+    series = strategy.score_series(df)
+    for end in range(30, len(df) + 1, 7):
+        expected = legacy.get_ensemble_signal(df.iloc[:end])
+        assert series['score'].iloc[end - 1] == expected['score'], end
+        assert bool(series['should_buy'].iloc[end - 1]) == expected['should_buy'], end
@@ -0,0 +1,104 @@
+"""
+PriceEventQueue / LatencyStats
+- 같은 티커 변경은 처리 전까지 1건으로 합침 (첫 틱 시각 유지), 루프 깨우기는 배치당 1번
+- watch 집합 밖 티커 / 루프 연결 전 알림은 버림, 다른 쓰레드 publish로 get()이 깨어남
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.price_events import LatencyStats, PriceEventQueue
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_publish_before_bind_is_dropped():
+    events = PriceEventQueue()
+    events.publish("KRW-A", 1.0)
+    assert events.stats["published"] == 0
+
+    async def scenario():
+        events.bind()
+        return await events.get(timeout=0.05)
+    assert run(scenario()) == {}
+
+
+def test_coalesces_per_ticker_and_keeps_first_tick():
+    async def scenario():
+        events = PriceEventQueue()
+        events.bind()
+        wakes = []
+        real_call = events.loop.call_soon_threadsafe
+        events.loop.call_soon_threadsafe = lambda cb: (wakes.append(cb), real_call(cb))
+        for ts in (1.0, 2.0, 3.0):
+            events.publish("KRW-A", ts)
+        events.publish("KRW-B", 4.0)
+        first = await events.get(timeout=1)
+        events.publish("KRW-A", 5.0)
+        second = await events.get(timeout=1)
+        return events, wakes, first, second
+
+    events, wakes, first, second = run(scenario())
+    assert first == {"KRW-A": 1.0, "KRW-B": 4.0}
+    assert second == {"KRW-A": 5.0}
+    assert len(wakes) == 2  # 배치마다 1번
+    assert events.stats == {"published": 5, "coalesced": 2, "batches": 2}
+
+
+def test_watch_filters_tickers():
+    async def scenario():
+        events = PriceEventQueue()
+        events.bind()
+        events.watch({"KRW-A"})
+        events.publish("KRW-B", 1.0)
+        events.add_watch("KRW-C")
+        events.publish("KRW-C", 2.0)
+        events.publish("KRW-A", 3.0)
+        batch = await events.get(timeout=1)
+        events.watch(None)
+        events.publish("KRW-B", 4.0)
+        return batch, await events.get(timeout=1)
+
+    assert run(scenario()) == ({"KRW-C": 2.0, "KRW-A": 3.0}, {"KRW-B": 4.0})
+
+
+def test_publish_from_other_thread_wakes_get():
+    async def scenario():
+        events = PriceEventQueue()
+        events.bind()
+        timer = threading.Timer(0.1, events.publish, args=("KRW-A",))
+        started = time.monotonic()
+        timer.start()
+        batch = await events.get(timeout=5)
+        return batch, time.monotonic() - started
+
+    batch, waited = run(scenario())
+    assert list(batch) == ["KRW-A"]
+    assert waited < 2
+
+
+def test_get_times_out_with_empty_batch():
+    async def scenario():
+        events = PriceEventQueue()
+        events.bind()
+        started = time.monotonic()
+        batch = await events.get(timeout=0.1)
+        return batch, time.monotonic() - started
+
+    batch, waited = run(scenario())
+    assert batch == {} and waited >= 0.09
+
+
+def test_latency_summary():
+    stats = LatencyStats(maxlen=100)
+    assert stats.summary() == {"count": 0}
+    for i in range(1, 201):
+        stats.add(i / 1000)
+    summary = stats.summary()
+    assert summary["count"] == 200  # 누적 수
+    assert summary["max_ms"] == 200.0
+    assert summary["p50_ms"] == pytest.approx(150.5)  # 최근 100개(101~200ms)만 분위수에 사용
@@ -0,0 +1,68 @@
+"""
+TickRing / TickStore
+- 링 버퍼: 용량을 넘기면 가장 오래된 틱부터 덮어쓰고, 최근 n틱은 오래된 순 연속 뷰(복사 없음)
+- 기존 shared_dict 호환 (in / [] / get / items / 대입) 과 최신값 조회
+"""
+import numpy as np
+import pytest
+
+from app.services.tick_store import FIELDS, TickRing, TickStore
+
+
+@pytest.mark.parametrize("pushes", [0, 1, 3, 4, 5, 11])
+def test_ring_last_matches_tail_of_history(pushes):
+    ring = TickRing(capacity=4)
+    history = [(float(i),) * len(FIELDS) for i in range(pushes)]
+    for row in history:
+        ring.push(row)
+
+    assert len(ring) == min(pushes, 4)
+    for n in (None, 1, 2, 4, 10):
+        expected = history[-min(n or 4, 4):] if pushes else []
+        view = ring.last(n)
+        assert view.shape == (len(FIELDS), len(expected))
+        assert view.T.tolist() == [list(r) for r in expected]
+    assert ring.latest() == (history[-1][0] if pushes else 0.0)
+
+
+def test_ring_last_is_a_view():
+    ring = TickRing(capacity=3)
+    for i in range(5):
+        ring.push([i] * len(FIELDS))
+    view = ring.last(3)
+    assert np.shares_memory(view, ring.data)
+    assert view[0].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_store_latest_and_fields():
+    store = TickStore(capacity=8)
+    assert "KRW-A" not in store and store.latest_price("KRW-A") == 0.0 and store.last("KRW-A") is None
+    store.push("KRW-A", 100.0, 1.0, 2.0, recv_ts=10.0)
+    store.push("KRW-A", 101.0, 3.0, 4.0, exchange_ts=11.0, recv_ts=11.5)
+
+    assert store.latest_price("KRW-A") == 101.0
+    assert store["KRW-A"] == {
+        "current_price": 101.0, "acc_trade_volume_24h": 3.0, "acc_trade_price_24h": 4.0,
+        "timestamp": 11.5, "exchange_timestamp": 11.0,
+    }
+    last = store.last("KRW-A")
+    assert set(last) == set(FIELDS)
+    assert last["price"].tolist() == [100.0, 101.0]
+    assert last["exchange_ts"].tolist() == [10.0, 11.0]  # 거래소 시각이 없으면 수신 시각
+
+
+def test_store_dict_compat():
+    store = TickStore(capacity=2)
+    store["KRW-A"] = {"current_price": 5, "acc_trade_volume_24h": 1, "timestamp": 3.0}
+    store.push("KRW-B", 7.0)
+    for price in (8.0, 9.0, 10.0):
+        store.push("KRW-B", price)
+
+    assert sorted(store) == ["KRW-A", "KRW-B"] and len(store) == 2
+    assert store.get("KRW-C", "none") == "none"
+    assert store.get("KRW-A")["timestamp"] == 3.0
+    assert dict(store.items())["KRW-B"]["current_price"] == 10.0
+    with pytest.raises(KeyError):
+        store["KRW-C"]
+    # 메모리는 틱 수와 무관하게 티커 수 x 용량으로 고정
+    assert store.memory_bytes() == 2 * len(FIELDS) * 2 * 2 * 8
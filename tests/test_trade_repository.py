@@ -0,0 +1,78 @@
+"""
+TradeRepository <-> PositionBook <-> DbWriter (임시 DB 파일)
+- 장부는 쓰기 예약 때 먼저 갱신, 커밋되면 DB와 일치
+- 커밋 실패(테이블 없음) 시 Future 콜백이 장부 변경 / 발급한 id를 되돌림
+"""
+import sqlite3
+
+import pytest
+
+from app.core import database
+from app.core.db_writer import get_writer
+from app.core.trade_repository import TradeRepository
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "trades.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.init_db()
+    yield path
+    get_writer(path).close()
+    database.get_pool(path).close_all()
+
+
+def open_rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT id, ticker FROM trades WHERE status='open' ORDER BY id").fetchall()
+
+
+def break_table(path):
+    """이후 쓰기가 모두 실패하도록 trades 테이블 이름 변경"""
+    with sqlite3.connect(path) as conn:
+        conn.execute("ALTER TABLE trades RENAME TO trades_moved")
+
+
+def test_book_matches_db_after_commit(db_path):
+    repo = TradeRepository(db_path)
+    repo.log_buy("KRW-A", 100.0, 5000, "S1").result(5)
+    repo.log_buy("KRW-B", 200.0, 5000).result(5)
+    first = repo.get_open_trade("KRW-A")["id"]
+    repo.log_sell(first, 110.0).result(5)
+
+    assert open_rows(db_path) == [(2, "KRW-B")]
+    assert repo.get_all_open_tickers() == ["KRW-B"]
+    assert repo.get_trade_count() == 1
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT profit_rate FROM trades WHERE id=?", (first,)).fetchone()[0] == pytest.approx(10.0)
+
+
+def test_failed_buy_rolls_back_book_and_id(db_path):
+    repo = TradeRepository(db_path)
+    repo.log_buy("KRW-A", 100.0, 5000).result(5)
+    break_table(db_path)
+
+    future = repo.log_buy("KRW-B", 100.0, 5000)
+    with pytest.raises(sqlite3.Error):
+        future.result(5)
+    assert not repo.is_holding("KRW-B")
+    assert repo.get_trade_count() == 1
+    assert repo.last_id == 1  # 마지막 발급분이라 반납
+
+
+def test_failed_sell_and_zombie_close_restore_positions(db_path):
+    repo = TradeRepository(db_path)
+    for ticker in ("KRW-A", "KRW-A", "KRW-B"):
+        repo.log_buy(ticker, 100.0, 5000, "S1").result(5)
+    break_table(db_path)
+
+    with pytest.raises(sqlite3.Error):
+        repo.log_sell(1, 120.0).result(5)
+    with pytest.raises(sqlite3.Error):
+        repo.close_zombie_trade(3).result(5)
+
+    assert repo.get_trade_count() == 3
+    # 되돌린 포지션도 같은 티커 안에서 오래된 것(id 오름차순)이 먼저
+    assert repo.get_open_trade("KRW-A")["id"] == 1
+    assert repo.get_open_trade("KRW-B") == {"id": 3, "ticker": "KRW-B", "buy_price": 100.0,
+                                            "buy_amount": 5000, "strategy_name": "S1"}
@@ -0,0 +1,118 @@
+"""
+UpbitClient 잔고 TTL 캐시 (가짜 pyupbit.Upbit 주입, 네트워크 없음)
+- TTL 안에서는 get_balances 재호출 없음, max_age=0 이면 새로 조회
+- 모든 주문(매수 / 매도, 성공 / 실패 / 예외) 직후 invalidate_balances -> 다음 조회는 REST
+- 동시에 만료를 본 쓰레드들은 조회 1번만 (single-flight)
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pyupbit")
+pytest.importorskip("dotenv")
+
+from app.services.upbit_client import UpbitClient  # noqa: E402
+
+REMAINING = {"group": "default", "min": 1000, "sec": 30}
+
+
+class FakeUpbit:
+    def __init__(self, order_result="ok", delay=0.0):
+        self.balance_calls = 0
+        self.orders = []
+        self.order_result = order_result
+        self.delay = delay
+        self.krw = 10000.0
+
+    def get_balances(self, contain_req=False):
+        self.balance_calls += 1
+        if self.delay: time.sleep(self.delay)
+        balances = [
+            {"currency": "KRW", "balance": str(self.krw), "locked": "0"},
+            {"currency": "BTC", "balance": "0.5", "locked": "0.25"},
+        ]
+        return (balances, REMAINING) if contain_req else balances
+
+    def _order(self, *args, contain_req=False):
+        self.orders.append(args)
+        if isinstance(self.order_result, Exception): raise self.order_result
+        return (self.order_result, REMAINING) if contain_req else self.order_result
+
+    def buy_market_order(self, ticker, price, contain_req=False):
+        return self._order(ticker, price, contain_req=contain_req)
+
+    def sell_market_order(self, ticker, volume, contain_req=False):
+        return self._order(ticker, volume, contain_req=contain_req)
+
+
+def make_client(**kwargs):
+    client = UpbitClient()
+    client.upbit = FakeUpbit(**kwargs)
+    return client
+
+
+def test_ttl_serves_snapshot_and_max_age_zero_refetches():
+    client = make_client()
+    assert client.get_balance("KRW") == 10000.0
+    assert client.get_balance("KRW-BTC") == 0.75  # balance + locked
+    assert client.get_balance("KRW-XRP") == 0
+    assert client.upbit.balance_calls == 1
+    assert client.balance_stats == {"hits": 2, "fetches": 1}
+
+    client.upbit.krw = 5.0
+    assert client.get_balance("KRW", max_age=0) == 5.0
+    assert client.upbit.balance_calls == 2
+
+    client.BALANCE_TTL = 0.05
+    time.sleep(0.06)
+    client.get_balances()
+    assert client.upbit.balance_calls == 3
+
+
+@pytest.mark.parametrize("side", ["buy", "sell"])
+@pytest.mark.parametrize("order_result", ["ok", None, RuntimeError("boom")])
+def test_every_order_invalidates_balances(side, order_result):
+    client = make_client(order_result=order_result)
+    client.get_balance("KRW")
+    client.upbit.krw = 1.0
+
+    if side == "buy":
+        result = client.buy_market_order("KRW-BTC", 6000)
+    else:
+        result = client.sell_market_order("KRW-BTC", 0.1)
+    assert result == (order_result if order_result == "ok" else None)
+    assert len(client.upbit.orders) == 1
+
+    # TTL이 남아 있어도 주문 뒤 첫 조회는 REST
+    assert client.get_balance("KRW") == 1.0
+    assert client.upbit.balance_calls == 2
+
+
+def test_order_below_minimum_is_not_sent():
+    client = make_client()
+    assert client.buy_market_order("KRW-BTC", 4999) is None
+    assert client.upbit.orders == []
+
+
+def test_fetch_started_before_invalidation_is_stale():
+    client = make_client(delay=0.2)
+    reader = threading.Thread(target=client.get_balance, args=("KRW",))
+    reader.start()
+    time.sleep(0.05)
+    client.invalidate_balances()  # 조회 도중 주문
+    reader.join()
+    client.upbit.delay = 0
+    client.get_balance("KRW")
+    assert client.upbit.balance_calls == 2
+
+
+def test_concurrent_expired_reads_fetch_once():
+    client = make_client(delay=0.1)
+    client.invalidate_balances()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get_balance("KRW"))) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert results == [10000.0] * 8
+    assert client.upbit.balance_calls == 1
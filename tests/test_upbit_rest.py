@@ -0,0 +1,182 @@
+"""
+UpbitRestScheduler <-> 가짜 업비트 HTTP 서버 (http.server, 로컬 쓰레드)
+- 캔들 페이지 분할 / 현재가 / 티커 목록 / 진행 중인 일봉 응답 파싱
+- 토큰 버킷 속도 제한, Remaining-Req 헤더 반영, 429 재시도, 우선순위 양보
+"""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.services.upbit_rest import LIVE, SCAN, TooManyRequests, UpbitRestScheduler, parse_remaining
+
+FIRST_DAY = datetime(2025, 1, 1)  # 가짜 서버의 상장일 (이전 봉 없음)
+
+
+class FakeUpbit(BaseHTTPRequestHandler):
+    state = {"hits": [], "too_many": 0, "sec": None}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.state["hits"].append((time.time(), url.path, query.get("market") or query.get("markets")))
+
+        if self.state["too_many"] > 0:
+            self.state["too_many"] -= 1
+            self.send_response(429)
+            self.end_headers()
+            self.wfile.write(b"Too many API requests.")
+            return
+
+        if url.path == "/v1/candles/days":
+            body, group = self._day_candles(query), "candles"
+        elif url.path == "/v1/ticker":
+            body, group = self._tickers(query["markets"].split(",")), "ticker"
+        else:
+            body, group = [{"market": "KRW-BTC"}, {"market": "BTC-ETH"}, {"market": "KRW-ETH"}], "market"
+
+        sec = self.state["sec"] if self.state["sec"] is not None else 9
+        self.send_response(200)
+        self.send_header("Remaining-Req", f"group={group}; min=500; sec={sec}")
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    @staticmethod
+    def _day_candles(query):
+        """to 이전 봉부터 최신순 count개 (업비트와 같은 순서 / 필드)"""
+        to = datetime.strptime(query["to"], "%Y-%m-%d %H:%M:%S")
+        start = to.replace(hour=0, minute=0, second=0)
+        if start == to: start -= timedelta(days=1)
+        rows = []
+        for i in range(int(query["count"])):
+            day = start - timedelta(days=i)
+            if day < FIRST_DAY: break
+            price = 100 + (day - FIRST_DAY).days
+            rows.append({
+                "candle_date_time_utc": day.strftime("%Y-%m-%dT%H:%M:%S"),
+                "candle_date_time_kst": (day + timedelta(hours=9)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "opening_price": price, "high_price": price + 1, "low_price": price - 1, "trade_price": price + 0.5,
+                "candle_acc_trade_volume": 1.0, "candle_acc_trade_price": price,
+            })
+        return rows
+
+    @staticmethod
+    def _tickers(markets):
+        return [{
+            "market": m, "trade_date": "20250301", "opening_price": 10.0, "high_price": 12.0,
+            "low_price": 9.0, "trade_price": 1.5, "acc_trade_volume": 42.0, "acc_trade_price": 420.0,
+        } for m in markets]
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeUpbit)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_server():
+    FakeUpbit.state.update(hits=[], too_many=0, sec=None)
+
+
+def test_parse_remaining():
+    assert parse_remaining("group=candles; min=1799; sec=9") == {"group": "candles", "min": 1799, "sec": 9}
+    assert parse_remaining("garbage") is None
+    assert parse_remaining(None) is None
+
+
+def test_get_ohlcv_pages_over_200(base_url):
+    rest = UpbitRestScheduler(base_url)
+    df = rest.get_ohlcv("KRW-BTC", "day", 450)
+    assert len(df) == 450
+    assert df.index.is_monotonic_increasing and not df.index.has_duplicates
+    assert list(df.columns) == ["open", "high", "low", "close", "volume", "value"]
+    # 인덱스는 KST naive (일봉 09:00)
+    assert (df.index.hour == 9).all()
+    # 200 + 200 + 50 -> 3페이지
+    assert len([h for h in FakeUpbit.state["hits"] if h[1] == "/v1/candles/days"]) == 3
+
+
+def test_current_price_tickers_and_day_bars(base_url):
+    rest = UpbitRestScheduler(base_url)
+    assert rest.get_current_price("KRW-BTC") == 1.5
+    assert rest.get_current_price(["KRW-BTC", "KRW-XRP"]) == {"KRW-BTC": 1.5, "KRW-XRP": 1.5}
+    assert rest.get_tickers() == ["KRW-BTC", "KRW-ETH"]
+
+    bars = rest.get_day_bars(["KRW-BTC", "KRW-XRP"])
+    start, bar = bars["KRW-BTC"]
+    assert start == datetime(2025, 3, 1, 9)
+    assert bar == {"open": 10.0, "high": 12.0, "low": 9.0, "close": 1.5, "volume": 42.0, "value": 420.0}
+    assert set(bars) == {"KRW-BTC", "KRW-XRP"}
+
+
+def test_rate_limit_spreads_requests(base_url):
+    rest = UpbitRestScheduler(base_url, limits={"candles": 5})
+
+    async def burst():
+        await asyncio.gather(*(rest.aget_ohlcv(f"KRW-{i}", "day", 1) for i in range(20)))
+
+    started = time.monotonic()
+    asyncio.run(burst())
+    # 버킷 5개는 즉시, 나머지 15개는 초당 5개 -> 약 3초
+    assert 2.7 <= time.monotonic() - started < 4.5
+    assert rest.stats["requests"] == 20
+
+
+def test_remaining_sec_zero_blocks_until_next_second(base_url):
+    rest = UpbitRestScheduler(base_url)
+    FakeUpbit.state["sec"] = 0
+    rest.get_current_price("KRW-A")
+    FakeUpbit.state["sec"] = None
+
+    rest.get_current_price("KRW-A")
+    first, second = (t for t, _, _ in FakeUpbit.state["hits"])
+    # 남은 횟수 0 -> 두 번째 요청은 다음 초(벽시계 기준)가 되어야 나감
+    assert int(second) > int(first)
+
+
+def test_429_penalizes_and_retries(base_url):
+    rest = UpbitRestScheduler(base_url)
+    rest.PENALTY = 0.2
+    FakeUpbit.state["too_many"] = 2
+
+    started = time.monotonic()
+    assert rest.get_current_price("KRW-A") == 1.5
+    assert rest.stats["too_many"] == 2
+    assert time.monotonic() - started >= 0.4
+
+
+def test_429_gives_up_after_retries(base_url):
+    rest = UpbitRestScheduler(base_url)
+    rest.PENALTY = 0.05
+    rest.RETRIES = 1
+    FakeUpbit.state["too_many"] = 5
+    with pytest.raises(TooManyRequests):
+        rest.fetch("ticker", {"markets": "KRW-A"}, "ticker")
+
+
+def test_live_request_jumps_queued_scans(base_url):
+    rest = UpbitRestScheduler(base_url, limits={"candles": 2})
+
+    async def flood():
+        scans = [asyncio.create_task(rest.aget_ohlcv(f"KRW-S{i}", "day", 1, priority=SCAN)) for i in range(8)]
+        await asyncio.sleep(0.3)
+        await rest.aget_ohlcv("KRW-LIVE", "day", 1, priority=LIVE)
+        await asyncio.gather(*scans)
+
+    asyncio.run(flood())
+    order = [market for _, _, market in FakeUpbit.state["hits"]]
+    # 버킷 2개는 바로 스캔이 씀 -> 그다음 토큰은 LIVE가 먼저
+    assert order.index("KRW-LIVE") <= 3
+    assert len(order) == 9